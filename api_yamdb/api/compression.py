@@ -0,0 +1,88 @@
+import gzip
+import re
+
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+QUALITY = re.compile(r"q=([0-9.]+)")
+
+# Для каждого сжатия: быстрый уровень для ответов, которые сжимаются на
+# каждом запросе, и максимальный для записей кеша, которые сжимаются один
+# раз. Порядок задает предпочтение при равном q в Accept-Encoding.
+ENCODERS = {}
+if brotli is not None:
+    ENCODERS["br"] = (
+        lambda content: brotli.compress(content, quality=5),
+        lambda content: brotli.compress(content, quality=11),
+    )
+if zstandard is not None:
+    ENCODERS["zstd"] = (
+        lambda content: zstandard.ZstdCompressor(level=3).compress(content),
+        lambda content: zstandard.ZstdCompressor(level=19).compress(content),
+    )
+ENCODERS["gzip"] = (
+    lambda content: gzip.compress(content, compresslevel=6, mtime=0),
+    lambda content: gzip.compress(content, compresslevel=9, mtime=0),
+)
+
+
+def get_encodings():
+    allowed = getattr(settings, "COMPRESSION_ENCODINGS", None)
+    return [
+        encoding for encoding in ENCODERS
+        if allowed is None or encoding in allowed
+    ]
+
+
+def choose_encoding(request, size):
+    """Возвращает лучшее из поддерживаемых клиентом сжатий или `None`.
+
+    Ответы меньше `COMPRESSION_MIN_SIZE` байт не сжимаются.
+    """
+    if size < getattr(settings, "COMPRESSION_MIN_SIZE", 1024):
+        return None
+    accepted = {}
+    for item in request.META.get("HTTP_ACCEPT_ENCODING", "").split(","):
+        name, _, params = item.partition(";")
+        match = QUALITY.search(params)
+        try:
+            quality = float(match.group(1)) if match else 1.0
+        except ValueError:
+            quality = 0.0
+        accepted[name.strip().lower()] = quality
+
+    best, best_quality = None, 0.0
+    for encoding in get_encodings():
+        quality = accepted.get(encoding, accepted.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def compress(content, encoding, best=False):
+    fast, slow = ENCODERS[encoding]
+    return (slow if best else fast)(content)
+
+
+def encoded_etag(etag, encoding):
+    """ETag сжатого представления: у каждого сжатия свой."""
+    return f'{etag[:-1]}-{encoding}"'
+
+
+def set_encoding(response, content, encoding):
+    patch_vary_headers(response, ("Accept-Encoding",))
+    response.content = content
+    response["Content-Length"] = str(len(content))
+    response["Content-Encoding"] = encoding
+    if response.has_header("ETag"):
+        response["ETag"] = encoded_etag(response["ETag"], encoding)
@@ -0,0 +1,315 @@
+import json
+import platform
+import statistics
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from uuid import uuid4
+
+from django.contrib.auth.tokens import default_token_generator
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import Count
+from django.test import Client
+from django.utils.http import urlencode
+
+from reviews.models import Category, Comment, Genre, Review, Title
+from users.models import User
+from users.tokens import RoleAccessToken
+
+
+class Command(BaseCommand):
+    help = (
+        "Измеряет время ответа, количество запросов к БД и пиковое "
+        "потребление памяти для эндпоинтов API. Изменяющие запросы "
+        "выполняются в транзакции, которая откатывается"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=20,
+            help="Количество запросов к каждому эндпоинту",
+        )
+        parser.add_argument(
+            "--output",
+            help="Файл для сохранения отчета в формате JSON",
+        )
+        parser.add_argument(
+            "--compare",
+            help="Отчет предыдущего запуска для сравнения",
+        )
+        parser.add_argument(
+            "--anonymous",
+            action="store_true",
+            help="Выполнять запросы без токена (с кешем ответов)",
+        )
+        parser.add_argument(
+            "--username",
+            help=(
+                "Выполнять запросы от имени существующего пользователя "
+                "(по умолчанию создается временный администратор, "
+                "который удаляется после замеров)"
+            ),
+        )
+
+    def handle(self, *args, **options):
+        rows = {
+            model._meta.label: model.objects.count()
+            for model in (User, Category, Genre, Title, Review, Comment)
+        }
+        user = temporary = None
+        if options["username"]:
+            user = User.objects.filter(username=options["username"]).first()
+            if user is None:
+                raise CommandError(
+                    f"Пользователь {options['username']} не найден."
+                )
+        elif not options["anonymous"]:
+            username = f"benchmark-{uuid4().hex[:12]}"
+            user = temporary = User.objects.create(
+                username=username,
+                email=f"{username}@yamdb.fake",
+                role=User.ADMIN,
+            )
+        try:
+            if options["anonymous"]:
+                client = Client()
+                endpoints = self._get_endpoints()
+            else:
+                client = self._get_client(user)
+                endpoints = self._get_endpoints(user)
+            results = self._measure_all(client, endpoints, options["repeat"])
+        finally:
+            if temporary is not None:
+                temporary.delete()
+
+        report = {
+            "created": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "database": connection.vendor,
+            "repeat": options["repeat"],
+            "anonymous": options["anonymous"],
+            "rows": rows,
+            "endpoints": results,
+        }
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8") as file:
+                json.dump(report, file, ensure_ascii=False, indent=2)
+        if options["compare"]:
+            self._compare(report, options["compare"])
+
+    def _get_endpoints(self, user=None):
+        """Возвращает эндпоинты в виде `{имя: (метод, URL, данные)}`.
+
+        Без пользователя возвращаются только GET-запросы.
+        """
+        title = Title.objects.annotate(
+            reviews_count=Count("reviews")
+        ).order_by("-reviews_count").first()
+        if title is None:
+            raise CommandError("Нет данных: выполните load_data.")
+        urls = {
+            "users-list": "/api/v1/users/",
+            "users-me": "/api/v1/users/me/",
+            "categories-list": "/api/v1/categories/",
+            "genres-list": "/api/v1/genres/",
+            "titles-list": "/api/v1/titles/",
+            "titles-deep-page": "/api/v1/titles/?offset=1000",
+            "titles-filter": "/api/v1/titles/?" + urlencode({
+                "year": title.year,
+                "category": title.category.slug if title.category else "",
+            }),
+            "titles-search": "/api/v1/titles/?" + urlencode({
+                "search": title.name.split()[0],
+            }),
+            "titles-detail": f"/api/v1/titles/{title.id}/",
+            "titles-stats": f"/api/v1/titles/{title.id}/stats/",
+        }
+        first_user = User.objects.order_by("id").first()
+        urls["users-detail"] = f"/api/v1/users/{first_user.username}/"
+        review = title.reviews.annotate(
+            comments_count=Count("comments")
+        ).order_by("-comments_count").first()
+        comment = None
+        if review is not None:
+            reviews = f"/api/v1/titles/{title.id}/reviews/"
+            comments = f"{reviews}{review.id}/comments/"
+            urls["reviews-list"] = reviews
+            urls["reviews-cursor"] = f"{reviews}?cursor="
+            urls["reviews-detail"] = f"{reviews}{review.id}/"
+            urls["comments-list"] = comments
+            comment = review.comments.first()
+            if comment is not None:
+                urls["comments-detail"] = f"{comments}{comment.id}/"
+        endpoints = {name: ("get", url, None) for name, url in urls.items()}
+        if user is not None:
+            endpoints.update(
+                self._get_write_endpoints(user, title, review, comment)
+            )
+        return endpoints
+
+    def _get_write_endpoints(self, user, title, review, comment):
+        name = f"benchmark-{uuid4().hex[:12]}"
+        genres = list(Genre.objects.values_list("slug", flat=True)[:2])
+        category = Category.objects.values_list("slug", flat=True).first()
+        new_title = {
+            "name": name,
+            "year": 2000,
+            "description": "Описание",
+            "genre": genres,
+            "category": category,
+        }
+        endpoints = {
+            "auth-signup": ("post", "/api/v1/auth/signup/", {
+                "username": name, "email": f"{name}@yamdb.fake",
+            }),
+            "auth-token": ("post", "/api/v1/auth/token/", {
+                "username": user.username,
+                "confirmation_code": default_token_generator.make_token(user),
+            }),
+            "users-create": ("post", "/api/v1/users/", {
+                "username": name, "email": f"{name}@yamdb.fake",
+            }),
+            "users-me-update": ("patch", "/api/v1/users/me/", {
+                "bio": "Обновлено",
+            }),
+            "categories-create": ("post", "/api/v1/categories/", {
+                "name": name, "slug": name,
+            }),
+            "genres-create": ("post", "/api/v1/genres/", {
+                "name": name, "slug": name,
+            }),
+            "titles-create": ("post", "/api/v1/titles/", new_title),
+            "titles-update": ("patch", f"/api/v1/titles/{title.id}/", {
+                "name": name,
+            }),
+            "titles-delete": ("delete", f"/api/v1/titles/{title.id}/", None),
+        }
+        if category is not None:
+            endpoints["categories-delete"] = (
+                "delete", f"/api/v1/categories/{category}/", None
+            )
+        if genres:
+            endpoints["genres-delete"] = (
+                "delete", f"/api/v1/genres/{genres[0]}/", None
+            )
+
+        unreviewed = list(Title.objects.exclude(
+            reviews__author=user
+        ).values_list("pk", flat=True)[:10])
+        if unreviewed:
+            endpoints["reviews-create"] = (
+                "post", f"/api/v1/titles/{unreviewed[0]}/reviews/",
+                {"text": "Отзыв", "score": 7},
+            )
+            endpoints["reviews-bulk"] = (
+                "post", "/api/v1/titles/reviews/bulk/",
+                [
+                    {"title": pk, "text": "Отзыв", "score": pk % 10 + 1}
+                    for pk in unreviewed
+                ],
+            )
+        if review is not None:
+            detail = f"/api/v1/titles/{title.id}/reviews/{review.id}/"
+            endpoints.update({
+                "reviews-update": ("patch", detail, {"score": 3}),
+                "reviews-delete": ("delete", detail, None),
+                "comments-create": (
+                    "post", f"{detail}comments/", {"text": "Комментарий"}
+                ),
+            })
+        if comment is not None:
+            detail = (
+                f"/api/v1/titles/{title.id}/reviews/{review.id}/"
+                f"comments/{comment.id}/"
+            )
+            endpoints.update({
+                "comments-update": ("patch", detail, {"text": "Обновлено"}),
+                "comments-delete": ("delete", detail, None),
+            })
+        return endpoints
+
+    def _get_client(self, user):
+        token = RoleAccessToken.for_user(user)
+        return Client(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+    def _measure_all(self, client, endpoints, repeat):
+        results = {}
+        for name, endpoint in endpoints.items():
+            results[name] = self._measure(client, endpoint, repeat)
+            self.stdout.write(
+                f"{name}: p50 {results[name]['p50_ms']:.2f} мс, "
+                f"p99 {results[name]['p99_ms']:.2f} мс, "
+                f"запросов {results[name]['queries']}, "
+                f"память {results[name]['peak_memory_kb']:.0f} КБ"
+            )
+        return results
+
+    @staticmethod
+    def _request(client, endpoint):
+        method, url, data = endpoint
+        if method == "get":
+            return client.get(url)
+        # Изменения откатываются, поэтому каждый повтор выполняется на тех
+        # же данных. Транзакции запроса при этом становятся точками
+        # сохранения.
+        with transaction.atomic():
+            response = getattr(client, method)(
+                url,
+                json.dumps(data) if data is not None else "",
+                content_type="application/json",
+            )
+            transaction.set_rollback(True)
+        return response
+
+    def _measure(self, client, endpoint, repeat):
+        # CaptureQueriesContext не подходит: журнал запросов очищается
+        # в начале каждого запроса к приложению.
+        queries = []
+
+        def count_queries(execute, sql, params, many, context):
+            queries.append(sql)
+            return execute(sql, params, many, context)
+
+        with connection.execute_wrapper(count_queries):
+            status = self._request(client, endpoint).status_code
+
+        tracemalloc.start()
+        self._request(client, endpoint)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        timings = []
+        for _ in range(max(repeat, 2)):
+            start = time.perf_counter()
+            self._request(client, endpoint)
+            timings.append((time.perf_counter() - start) * 1000)
+        percentiles = statistics.quantiles(timings, n=100, method="inclusive")
+        method, url, _ = endpoint
+        return {
+            "method": method.upper(),
+            "url": url,
+            "status": status,
+            "queries": len(queries),
+            "peak_memory_kb": peak / 1024,
+            "mean_ms": statistics.mean(timings),
+            "p50_ms": percentiles[49],
+            "p90_ms": percentiles[89],
+            "p99_ms": percentiles[98],
+        }
+
+    def _compare(self, report, path):
+        with open(path, encoding="utf-8") as file:
+            previous = json.load(file)["endpoints"]
+        self.stdout.write(self.style.MIGRATE_HEADING(f"Сравнение с {path}"))
+        for name, result in report["endpoints"].items():
+            if name not in previous:
+                continue
+            before, after = previous[name]["p50_ms"], result["p50_ms"]
+            self.stdout.write(
+                f"{name}: p50 {before:.2f} -> {after:.2f} мс "
+                f"({(after - before) / before * 100:+.0f}%), запросов "
+                f"{previous[name]['queries']} -> {result['queries']}"
+            )
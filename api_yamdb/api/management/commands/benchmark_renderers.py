@@ -0,0 +1,81 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.settings import api_settings
+
+from api.v1.serializers import ReviewSerializer, TitleReadOnlySerializer
+from reviews.models import Review, Title
+
+
+class Command(BaseCommand):
+    help = (
+        "Сравнивает время рендеринга и размер страниц произведений и "
+        "отзывов в форматах из DEFAULT_RENDERER_CLASSES"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--page-size",
+            type=int,
+            default=100,
+            help="Количество объектов на странице",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=20,
+            help="Количество повторов рендеринга",
+        )
+
+    def handle(self, *args, **options):
+        if not Title.objects.exists():
+            raise CommandError("Нет данных: выполните load_data.")
+        renderers = [
+            renderer_class()
+            for renderer_class in api_settings.DEFAULT_RENDERER_CLASSES
+            if renderer_class.format != "api"
+        ]
+        page_size = options["page_size"]
+        pages = {
+            "titles": TitleReadOnlySerializer(
+                Title.objects.select_related("category").prefetch_related(
+                    "genre"
+                ).order_by("pk")[:page_size],
+                many=True,
+            ).data,
+            "reviews": ReviewSerializer(
+                Review.objects.select_related("author").order_by(
+                    "pk"
+                )[:page_size],
+                many=True,
+            ).data,
+        }
+        for name, results in pages.items():
+            data = {
+                "count": len(results),
+                "next": None,
+                "previous": None,
+                "results": results,
+            }
+            baseline = None
+            for renderer in renderers:
+                elapsed, size = self._measure(
+                    renderer, data, options["repeat"]
+                )
+                if baseline is None:
+                    baseline = size
+                self.stdout.write(
+                    f"{name} ({len(results)}) {renderer.format}: "
+                    f"{elapsed * 1000:.3f} мс, {size} байт "
+                    f"({size / baseline * 100:.0f}%)"
+                )
+
+    def _measure(self, renderer, data, repeat):
+        content = renderer.render(data, renderer.media_type)
+        best = None
+        for _ in range(max(repeat, 1)):
+            start = time.perf_counter()
+            renderer.render(data, renderer.media_type)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        return best, len(content)
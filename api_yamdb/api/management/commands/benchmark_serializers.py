@@ -0,0 +1,82 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from api.v1.compiled import compile_serializer
+from api.v1.serializers import (CategorySerializer, CommentSerializer,
+                                GenreSerializer, ReviewSerializer,
+                                TitleReadOnlySerializer)
+from reviews.models import Category, Comment, Genre, Review, Title
+
+
+class Command(BaseCommand):
+    help = (
+        "Сравнивает скорость сериализаторов DRF и скомпилированных "
+        "сериализаторов на чтение (объектов в секунду, вместе с выборкой)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=5,
+            help="Количество повторов для каждого сериализатора",
+        )
+        parser.add_argument(
+            "--limit",
+            type=int,
+            default=1000,
+            help="Количество объектов в выборке",
+        )
+
+    def handle(self, *args, **options):
+        cases = {
+            "categories": (CategorySerializer, Category.objects.all()),
+            "genres": (GenreSerializer, Genre.objects.all()),
+            "titles": (
+                TitleReadOnlySerializer,
+                Title.objects.defer("card").select_related(
+                    "category"
+                ).prefetch_related("genre"),
+            ),
+            "reviews": (
+                ReviewSerializer, Review.objects.select_related("author")
+            ),
+            "comments": (
+                CommentSerializer, Comment.objects.select_related("author")
+            ),
+        }
+        if not Title.objects.exists():
+            raise CommandError("Нет данных: выполните load_data.")
+        for name, (serializer_class, queryset) in cases.items():
+            queryset = queryset.order_by("pk")[:options["limit"]]
+            compiled = compile_serializer(serializer_class)
+
+            def drf():
+                return serializer_class(queryset.all(), many=True).data
+
+            def fast():
+                return compiled.represent_many(
+                    compiled.values(queryset.all()), queryset.db
+                )
+
+            count = queryset.count()
+            if not count:
+                continue
+            before = self._measure(drf, count, options["repeat"])
+            after = self._measure(fast, count, options["repeat"])
+            self.stdout.write(
+                f"{name}: {count} объектов, DRF {before:.0f} объектов/с, "
+                f"скомпилированный {after:.0f} объектов/с "
+                f"(x{after / before:.1f})"
+            )
+
+    def _measure(self, serialize, count, repeat):
+        serialize()
+        best = None
+        for _ in range(max(repeat, 1)):
+            start = time.perf_counter()
+            serialize()
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        return count / best if best else 0.0
@@ -0,0 +1,79 @@
+import statistics
+import time
+from itertools import combinations
+
+from django.core.management.base import BaseCommand
+from django.http import QueryDict
+
+from api.v1.filters import TitleFilters
+from api.v1.views import TitleViewSet
+from reviews.models import Category, Genre, Title
+
+
+class Command(BaseCommand):
+    help = (
+        "Выводит планы выполнения и время запросов списка произведений "
+        "для сочетаний фильтров"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=20,
+            help="Количество повторов каждого запроса",
+        )
+        parser.add_argument(
+            "--limit",
+            type=int,
+            default=10,
+            help="Размер страницы",
+        )
+
+    def handle(self, *args, **options):
+        sample = self._get_sample()
+        for size in range(len(sample) + 1):
+            for keys in combinations(sample, size):
+                params = QueryDict(mutable=True)
+                params.update({key: sample[key] for key in keys})
+                queryset = TitleFilters(
+                    params, queryset=TitleViewSet.queryset.all()
+                ).qs
+                self._report(
+                    ", ".join(f"{key}={sample[key]}" for key in keys)
+                    or "без фильтров",
+                    queryset.order_by("id"),
+                    options["repeat"],
+                    options["limit"],
+                )
+
+    def _get_sample(self):
+        sample = {}
+        category = Category.objects.order_by("id").first()
+        if category is not None:
+            sample["category"] = category.slug
+        genre = Genre.objects.order_by("id").first()
+        if genre is not None:
+            sample["genre"] = genre.slug
+        title = Title.objects.order_by("id").first()
+        if title is not None:
+            sample["year"] = title.year
+            sample["name"] = title.name.split()[0]
+        return sample
+
+    def _report(self, name, queryset, repeat, limit):
+        self.stdout.write(self.style.MIGRATE_HEADING(name))
+        self.stdout.write(queryset.explain())
+        for label, query in (
+            ("count", queryset.count),
+            ("page", lambda: list(queryset[:limit])),
+        ):
+            timings = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                query()
+                timings.append((time.perf_counter() - start) * 1000)
+            self.stdout.write(
+                f"{label}: медиана {statistics.median(timings):.2f} мс, "
+                f"максимум {max(timings):.2f} мс"
+            )
@@ -0,0 +1,167 @@
+import json
+import logging
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+from django.utils.cache import patch_vary_headers
+
+from api.compression import choose_encoding, compress, set_encoding
+
+logger = logging.getLogger(__name__)
+
+
+class QueryBudgetExceeded(Exception):
+    pass
+
+
+class QueryProfile:
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.slowest_sql = None
+        self.slowest_duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = time.perf_counter() - start
+            self.count += 1
+            self.duration += duration
+            if duration >= self.slowest_duration:
+                self.slowest_sql = sql
+                self.slowest_duration = duration
+
+
+class QueryProfilerMiddleware:
+    """Профилирует запросы к БД на каждом HTTP-запросе.
+
+    Добавляет заголовок `Server-Timing` (если включен
+    `SERVER_TIMING_HEADER`) со временем запросов к БД, работы вьюсета
+    вместе с сериализацией (`view`), рендеринга ответа рендерером DRF
+    (`render`) и всего запроса, пишет в лог запросы дольше
+    `QUERY_LOG_THRESHOLD_MS` и проверяет бюджет запросов, заданный
+    атрибутом `query_budget` вьюсета: числом для всех действий или словарем
+    по именам действий. При `QUERY_BUDGET_ENFORCE` превышение бюджета
+    приводит к исключению, иначе к предупреждению в логе.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request._query_profile = profile = QueryProfile()
+        request._view_started = None
+        request._view_time = None
+        request._render_time = 0.0
+        start = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(profile))
+            response = self.get_response(request)
+        total = time.perf_counter() - start
+        view = request._view_time
+        render = request._render_time
+
+        if getattr(settings, "SERVER_TIMING_HEADER", False):
+            timings = [
+                f'db;dur={profile.duration * 1000:.2f};'
+                f'desc="{profile.count} queries"',
+            ]
+            if view is not None:
+                timings.append(f"view;dur={view * 1000:.2f}")
+            timings += [
+                f"render;dur={render * 1000:.2f}",
+                f"total;dur={total * 1000:.2f}",
+            ]
+            response["Server-Timing"] = ", ".join(timings)
+
+        record = {
+            "method": request.method,
+            "path": request.path,
+            "status": response.status_code,
+            "view": getattr(request, "_profile_view", None),
+            "queries": profile.count,
+            "db_ms": round(profile.duration * 1000, 2),
+            "view_ms": None if view is None else round(view * 1000, 2),
+            "render_ms": round(render * 1000, 2),
+            "total_ms": round(total * 1000, 2),
+            "slowest_sql": profile.slowest_sql,
+            "slowest_ms": round(profile.slowest_duration * 1000, 2),
+        }
+        threshold = getattr(settings, "QUERY_LOG_THRESHOLD_MS", None)
+        if threshold is not None and record["total_ms"] >= threshold:
+            logger.warning(json.dumps(record, ensure_ascii=False))
+
+        budget = getattr(request, "_query_budget", None)
+        if budget is not None and profile.count > budget:
+            message = (
+                f"{record['view']}: {profile.count} запросов к БД "
+                f"при бюджете {budget}"
+            )
+            if getattr(settings, "QUERY_BUDGET_ENFORCE", False):
+                raise QueryBudgetExceeded(message)
+            logger.warning(message)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        view_class = getattr(view_func, "cls", None)
+        if view_class is None:
+            return None
+        action = getattr(view_func, "actions", {}).get(request.method.lower())
+        request._profile_view = ".".join(
+            filter(None, [view_class.__name__, action])
+        )
+        budget = getattr(view_class, "query_budget", None)
+        if isinstance(budget, dict):
+            budget = budget.get(action)
+        request._query_budget = budget
+        request._view_started = time.perf_counter()
+        return None
+
+    def process_template_response(self, request, response):
+        # Ответы DRF рендерятся сразу после этого метода, до обработки
+        # ответа остальными middleware (например, сжатия). Окончание
+        # рендеринга отмечается раньше остальных post-render callback,
+        # например сохранения ответа в кеш.
+        started = time.perf_counter()
+        if request._view_started is not None:
+            request._view_time = started - request._view_started
+
+        def finish_render(response):
+            request._render_time = time.perf_counter() - started
+
+        response._post_render_callbacks.insert(0, finish_render)
+        return response
+
+
+class CompressionMiddleware:
+    """Сжимает ответы, если клиент это поддерживает.
+
+    Поддерживаются gzip и, если установлены пакеты `brotli` и
+    `zstandard`, br и zstd. Ответы, уже сжатые кешем ответов, не
+    трогаются.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if (
+            response.streaming
+            or response.status_code != 200
+            or response.has_header("Content-Encoding")
+        ):
+            return response
+        patch_vary_headers(response, ("Accept-Encoding",))
+        encoding = choose_encoding(request, len(response.content))
+        if encoding is None:
+            return response
+        content = compress(response.content, encoding)
+        if len(content) < len(response.content):
+            set_encoding(response, content, encoding)
+        return response
@@ -0,0 +1,63 @@
+from django.utils.functional import cached_property
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.models import TokenUser
+
+from users.models import User
+from users.tokens import get_tokens_valid_after
+
+
+class ClaimsUser(TokenUser):
+    """Пользователь, построенный по claims токена без запроса к БД."""
+    is_admin = User.is_admin
+    is_moderator = User.is_moderator
+
+    @cached_property
+    def role(self):
+        return self.token["role"]
+
+    def to_user(self):
+        """Экземпляр `User` с данными из claims для связи с объектами."""
+        return User(
+            pk=self.pk,
+            username=self.username,
+            role=self.role,
+            is_superuser=self.token["is_superuser"],
+            is_staff=self.is_staff,
+        )
+
+    def __str__(self):
+        return self.username
+
+
+def get_request_user(request):
+    """Возвращает пользователя запроса как экземпляр `User` без запроса к БД.
+
+    Поля, которых нет в claims, у такого экземпляра не заполнены.
+    """
+    if isinstance(request.user, ClaimsUser):
+        return request.user.to_user()
+    return request.user
+
+
+class StatelessJWTAuthentication(JWTAuthentication):
+    """Аутентификация по JWT без загрузки пользователя из БД.
+
+    Токены без claim `role` (выданные до появления ролевых claims)
+    обрабатываются как обычно, с загрузкой пользователя. Токены,
+    выданные до изменения роли или активности пользователя и до его
+    удаления, отклоняются.
+    """
+
+    def get_user(self, validated_token):
+        if "role" not in validated_token:
+            return super().get_user(validated_token)
+        if not validated_token.get("is_active", True):
+            raise AuthenticationFailed(
+                "Пользователь неактивен", code="user_inactive"
+            )
+        user = ClaimsUser(validated_token)
+        if validated_token["iat"] < get_tokens_valid_after(user.pk):
+            raise InvalidToken("Токен отозван")
+        return user
@@ -0,0 +1,126 @@
+from hashlib import md5
+
+from django.conf import settings
+from django.core.cache import caches
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.cache import parse_etags, patch_vary_headers, quote_etag
+from django.utils.http import urlencode
+
+from api.compression import (choose_encoding, compress, encoded_etag,
+                             set_encoding)
+from reviews.cache import get_versions
+
+
+class ResponseCacheMixin:
+    """Кеширует ответы на GET-запросы анонимных пользователей.
+
+    Ключ строится из пути, нормализованных параметров запроса, формата
+    ответа и версий моделей из `get_cache_models()`, поэтому любое
+    изменение этих моделей делает старые записи недоступными. Сжатые
+    представления ответа хранятся рядом с записью, у каждого сжатия свой
+    ETag.
+    """
+    cache_models = ()
+    cache_timeout = 60 * 5
+
+    def get_cache_models(self):
+        return self.cache_models
+
+    def get_response_cache(self):
+        return caches[getattr(settings, "RESPONSE_CACHE_ALIAS", "default")]
+
+    def get_response_cache_key(self, request):
+        params = sorted(
+            (key, value)
+            for key, values in request.query_params.lists()
+            for value in values
+        )
+        versions = get_versions(self.get_cache_models())
+        return ":".join([
+            "response",
+            md5(request.path.encode("utf-8")).hexdigest(),
+            md5(urlencode(params).encode("utf-8")).hexdigest(),
+            request.accepted_renderer.format,
+            *map(str, versions),
+        ])
+
+    def get_cached_response(self, handler, request, *args, **kwargs):
+        if request.user.is_authenticated:
+            return handler(request, *args, **kwargs)
+
+        cache = self.get_response_cache()
+        key = self.get_response_cache_key(request)
+        entry = cache.get(key)
+        if entry is not None:
+            content, content_type, etag = entry
+            encoding = choose_encoding(request, len(content))
+            if encoding is None:
+                response_etag = etag
+            else:
+                response_etag = encoded_etag(etag, encoding)
+            if response_etag in parse_etags(
+                request.META.get("HTTP_IF_NONE_MATCH", "")
+            ):
+                response = HttpResponseNotModified()
+            elif encoding is None:
+                response = HttpResponse(content, content_type=content_type)
+            else:
+                response = HttpResponse(
+                    self._get_encoded(cache, key, etag, content, encoding),
+                    content_type=content_type,
+                )
+                response["Content-Encoding"] = encoding
+            response["ETag"] = response_etag
+            patch_vary_headers(response, ("Accept-Encoding",))
+            return response
+
+        response = handler(request, *args, **kwargs)
+        if response.status_code == 200 and not response.streaming:
+            response.add_post_render_callback(
+                lambda rendered: self._store_response(
+                    cache, key, rendered, request
+                )
+            )
+        return response
+
+    def _get_encoded(self, cache, key, etag, content, encoding):
+        # Сжатое представление хранится рядом с записью и сжимается
+        # с максимальным уровнем один раз, а не на каждом запросе.
+        encoded_key = f"{key}:{etag}:{encoding}"
+        encoded = cache.get(encoded_key)
+        if encoded is None:
+            encoded = compress(content, encoding, best=True)
+            cache.set(encoded_key, encoded, self.cache_timeout)
+        return encoded
+
+    def _store_response(self, cache, key, response, request):
+        etag = quote_etag(md5(response.content).hexdigest())
+        response["ETag"] = etag
+        cache.set(
+            key,
+            (response.content, response["Content-Type"], etag),
+            self.cache_timeout,
+        )
+        encoding = choose_encoding(request, len(response.content))
+        if encoding is not None:
+            set_encoding(
+                response,
+                self._get_encoded(
+                    cache, key, etag, response.content, encoding
+                ),
+                encoding,
+            )
+
+
+class CachedListMixin(ResponseCacheMixin):
+    def list(self, request, *args, **kwargs):
+        return self.get_cached_response(
+            super().list, request, *args, **kwargs
+        )
+
+
+class CachedRetrieveMixin(ResponseCacheMixin):
+    def retrieve(self, request, *args, **kwargs):
+        return self.get_cached_response(
+            super().retrieve, request, *args, **kwargs
+        )
@@ -0,0 +1,67 @@
+from rest_framework.response import Response
+
+from api.v1.compiled import select_values
+from reviews.cards import render_card
+
+RESULTS_MARKER = b'"results":[]'
+
+
+class RawJSONResponse(Response):
+    """Ответ с уже готовым JSON, который не проходит через рендерер."""
+
+    def __init__(self, content, **kwargs):
+        super().__init__(**kwargs)
+        self.raw_content = content
+
+    @property
+    def rendered_content(self):
+        renderer = self.accepted_renderer
+        content_type = self.content_type or renderer.media_type
+        if self.content_type is None and renderer.charset:
+            content_type = f"{content_type}; charset={renderer.charset}"
+        self["Content-Type"] = content_type
+        return self.raw_content
+
+
+class CardListMixin:
+    """Отдает список произведений из готовых карточек.
+
+    Для JSON-ответов страница выбирается как пары (карточка, рейтинг) и
+    склеивается в ответ без создания объектов моделей и сериализаторов.
+    Остальные форматы (browsable API, JSON с отступами) строятся как
+    обычно, а при потоковой выдаче (`StreamingListMixin`) карточки
+    отправляются без разбора.
+    """
+
+    def list(self, request, *args, **kwargs):
+        renderer = request.accepted_renderer
+        if renderer.format != "json" or renderer.get_indent(
+            request.accepted_media_type, self.get_renderer_context()
+        ):
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset())
+        rows = select_values(queryset, "card", "rating", tuples=True)
+        page = self.paginate_queryset(rows)
+        results = "[" + ",".join(
+            render_card(card, rating) for card, rating, *_ in (
+                rows if page is None else page
+            )
+        ) + "]"
+        if page is None:
+            return RawJSONResponse(results.encode("utf-8"))
+
+        envelope = renderer.render(
+            self.get_paginated_response([]).data,
+            request.accepted_media_type,
+            self.get_renderer_context(),
+        )
+        head, _, tail = envelope.rpartition(RESULTS_MARKER)
+        return RawJSONResponse(
+            head + b'"results":' + results.encode("utf-8") + tail
+        )
+
+    def stream_rows(self, queryset):
+        rows = select_values(queryset, "card", "rating", tuples=True)
+        for card, rating, *_ in rows.iterator(self.stream_chunk_size):
+            yield render_card(card, rating)
@@ -0,0 +1,273 @@
+from collections import defaultdict
+from functools import lru_cache
+from types import SimpleNamespace
+
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+from rest_framework.generics import get_object_or_404
+from rest_framework.response import Response
+
+from reviews.lookups import SLUG_TABLES
+
+# Поля, значения которых из БД выводятся без преобразования.
+PLAIN_FIELDS = (
+    serializers.CharField,
+    serializers.EmailField,
+    serializers.SlugField,
+)
+
+
+class NotCompilable(Exception):
+    pass
+
+
+def select_values(queryset, *fields, tuples=False):
+    """Выбирает поля `fields` строками `values()` (или кортежами
+    `values_list()` при `tuples`) без создания объектов моделей.
+
+    Дополнительные колонки (например, ранг поиска) нужны для сортировки,
+    поэтому остаются в выборке после `fields`.
+    """
+    queryset = queryset.prefetch_related(None)
+    fields = (*fields, *queryset.query.extra)
+    if tuples:
+        return queryset.values_list(*fields)
+    return queryset.values(*fields)
+
+
+class RelatedRows:
+    """Списки вложенных объектов по обратному внешнему ключу или M2M."""
+
+    def __init__(self, lookup, child):
+        self.lookup = lookup
+        self.child = child
+
+    def fetch(self, pks, using):
+        rows = list(self.child.model.objects.using(using).filter(
+            **{f"{self.lookup}__in": pks}
+        ).values(self.lookup, *self.child.paths))
+        children = defaultdict(list)
+        for row, data in zip(rows, self.child.represent_many(rows, using)):
+            children[row[self.lookup]].append(data)
+        return children
+
+
+class TableRows:
+    """Списки объектов из `SlugTable` по промежуточной таблице M2M.
+
+    Из БД читаются только пары идентификаторов, без соединения с
+    таблицей вложенных объектов.
+    """
+
+    def __init__(self, through, source, target, table):
+        self.through = through
+        self.source = source
+        self.target = target
+        self.table = table
+
+    def fetch(self, pks, using):
+        snapshot = self.table.snapshot()
+        children = defaultdict(list)
+        for source_id, target_id in self.through.objects.using(using).filter(
+            **{f"{self.source}__in": pks}
+        ).order_by("pk").values_list(self.source, self.target):
+            children[source_id].append(dict(snapshot[target_id]))
+        return children
+
+
+class CompiledSerializer:
+    """Сериализатор только для чтения, собранный из полей DRF-сериализатора.
+
+    Список полей разбирается один раз: для каждого поля определяется путь
+    для `values()` и преобразование значения, после чего генерируется
+    функция, которая строит словарь ответа из строки `values()` обычным
+    кодом Python, без объектов моделей и обхода полей. Поддерживаются
+    простые поля, `SlugRelatedField`, `PrimaryKeyRelatedField`, вложенные
+    сериализаторы по внешнему ключу и списки вложенных сериализаторов
+    (по `many=True`) на верхнем уровне. Вложенные категории и жанры
+    берутся из `SlugTable` без соединения с их таблицами.
+    """
+
+    def __init__(self, serializer_class):
+        serializer = serializer_class()
+        self.model = serializer.Meta.model
+        self.pk = self.model._meta.pk.name
+        self.paths = [self.pk]
+        self.related = []
+        self.tables = []
+        self.namespace = {}
+        body = self._compile(serializer, prefix="", top=True)
+        code = f"def represent(row, related, tables):\n    return {body}\n"
+        exec(code, self.namespace)
+        self.represent = self.namespace["represent"]
+        self.source = code
+
+    def _compile(self, serializer, prefix, top=False):
+        items = []
+        for name, field in serializer.fields.items():
+            if field.write_only:
+                continue
+            items.append(f"{name!r}: {self._expression(field, prefix, top)}")
+        return "{" + ", ".join(items) + "}"
+
+    def _expression(self, field, prefix, top):
+        if field.source == "*" or "." in field.source:
+            raise NotCompilable(field.field_name)
+        path = prefix + field.source
+
+        if isinstance(field, serializers.ListSerializer):
+            if not top or not isinstance(
+                field.child, serializers.ModelSerializer
+            ):
+                raise NotCompilable(field.field_name)
+            self.related.append(self._related(field))
+            index = len(self.related) - 1
+            return f"related[{index}].get(row[{self.pk!r}], [])"
+
+        if isinstance(field, serializers.ModelSerializer):
+            self._add_path(path)
+            table = self._get_table(field)
+            if table is None:
+                child = self._compile(field, prefix=f"{path}__")
+            else:
+                self.tables.append(table)
+                index = len(self.tables) - 1
+                child = f"dict(tables[{index}][row[{path!r}]])"
+            return f"(None if row[{path!r}] is None else {child})"
+
+        if isinstance(field, serializers.SlugRelatedField):
+            path = f"{path}__{field.slug_field}"
+        elif isinstance(field, serializers.RelatedField) and not isinstance(
+            field, serializers.PrimaryKeyRelatedField
+        ):
+            raise NotCompilable(field.field_name)
+        elif isinstance(field, (
+            serializers.ManyRelatedField, serializers.SerializerMethodField
+        )):
+            raise NotCompilable(field.field_name)
+        self._add_path(path)
+
+        if type(field) in PLAIN_FIELDS or isinstance(
+            field, serializers.RelatedField
+        ):
+            return f"row[{path!r}]"
+        converter = f"convert_{len(self.namespace)}"
+        self.namespace[converter] = field.to_representation
+        value = f"row[{path!r}]"
+        return f"(None if {value} is None else {converter}({value}))"
+
+    def _add_path(self, path):
+        model = self.model
+        try:
+            for name in path.split("__"):
+                model_field = model._meta.get_field(name)
+                model = model_field.related_model or model
+        except FieldDoesNotExist:
+            raise NotCompilable(path)
+        if path not in self.paths:
+            self.paths.append(path)
+
+    def _get_table(self, serializer):
+        table = SLUG_TABLES.get(serializer.Meta.model)
+        if table is None:
+            return None
+        fields = [
+            (name, field.source, type(field))
+            for name, field in serializer.fields.items()
+            if not field.write_only
+        ]
+        if fields != [
+            (name, name, type(serializer.fields[name]))
+            for name in table.fields
+        ] or not all(field_type in PLAIN_FIELDS for *_, field_type in fields):
+            return None
+        return table
+
+    def _related(self, field):
+        model_field = self.model._meta.get_field(field.source)
+        if model_field.many_to_many and not model_field.auto_created:
+            table = self._get_table(field.child)
+            if table is not None:
+                return TableRows(
+                    model_field.remote_field.through,
+                    model_field.m2m_field_name(),
+                    model_field.m2m_reverse_field_name(),
+                    table,
+                )
+            lookup = model_field.related_query_name()
+        elif model_field.one_to_many or model_field.many_to_many:
+            lookup = model_field.field.name
+        else:
+            raise NotCompilable(field.field_name)
+        child = CompiledSerializer(type(field.child))
+        if child.related:
+            raise NotCompilable(field.field_name)
+        return RelatedRows(lookup, child)
+
+    def values(self, queryset):
+        return select_values(queryset, *self.paths)
+
+    def represent_many(self, rows, using="default"):
+        rows = list(rows)
+        if not rows:
+            return []
+        pks = [row[self.pk] for row in rows]
+        related = [children.fetch(pks, using) for children in self.related]
+        tables = [table.snapshot() for table in self.tables]
+        return [self.represent(row, related, tables) for row in rows]
+
+
+@lru_cache(maxsize=None)
+def compile_serializer(serializer_class):
+    """Возвращает скомпилированный сериализатор или `None`."""
+    try:
+        return CompiledSerializer(serializer_class)
+    except NotCompilable:
+        return None
+
+
+class CompiledSerializerMixin:
+    def get_compiled_serializer(self):
+        return compile_serializer(self.get_serializer_class())
+
+
+class CompiledListMixin(CompiledSerializerMixin):
+    """Отвечает на GET-запрос списка через `CompiledSerializer`.
+
+    Если сериализатор вьюсета не поддерживается, используется обычный
+    путь DRF.
+    """
+
+    def list(self, request, *args, **kwargs):
+        compiled = self.get_compiled_serializer()
+        if compiled is None:
+            return super().list(request, *args, **kwargs)
+        queryset = self.filter_queryset(self.get_queryset())
+        rows = compiled.values(queryset)
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(
+                compiled.represent_many(page, queryset.db)
+            )
+        return Response(compiled.represent_many(rows, queryset.db))
+
+
+class CompiledRetrieveMixin(CompiledSerializerMixin):
+    """Отвечает на GET-запрос объекта через `CompiledSerializer`.
+
+    Проверка разрешений на объект получает строку выборки в виде объекта
+    с атрибутами по путям `values()`.
+    """
+
+    def retrieve(self, request, *args, **kwargs):
+        compiled = self.get_compiled_serializer()
+        if compiled is None:
+            return super().retrieve(request, *args, **kwargs)
+        queryset = self.filter_queryset(self.get_queryset())
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        row = get_object_or_404(
+            compiled.values(queryset),
+            **{self.lookup_field: self.kwargs[lookup_url_kwarg]},
+        )
+        self.check_object_permissions(request, SimpleNamespace(**row))
+        return Response(compiled.represent_many([row], queryset.db)[0])
@@ -1,22 +1,93 @@
 import django_filters
+from django.db import connections
+from django.db.models import F
+from rest_framework.filters import OrderingFilter
 
+from reviews.lookups import categories, genres
 from reviews.models import Title
+from reviews.search import search_titles
 
 
 class TitleFilters(django_filters.FilterSet):
-    category = django_filters.CharFilter(
-        field_name="category__slug",
-        lookup_expr="exact",
-    )
-    genre = django_filters.CharFilter(
-        field_name="genre__slug",
-        lookup_expr="exact",
-    )
+    category = django_filters.CharFilter(method="filter_category")
+    genre = django_filters.CharFilter(method="filter_genre")
     name = django_filters.CharFilter(
         field_name="name",
         lookup_expr="contains",
     )
+    search = django_filters.CharFilter(method="filter_search")
 
     class Meta:
         model = Title
-        fields = ("category", "genre", "name", "year")
+        fields = ("category", "genre", "name", "year", "search")
+
+    def filter_category(self, queryset, name, value):
+        category_id = categories.get_id(value)
+        if category_id is None:
+            return queryset.none()
+        return queryset.filter(category_id=category_id)
+
+    def filter_genre(self, queryset, name, value):
+        genre_id = genres.get_id(value)
+        if genre_id is None:
+            return queryset.none()
+        return queryset.filter(genre=genre_id)
+
+    def filter_search(self, queryset, name, value):
+        return search_titles(queryset, value)
+
+
+class TitleOrderingFilter(OrderingFilter):
+    """Сортировка произведений параметром `ordering`.
+
+    Поддерживаются `rating`, `weighted_rating` (байесовский рейтинг, у
+    произведений без оценок равен априорному среднему), `year`, `name` и
+    `reviews` (количество отзывов), по убыванию - с префиксом `-`. Все
+    значения хранятся в столбцах произведения, а для рейтингов есть
+    индексы вместе с категорией, поэтому лучшие произведения категории
+    выбираются из индекса. При равенстве порядок задается `id` в том же
+    направлении, что и последнее поле. Произведения без рейтинга при
+    сортировке `-rating` идут последними.
+    """
+    fields = {
+        "rating": "rating",
+        "weighted_rating": "weighted_rating",
+        "year": "year",
+        "name": "name",
+        "reviews": "rating_count",
+    }
+
+    def get_valid_fields(self, queryset, view, context={}):
+        return [(name, name) for name in self.fields]
+
+    def get_ordering(self, request, queryset, view):
+        params = request.query_params.get(self.ordering_param)
+        if not params:
+            return None
+        ordering = []
+        for term in params.split(","):
+            term = term.strip()
+            field = self.fields.get(term.lstrip("-"))
+            if field is not None:
+                ordering.append(("-" if term.startswith("-") else "") + field)
+        return ordering or None
+
+    def filter_queryset(self, request, queryset, view):
+        ordering = self.get_ordering(request, queryset, view)
+        if not ordering:
+            return queryset
+        vendor = connections[queryset.db].vendor
+        expressions = []
+        for term in ordering:
+            descending = term.startswith("-")
+            field = F(term.lstrip("-"))
+            if descending and field.name == "rating" and (
+                vendor == "postgresql"
+            ):
+                # В SQLite NULL меньше любых значений и при сортировке по
+                # убыванию и так оказывается в конце.
+                expressions.append(field.desc(nulls_last=True))
+            else:
+                expressions.append(field.desc() if descending else field.asc())
+        expressions.append(F("pk").desc() if descending else F("pk").asc())
+        return queryset.order_by(*expressions)
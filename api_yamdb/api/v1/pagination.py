@@ -0,0 +1,183 @@
+from base64 import b64decode, b64encode
+from collections import OrderedDict
+from hashlib import md5
+
+from django.apps import apps
+from django.core.cache import cache
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import LimitOffsetPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+from reviews.cache import get_versions
+
+
+class CountPagination(LimitOffsetPagination):
+    """Пагинация limit/offset с выбором способа подсчета `count`.
+
+    Параметр `count` принимает значения `exact` (по умолчанию),
+    `cached` (значение из кеша, сбрасывается при изменении моделей
+    запроса), `capped` (подсчет не дальше `count_cap` строк) и `none`
+    (без подсчета).
+    """
+    count_query_param = "count"
+    count_modes = ("exact", "cached", "capped", "none")
+    count_cap = 10000
+    count_cache_timeout = 60 * 5
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.count_mode = request.query_params.get(
+            self.count_query_param, "exact"
+        )
+        if self.count_mode not in self.count_modes:
+            raise ValidationError({
+                self.count_query_param: (
+                    f"Допустимые значения: {', '.join(self.count_modes)}."
+                ),
+            })
+        self.limit = self.get_limit(request)
+        if self.limit is None:
+            return None
+        self.offset = self.get_offset(request)
+        self.request = request
+
+        if self.count_mode == "none":
+            page = list(queryset[self.offset:self.offset + self.limit + 1])
+            self.count = self.offset + len(page)
+            return page[:self.limit]
+
+        self.count = self.get_count(queryset)
+        if self.count > self.limit and self.template is not None:
+            self.display_page_controls = True
+        if self.count == 0 or self.offset > self.count:
+            return []
+        return list(queryset[self.offset:self.offset + self.limit])
+
+    def get_count(self, queryset):
+        queryset = queryset.order_by()
+        if self.count_mode == "capped":
+            cap = max(self.count_cap, self.offset + self.limit)
+            return queryset[:cap + 1].count()
+        if self.count_mode == "cached":
+            key = self.get_count_cache_key(queryset)
+            count = cache.get(key)
+            if count is None:
+                count = super().get_count(queryset)
+                cache.set(key, count, self.count_cache_timeout)
+            return count
+        return super().get_count(queryset)
+
+    @staticmethod
+    def get_count_cache_key(queryset):
+        sql = str(queryset.query)
+        models = {queryset.model} | {
+            model for model in apps.get_models()
+            if f'"{model._meta.db_table}"' in sql
+        }
+        models = sorted(models, key=lambda model: model._meta.label_lower)
+        versions = get_versions(models)
+        digest = md5(sql.encode("utf-8")).hexdigest()
+        return f"count:{digest}:" + ":".join(map(str, versions))
+
+    def get_display_count(self):
+        if self.count_mode == "capped" and self.count > self.count_cap:
+            return f"{self.count_cap}+"
+        return self.count
+
+    def get_paginated_response(self, data):
+        response = OrderedDict()
+        if self.count_mode != "none":
+            response["count"] = self.get_display_count()
+        response["next"] = self.get_next_link()
+        response["previous"] = self.get_previous_link()
+        response["results"] = data
+        return Response(response)
+
+
+class KeysetPagination(CountPagination):
+    """Пагинация limit/offset с режимом курсора по (pub_date, id).
+
+    Режим курсора включается параметром `cursor` (пустым для первой
+    страницы). Следующая страница выбирается условием по ключу последней
+    записи, поэтому ее стоимость не зависит от глубины.
+    """
+    cursor_query_param = "cursor"
+    invalid_cursor_message = "Некорректный курсор."
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset = self.cursor_query_param in request.query_params
+        if not self.keyset:
+            return super().paginate_queryset(queryset, request, view)
+
+        self.limit = self.get_limit(request)
+        if self.limit is None:
+            return None
+        self.request = request
+
+        queryset = queryset.order_by("-pub_date", "-id")
+        position = self.decode_cursor(request)
+        if position is not None:
+            pub_date, pk = position
+            # Избыточное условие pub_date <= d ограничивает диапазон
+            # индекса: без него просматриваются все более новые записи.
+            queryset = queryset.filter(
+                Q(pub_date__lt=pub_date) | Q(pub_date=pub_date, id__lt=pk),
+                pub_date__lte=pub_date,
+            )
+        page = list(queryset[:self.limit + 1])
+        self.has_next = len(page) > self.limit
+        page = page[:self.limit]
+        if self.has_next:
+            last = page[-1]
+            if isinstance(last, dict):
+                self.next_position = (last["pub_date"], last["id"])
+            else:
+                self.next_position = (last.pub_date, last.pk)
+        return page
+
+    def get_paginated_response(self, data):
+        if not self.keyset:
+            return super().get_paginated_response(data)
+        return Response(OrderedDict([
+            ("next", self.get_next_link()),
+            ("results", data),
+        ]))
+
+    def get_next_link(self):
+        if not self.keyset:
+            return super().get_next_link()
+        if not self.has_next:
+            return None
+        return replace_query_param(
+            self.request.build_absolute_uri(),
+            self.cursor_query_param,
+            self.encode_cursor(self.next_position),
+        )
+
+    def get_previous_link(self):
+        if not self.keyset:
+            return super().get_previous_link()
+        return None
+
+    def decode_cursor(self, request):
+        encoded = request.query_params[self.cursor_query_param]
+        if not encoded:
+            return None
+        try:
+            pub_date, pk = b64decode(encoded.encode("ascii")).decode(
+                "ascii").split("|")
+            pub_date, pk = parse_datetime(pub_date), int(pk)
+        except (TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+        if pub_date is None:
+            raise NotFound(self.invalid_cursor_message)
+        return pub_date, pk
+
+    @staticmethod
+    def encode_cursor(position):
+        pub_date, pk = position
+        return b64encode(
+            f"{pub_date.isoformat()}|{pk}".encode("ascii")
+        ).decode("ascii")
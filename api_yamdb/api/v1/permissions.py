@@ -17,5 +17,5 @@ class IsAdminOrModeratorOrAuthorOrReadOnly(BasePermission):
             request.method in SAFE_METHODS
             or request.user.is_admin
             or request.user.is_moderator
-            or request.user == obj.author
+            or request.user.pk == obj.author_id
         )
@@ -0,0 +1,51 @@
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.permissions import SAFE_METHODS
+
+from api_yamdb.db.routers import choose_replica, read_replica
+
+
+def pinned_key(user_id):
+    return f"replica-pinned:{user_id}"
+
+
+def get_pin_cache():
+    # Следующий запрос пользователя может попасть в другой процесс.
+    return caches[getattr(settings, "SHARED_CACHE_ALIAS", "default")]
+
+
+class ReplicaReadMixin:
+    """Читает данные безопасных запросов с реплики.
+
+    После успешной записи пользователь на `REPLICA_PIN_SECONDS` секунд
+    закрепляется за основной базой, чтобы видеть свои изменения, пока
+    они не дошли до реплик.
+    """
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if request.method not in SAFE_METHODS:
+            return
+        user = request.user
+        if user.is_authenticated and get_pin_cache().get(
+            pinned_key(user.pk)
+        ):
+            return
+        self._replica_token = read_replica.set(choose_replica())
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        token = getattr(self, "_replica_token", None)
+        if token is not None:
+            read_replica.reset(token)
+            self._replica_token = None
+        if (
+            request.method not in SAFE_METHODS
+            and response.status_code < 400
+            and request.user.is_authenticated
+        ):
+            get_pin_cache().set(
+                pinned_key(request.user.pk),
+                True,
+                getattr(settings, "REPLICA_PIN_SECONDS", 5),
+            )
+        return super().finalize_response(request, response, *args, **kwargs)
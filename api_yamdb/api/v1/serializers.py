@@ -1,7 +1,9 @@
 from datetime import datetime
 
+from django.utils.encoding import smart_str
 from rest_framework import serializers
 
+from reviews.lookups import categories, genres
 from reviews.models import Category, Comment, Genre, Review, Title
 from users.models import User
 
@@ -42,16 +44,37 @@ class GenreSerializer(serializers.ModelSerializer):
         model = Genre
 
 
+class CachedSlugRelatedField(serializers.SlugRelatedField):
+    """`SlugRelatedField`, который находит объект по слагу в `SlugTable`.
+
+    Объект собирается из кеша без запроса к БД.
+    """
+
+    def __init__(self, table, **kwargs):
+        self.table = table
+        kwargs.setdefault("queryset", table.model.objects.all())
+        super().__init__(slug_field="slug", **kwargs)
+
+    def to_internal_value(self, data):
+        if not isinstance(data, str):
+            self.fail("invalid")
+        snapshot = self.table.snapshot()
+        pk = snapshot.get_id(data)
+        if pk is None:
+            self.fail(
+                "does_not_exist",
+                slug_name=self.slug_field,
+                value=smart_str(data),
+            )
+        item = snapshot[pk]
+        return self.table.model.from_db(
+            None, ["id", "name", "slug"], [pk, item["name"], item["slug"]]
+        )
+
+
 class TitleSerializer(serializers.ModelSerializer):
-    genre = serializers.SlugRelatedField(
-        slug_field="slug",
-        queryset=Genre.objects.all(),
-        many=True,
-    )
-    category = serializers.SlugRelatedField(
-        slug_field="slug",
-        queryset=Category.objects.all(),
-    )
+    genre = CachedSlugRelatedField(table=genres, many=True)
+    category = CachedSlugRelatedField(table=categories)
 
     class Meta:
         fields = ("id", "name", "year", "description", "genre", "category")
@@ -83,22 +106,25 @@ class ReviewSerializer(serializers.ModelSerializer):
         read_only=True,
     )
 
-    def validate(self, data):
-        if self.context["request"].method != "POST":
-            return data
-        author = self.context["request"].user
-        title_id = self.context["view"].kwargs["title_id"]
-        if Review.objects.filter(author=author, title__id=title_id).exists():
-            raise serializers.ValidationError(
-                "Запрещено оставлять отзыв на одно произведение дважды"
-            )
-        return data
-
     class Meta:
         fields = ("id", "text", "author", "score", "pub_date")
         model = Review
 
 
+class ReviewBulkItemSerializer(serializers.ModelSerializer):
+    """Отзыв из пакетной загрузки.
+
+    Проверки, требующие запросов к БД (существование произведения и
+    автора, уникальность отзыва), выполняются сразу для всего пакета.
+    """
+    title = serializers.IntegerField(min_value=1)
+    author = serializers.CharField(required=False)
+
+    class Meta:
+        fields = ("title", "author", "text", "score")
+        model = Review
+
+
 class CommentSerializer(serializers.ModelSerializer):
     author = serializers.SlugRelatedField(
         default=serializers.CurrentUserDefault(),
@@ -0,0 +1,89 @@
+import json
+from itertools import islice
+
+from django.db.models import prefetch_related_objects
+from django.http import StreamingHttpResponse
+from rest_framework.renderers import BaseRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+from api.v1.compiled import compile_serializer
+
+
+def dump_line(data):
+    return json.dumps(
+        data, cls=JSONEncoder, ensure_ascii=False, separators=(",", ":")
+    )
+
+
+class NDJSONRenderer(BaseRenderer):
+    """Один JSON-объект на строку (newline-delimited JSON).
+
+    Списки в этом формате отдаются потоком через `StreamingListMixin`,
+    рендерер используется только для остальных ответов, например ошибок.
+    """
+    media_type = "application/x-ndjson"
+    format = "ndjson"
+    charset = "utf-8"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        return (dump_line(data) + "\n").encode(self.charset)
+
+
+class StreamingListMixin:
+    """Отдает список потоком в формате NDJSON без пагинации.
+
+    Включается параметром `?format=ndjson` или заголовком
+    `Accept: application/x-ndjson`. Выборка читается через `iterator()`
+    пачками по `stream_chunk_size` строк, и каждая пачка сериализуется и
+    отправляется отдельно, поэтому потребление памяти не зависит от
+    размера выгрузки. Фильтры и сортировка вьюсета применяются как
+    обычно.
+    """
+    stream_chunk_size = 2000
+
+    def get_renderers(self):
+        renderers = super().get_renderers()
+        if self.action == "list":
+            renderers.append(NDJSONRenderer())
+        return renderers
+
+    def list(self, request, *args, **kwargs):
+        if request.accepted_renderer.format != NDJSONRenderer.format:
+            return super().list(request, *args, **kwargs)
+        queryset = self.filter_queryset(self.get_queryset())
+        # Поток читается уже после выхода из вьюсета, поэтому база для
+        # чтения (например, реплика) фиксируется заранее.
+        queryset = queryset.using(queryset.db)
+        lines = self.stream_rows(queryset)
+        return StreamingHttpResponse(
+            (line + "\n" for line in lines),
+            content_type=(
+                f"{NDJSONRenderer.media_type}; "
+                f"charset={NDJSONRenderer.charset}"
+            ),
+        )
+
+    def stream_rows(self, queryset):
+        """Возвращает итератор строк JSON, по одной на объект."""
+        compiled = compile_serializer(self.get_serializer_class())
+        if compiled is not None:
+            rows = compiled.values(queryset).iterator(self.stream_chunk_size)
+            for chunk in iter(
+                lambda: list(islice(rows, self.stream_chunk_size)), []
+            ):
+                for data in compiled.represent_many(chunk, queryset.db):
+                    yield dump_line(data)
+            return
+
+        lookups = queryset._prefetch_related_lookups
+        objects = queryset.iterator(self.stream_chunk_size)
+        for chunk in iter(
+            lambda: list(islice(objects, self.stream_chunk_size)), []
+        ):
+            # iterator() не выполняет prefetch_related, поэтому связанные
+            # объекты подгружаются на каждую пачку.
+            prefetch_related_objects(chunk, *lookups)
+            for data in self.get_serializer(chunk, many=True).data:
+                yield dump_line(data)
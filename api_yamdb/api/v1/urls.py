@@ -1,14 +1,19 @@
 from rest_framework.routers import DefaultRouter
 
 from .views import (AuthViewSet, CategoryViewSet, CommentViewSet,
-                    GenreViewSet, ReviewViewSet, TitleViewSet,
-                    UserViewSet)
+                    GenreViewSet, ReviewBulkViewSet, ReviewViewSet,
+                    TitleViewSet, UserViewSet)
 
 v1_router = DefaultRouter()
 v1_router.register("auth", AuthViewSet)
 v1_router.register("users", UserViewSet)
 v1_router.register("categories", CategoryViewSet)
 v1_router.register("genres", GenreViewSet)
+v1_router.register(
+    "titles/reviews",
+    ReviewBulkViewSet,
+    basename="reviews-bulk",
+)
 v1_router.register("titles", TitleViewSet)
 v1_router.register(
     r"titles/(?P<title_id>\d+)/reviews",
@@ -1,31 +1,44 @@
+from collections import defaultdict
+from itertools import islice, product
+
 from django.contrib.auth.tokens import default_token_generator
-from django.core.mail import send_mail
-from django.db.models import Avg
+from django.db import IntegrityError, connection, transaction
 from django.shortcuts import get_object_or_404
 from django_filters.rest_framework import DjangoFilterBackend
 
 from rest_framework import status
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.filters import SearchFilter
 from rest_framework.mixins import (CreateModelMixin, DestroyModelMixin,
                                    ListModelMixin)
-from rest_framework.pagination import LimitOffsetPagination
 from rest_framework.permissions import (AllowAny, IsAuthenticated,
                                         IsAuthenticatedOrReadOnly)
 from rest_framework.response import Response
+from rest_framework.settings import api_settings
 from rest_framework.viewsets import GenericViewSet, ModelViewSet
-from rest_framework_simplejwt.tokens import AccessToken
 
-from api.v1.filters import TitleFilters
+from api.v1.authentication import get_request_user
+from api.v1.cache import CachedListMixin, CachedRetrieveMixin
+from api.v1.cards import CardListMixin
+from api.v1.compiled import CompiledListMixin, CompiledRetrieveMixin
+from api.v1.filters import TitleFilters, TitleOrderingFilter
+from api.v1.pagination import CountPagination, KeysetPagination
 from api.v1.permissions import (IsAdmin, IsAdminOrModeratorOrAuthorOrReadOnly,
                                 IsReadOnly)
+from api.v1.replicas import ReplicaReadMixin
 from api.v1.serializers import (CategorySerializer, CommentSerializer,
-                                GenreSerializer, ReviewSerializer,
-                                SignInSerializer, SignUpSerializer,
-                                TitleReadOnlySerializer, TitleSerializer,
-                                UserSerializer)
-from api_yamdb.settings import EMAIL_FROM
-from reviews.models import Category, Genre, Review, Title, User
+                                GenreSerializer, ReviewBulkItemSerializer,
+                                ReviewSerializer, SignInSerializer,
+                                SignUpSerializer, TitleReadOnlySerializer,
+                                TitleSerializer, UserSerializer)
+from api.v1.streaming import StreamingListMixin
+from reviews.cache import (bump_on_commit, bump_rating_versions,
+                           bump_version)
+from reviews.models import (Category, Comment, Genre, GenreTitle, Review,
+                            Title, TitleScore, User)
+from users.outbox import enqueue_email
+from users.tokens import RoleAccessToken
 
 
 class AuthViewSet(GenericViewSet):
@@ -37,17 +50,19 @@ class AuthViewSet(GenericViewSet):
         serializer = SignUpSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
 
-        user = self._get_or_create_user(serializer.validated_data)
-        confirmation_code = default_token_generator.make_token(user)
-        send_mail(
-            subject="Verification Code",
-            message=(
-                f"Hello, {user.username}! "
-                f"Your confirmation code is: {confirmation_code}."
-            ),
-            from_email=EMAIL_FROM,
-            recipient_list=[user.email],
-        )
+        with transaction.atomic():
+            user = self._get_or_create_user(serializer.validated_data)
+            confirmation_code = default_token_generator.make_token(user)
+            enqueue_email(
+                subject="Verification Code",
+                body=(
+                    f"Hello, {user.username}! "
+                    f"Your confirmation code is: {confirmation_code}."
+                ),
+                to=user.email,
+                user=user,
+                dedup_key=f"signup:{user.pk}",
+            )
         return Response(serializer.data)
 
     def _get_or_create_user(self, data):
@@ -68,18 +83,20 @@ class AuthViewSet(GenericViewSet):
 
         user = get_object_or_404(User, username=username)
         if default_token_generator.check_token(user, confirmation_code):
-            return Response(data={"token": str(AccessToken.for_user(user))})
+            token = RoleAccessToken.for_user(user)
+            return Response(data={"token": str(token)})
         return Response(
             data={"confirmation_code": "Некорректный код подтверждения."},
             status=status.HTTP_400_BAD_REQUEST,
         )
 
 
-class UserViewSet(ModelViewSet):
+class UserViewSet(StreamingListMixin, ModelViewSet):
     queryset = User.objects.all()
     serializer_class = UserSerializer
     permission_classes = [IsAdmin]
-    pagination_class = LimitOffsetPagination
+    query_budget = {"list": 3, "retrieve": 2}
+    pagination_class = CountPagination
     filter_backends = [SearchFilter]
     search_fields = ["^username"]
     lookup_field = "username"
@@ -87,12 +104,13 @@ class UserViewSet(ModelViewSet):
     @action(methods=["GET", "PATCH"], detail=False,
             permission_classes=[IsAuthenticated])
     def me(self, request):
+        user = get_object_or_404(User, pk=request.user.pk)
         if request.method == "GET":
-            serializer = self.get_serializer(request.user)
+            serializer = self.get_serializer(user)
             return Response(serializer.data)
 
         serializer = self.get_serializer(
-            request.user, data=request.data, partial=True)
+            user, data=request.data, partial=True)
         serializer.is_valid(raise_exception=True)
         serializer.validated_data.pop('role', None)
         serializer.save()
@@ -108,76 +126,378 @@ class ListCreateDestroyViewSet(
     pass
 
 
-class CategoryViewSet(ListCreateDestroyViewSet):
+class CategoryViewSet(
+    ReplicaReadMixin,
+    CachedListMixin,
+    CompiledListMixin,
+    ListCreateDestroyViewSet,
+):
+    cache_models = (Category,)
+    query_budget = {"list": 3}
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
     permission_classes = [IsAdmin | IsReadOnly]
-    pagination_class = LimitOffsetPagination
+    pagination_class = CountPagination
     filter_backends = [SearchFilter]
     search_fields = ["^name"]
     lookup_field = "slug"
 
 
-class GenreViewSet(ListCreateDestroyViewSet):
+class GenreViewSet(
+    ReplicaReadMixin,
+    CachedListMixin,
+    CompiledListMixin,
+    ListCreateDestroyViewSet,
+):
+    cache_models = (Genre,)
+    query_budget = {"list": 3}
     queryset = Genre.objects.all()
     serializer_class = GenreSerializer
     permission_classes = [IsAdmin | IsReadOnly]
-    pagination_class = LimitOffsetPagination
+    pagination_class = CountPagination
     filter_backends = [SearchFilter]
     search_fields = ["^name"]
     lookup_field = "slug"
 
 
-class TitleViewSet(ModelViewSet):
-    queryset = Title.objects.annotate(rating=Avg("reviews__score")).all()
+class TitleViewSet(
+    ReplicaReadMixin,
+    CachedListMixin,
+    CachedRetrieveMixin,
+    CardListMixin,
+    StreamingListMixin,
+    CompiledListMixin,
+    CompiledRetrieveMixin,
+    ModelViewSet,
+):
+    cache_models = (Category, Genre, GenreTitle, Title)
+    query_budget = {"list": 4, "retrieve": 3, "stats": 2}
+    queryset = Title.objects.defer("card").select_related(
+        "category"
+    ).prefetch_related("genre")
     permission_classes = [IsAdmin | IsReadOnly]
-    pagination_class = LimitOffsetPagination
-    filter_backends = [DjangoFilterBackend]
+    pagination_class = CountPagination
+    filter_backends = [DjangoFilterBackend, TitleOrderingFilter]
     filterset_class = TitleFilters
+    lookup_value_regex = r"\d+"
+
+    def get_cache_models(self):
+        # Отзывы меняют только рейтинги: список зависит от рейтингов всех
+        # произведений, произведение и его статистика - только от своего.
+        if self.detail:
+            scope = f"rating:{self.kwargs[self.lookup_field]}"
+        else:
+            scope = "ratings"
+        return [*self.cache_models, (Title, scope)]
 
     def get_serializer_class(self):
         if self.request.method == "GET":
             return TitleReadOnlySerializer
         return TitleSerializer
 
+    @action(methods=["GET"], detail=True)
+    def stats(self, request, pk=None):
+        return self.get_cached_response(self._get_stats, request, pk=pk)
+
+    def _get_stats(self, request, pk):
+        # Распределение хранится в TitleScore, поэтому запрос не зависит
+        # от количества отзывов. Произведение проверяется, только если
+        # отзывов нет.
+        stats = TitleScore.objects.get_stats(pk)
+        if not stats["count"]:
+            get_object_or_404(Title.objects.only("pk"), pk=pk)
+        return Response(stats)
+
+
+class NestedViewSetMixin:
+    """Вьюсет объектов, вложенных в родительский объект из URL.
+
+    `parent_lookups` сопоставляет поля родительской модели с аргументами
+    URL, `parent_field` - имя внешнего ключа на родителя. Родитель
+    загружается не больше одного раза за запрос и только когда без этого
+    не обойтись: список и отдельный объект фильтруются по аргументам URL,
+    а отсутствие родителя проверяется, только если ничего не найдено.
+    """
+    parent_model = None
+    parent_field = None
+    parent_lookups = {"pk": "pk"}
+
+    def get_parent_kwargs(self):
+        return {
+            field: self.kwargs[kwarg]
+            for field, kwarg in self.parent_lookups.items()
+        }
+
+    def get_parent(self):
+        if not hasattr(self, "_parent"):
+            self._parent = get_object_or_404(
+                self.parent_model.objects.only("pk"),
+                **self.get_parent_kwargs(),
+            )
+        return self._parent
 
-class ReviewViewSet(ModelViewSet):
+    def get_queryset(self):
+        return self.queryset.filter(**{
+            f"{self.parent_field}__{field}": value
+            for field, value in self.get_parent_kwargs().items()
+        })
+
+    def paginate_queryset(self, queryset):
+        page = super().paginate_queryset(queryset)
+        if not page:
+            self.get_parent()
+        return page
+
+    def stream_rows(self, queryset):
+        # После начала потока вернуть 404 уже нельзя.
+        self.get_parent()
+        return super().stream_rows(queryset)
+
+
+class ReviewViewSet(
+    ReplicaReadMixin,
+    NestedViewSetMixin,
+    StreamingListMixin,
+    CompiledListMixin,
+    CompiledRetrieveMixin,
+    ModelViewSet,
+):
+    queryset = Review.objects.select_related("author")
     serializer_class = ReviewSerializer
     permission_classes = [
         IsAuthenticatedOrReadOnly,
         IsAdminOrModeratorOrAuthorOrReadOnly,
     ]
-    pagination_class = LimitOffsetPagination
-
-    def get_queryset(self):
-        title = get_object_or_404(Title, id=self.kwargs.get("title_id"))
-        return title.reviews.all()
+    pagination_class = KeysetPagination
+    query_budget = {"list": 3, "retrieve": 2}
+    parent_model = Title
+    parent_field = "title"
+    parent_lookups = {"pk": "title_id"}
 
     def perform_create(self, serializer):
-        title = get_object_or_404(Title, id=self.kwargs.get("title_id"))
-        serializer.save(author=self.request.user, title=title)
+        # Уникальность отзыва проверяет ограничение БД. Ошибка внешнего
+        # ключа на произведение откладывается до конца внешней транзакции,
+        # поэтому произведение загружается заранее.
+        title = self.get_parent()
+        author = get_request_user(self.request)
+        try:
+            serializer.save(author=author, title=title)
+        except IntegrityError:
+            if not Review.objects.filter(
+                title=title, author_id=author.pk
+            ).exists():
+                raise
+            raise ValidationError({
+                api_settings.NON_FIELD_ERRORS_KEY: [
+                    "Запрещено оставлять отзыв на одно произведение дважды"
+                ],
+            })
 
 
-class CommentViewSet(ModelViewSet):
+class CommentViewSet(
+    ReplicaReadMixin,
+    CompiledListMixin,
+    CompiledRetrieveMixin,
+    NestedViewSetMixin,
+    ModelViewSet,
+):
+    queryset = Comment.objects.select_related("author")
     serializer_class = CommentSerializer
     permission_classes = [
         IsAuthenticatedOrReadOnly,
         IsAdminOrModeratorOrAuthorOrReadOnly,
     ]
-    pagination_class = LimitOffsetPagination
+    pagination_class = KeysetPagination
+    query_budget = {"list": 3, "retrieve": 2}
+    parent_model = Review
+    parent_field = "review"
+    parent_lookups = {"pk": "review_id", "title_id": "title_id"}
 
-    def get_queryset(self):
-        review = get_object_or_404(
-            Review,
-            id=self.kwargs.get("review_id"),
-            title_id=self.kwargs.get("title_id"),
+    def perform_create(self, serializer):
+        serializer.save(
+            author=get_request_user(self.request),
+            review=self.get_parent(),
         )
-        return review.comments.all()
 
-    def perform_create(self, serializer):
-        review = get_object_or_404(
-            Review,
-            id=self.kwargs.get("review_id"),
-            title_id=self.kwargs.get("title_id"),
+
+def chunks(values, size):
+    values = iter(values)
+    while True:
+        chunk = list(islice(values, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+class ReviewBulkViewSet(ReplicaReadMixin, GenericViewSet):
+    """Пакетная загрузка отзывов на разные произведения.
+
+    Принимает список отзывов и возвращает результат для каждого элемента
+    в том же порядке. Существование произведений и авторов и повторные
+    отзывы проверяются запросами по множествам идентификаторов, отзывы
+    вставляются через `bulk_create`, а рейтинг каждого затронутого
+    произведения обновляется одним запросом. Указывать автора отзыва
+    может только администратор.
+    """
+    queryset = Review.objects.all()
+    serializer_class = ReviewBulkItemSerializer
+    permission_classes = [IsAuthenticated]
+    max_items = 5000
+
+    @action(methods=["POST"], detail=False)
+    def bulk(self, request):
+        items = request.data
+        if not isinstance(items, list):
+            raise ValidationError("Ожидается список отзывов.")
+        if len(items) > self.max_items:
+            raise ValidationError(
+                f"В одном запросе можно передать не больше "
+                f"{self.max_items} отзывов."
+            )
+
+        results, valid = self._validate_items(items)
+        titles = self._existing_ids(
+            Title.objects.all(),
+            "pk",
+            {data["title"] for data in valid.values()},
+        )
+        authors = self._existing_ids(
+            User.objects.all(),
+            "username",
+            {data["author"] for data in valid.values()},
+        )
+
+        reviews = {}
+        for index, data in valid.items():
+            if data["title"] not in titles:
+                results[index] = self._error(
+                    "title", "Произведение не найдено."
+                )
+            elif data["author"] not in authors:
+                results[index] = self._error(
+                    "author", "Пользователь не найден."
+                )
+            else:
+                reviews[index] = Review(
+                    title_id=data["title"],
+                    author_id=authors[data["author"]],
+                    text=data["text"],
+                    score=data["score"],
+                )
+
+        try:
+            with transaction.atomic():
+                self._skip_duplicates(reviews, results)
+                self._create(reviews)
+        except IntegrityError:
+            return Response(
+                {"detail": "Отзывы изменились во время загрузки, "
+                           "повторите запрос."},
+                status=status.HTTP_409_CONFLICT,
+            )
+
+        for index, review in reviews.items():
+            results[index] = {
+                "status": status.HTTP_201_CREATED,
+                "id": review.pk,
+                "title": review.title_id,
+            }
+        return Response({
+            "created": len(reviews),
+            "failed": len(items) - len(reviews),
+            "results": results,
+        })
+
+    def _validate_items(self, items):
+        serializer = self.get_serializer()
+        user = self.request.user
+        results = [None] * len(items)
+        valid = {}
+        for index, item in enumerate(items):
+            try:
+                data = serializer.run_validation(item)
+            except ValidationError as error:
+                results[index] = {
+                    "status": status.HTTP_400_BAD_REQUEST,
+                    "errors": error.detail,
+                }
+                continue
+            data.setdefault("author", user.username)
+            if data["author"] != user.username and not user.is_admin:
+                results[index] = self._error(
+                    "author", "Только администратор может указать автора."
+                )
+                continue
+            valid[index] = data
+        return results, valid
+
+    @staticmethod
+    def _error(field, message):
+        return {
+            "status": status.HTTP_400_BAD_REQUEST,
+            "errors": {field: [message]},
+        }
+
+    @staticmethod
+    def _existing_ids(queryset, field, values):
+        """Возвращает словарь `{значение поля: id}` для найденных строк."""
+        ids = {}
+        size = connection.features.max_query_params or len(values) or 1
+        for chunk in chunks(values, size):
+            ids.update(queryset.filter(
+                **{f"{field}__in": chunk}
+            ).values_list(field, "pk"))
+        return ids
+
+    @staticmethod
+    def _pairs(title_ids, author_ids):
+        size = (connection.features.max_query_params or 2000) // 2
+        pairs = set()
+        for titles, authors in product(
+            list(chunks(title_ids, size)), list(chunks(author_ids, size))
+        ):
+            pairs.update(Review.objects.filter(
+                title_id__in=titles, author_id__in=authors
+            ).values_list("title_id", "author_id", "pk"))
+        return {(title, author): pk for title, author, pk in pairs}
+
+    def _skip_duplicates(self, reviews, results):
+        existing = self._pairs(
+            {review.title_id for review in reviews.values()},
+            {review.author_id for review in reviews.values()},
         )
-        serializer.save(author=self.request.user, review=review)
+        seen = set(existing)
+        for index, review in list(reviews.items()):
+            pair = (review.title_id, review.author_id)
+            if pair in seen:
+                del reviews[index]
+                results[index] = self._error(
+                    "non_field_errors",
+                    "Запрещено оставлять отзыв на одно произведение дважды",
+                )
+            seen.add(pair)
+
+    def _create(self, reviews):
+        if not reviews:
+            return
+        created = Review.objects.bulk_create(reviews.values())
+        if created[0].pk is None:
+            # Не все СУБД возвращают первичные ключи из bulk_create.
+            ids = self._pairs(
+                {review.title_id for review in created},
+                {review.author_id for review in created},
+            )
+            for review in created:
+                review.pk = ids[(review.title_id, review.author_id)]
+
+        ratings = defaultdict(lambda: [0, 0])
+        scores = defaultdict(int)
+        for review in created:
+            ratings[review.title_id][0] += review.score
+            ratings[review.title_id][1] += 1
+            scores[(review.title_id, review.score)] += 1
+        for title_id, (score_sum, count) in ratings.items():
+            Title.objects.add_rating(title_id, score_sum, count)
+        TitleScore.objects.add_scores(scores)
+        bump_on_commit(bump_version, Review)
+        bump_on_commit(bump_rating_versions, Title, list(ratings))
@@ -0,0 +1,35 @@
+class HealthCheckMixin:
+    """Проверяет постоянное соединение перед первым запросом к БД.
+
+    При включенном `CONN_HEALTH_CHECKS` соединение, переиспользуемое в
+    новом HTTP-запросе, проверяется один раз и при обрыве открывается
+    заново, а не приводит к ошибке в запросе.
+    """
+    health_check_done = False
+
+    @property
+    def health_check_enabled(self):
+        return self.settings_dict.get("CONN_HEALTH_CHECKS", False)
+
+    def connect(self):
+        # Новое соединение не проверяется, в том числе из set_autocommit()
+        # внутри connect(): проверка открыла бы транзакцию.
+        self.health_check_done = True
+        super().connect()
+
+    def ensure_connection(self):
+        if (
+            self.connection is not None
+            and self.health_check_enabled
+            and not self.health_check_done
+            and not self.in_atomic_block
+        ):
+            if not self.is_usable():
+                self.close()
+            self.health_check_done = True
+        super().ensure_connection()
+
+    def close_if_unusable_or_obsolete(self):
+        # Вызывается в начале и в конце каждого HTTP-запроса.
+        self.health_check_done = False
+        super().close_if_unusable_or_obsolete()
@@ -0,0 +1,74 @@
+import os
+import threading
+
+from django.db.backends.postgresql import base
+from psycopg2 import pool as psycopg2_pool
+
+from api_yamdb.db.backends.mixins import HealthCheckMixin
+
+pools = {}
+pools_lock = threading.Lock()
+
+
+class DatabaseWrapper(HealthCheckMixin, base.DatabaseWrapper):
+    """PostgreSQL с необязательным пулом соединений внутри процесса.
+
+    Если задан `POOL` (`MIN_SIZE`, `MAX_SIZE`), соединения берутся из
+    общего для потоков процесса пула и возвращаются в него при закрытии,
+    в том числе по истечении `CONN_MAX_AGE`. `MAX_SIZE` должен быть не
+    меньше числа потоков сервера.
+    """
+
+    def get_pool(self, conn_params):
+        options = self.settings_dict.get("POOL")
+        if not options:
+            return None
+        # После fork соединения родительского процесса использовать нельзя.
+        key = (self.alias, os.getpid())
+        with pools_lock:
+            if key not in pools:
+                pools[key] = psycopg2_pool.ThreadedConnectionPool(
+                    options.get("MIN_SIZE", 1),
+                    options["MAX_SIZE"],
+                    **conn_params,
+                )
+            return pools[key]
+
+    pool = None
+
+    def get_new_connection(self, conn_params):
+        self.pool = pool = self.get_pool(conn_params)
+        if pool is None:
+            return super().get_new_connection(conn_params)
+
+        connection = pool.getconn()
+        if connection.closed or (
+            self.health_check_enabled and not self._ping(connection)
+        ):
+            pool.putconn(connection, close=True)
+            connection = pool.getconn()
+
+        options = self.settings_dict["OPTIONS"]
+        self.isolation_level = options.get(
+            "isolation_level", connection.isolation_level
+        )
+        if self.isolation_level != connection.isolation_level:
+            connection.set_session(isolation_level=self.isolation_level)
+        return connection
+
+    @staticmethod
+    def _ping(connection):
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT 1")
+        except base.Database.Error:
+            return False
+        if not connection.autocommit:
+            connection.rollback()
+        return True
+
+    def _close(self):
+        if self.pool is None or self.connection is None:
+            return super()._close()
+        with self.wrap_database_errors:
+            self.pool.putconn(self.connection)
@@ -0,0 +1,17 @@
+from django.db.backends.sqlite3 import base
+
+from api_yamdb.db.backends.mixins import HealthCheckMixin
+
+
+class DatabaseWrapper(HealthCheckMixin, base.DatabaseWrapper):
+    """SQLite с настройками из `PRAGMAS` для каждого нового соединения.
+
+    WAL позволяет читать базу параллельно с записью, а
+    `synchronous = NORMAL` в этом режиме не теряет целостность при сбое.
+    """
+
+    def get_new_connection(self, conn_params):
+        connection = super().get_new_connection(conn_params)
+        for name, value in self.settings_dict.get("PRAGMAS", {}).items():
+            connection.execute(f"PRAGMA {name} = {value}")
+        return connection
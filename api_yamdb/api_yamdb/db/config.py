@@ -0,0 +1,74 @@
+import os
+
+SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "busy_timeout": 5000,
+    "temp_store": "MEMORY",
+    "cache_size": -20000,
+    "mmap_size": 256 * 1024 * 1024,
+}
+
+
+def get_bool(env, name, default):
+    value = env.get(name)
+    if value is None:
+        return default
+    return value.lower() in ("1", "true", "yes", "on")
+
+
+def get_databases(base_dir, env=os.environ):
+    """Строит настройку `DATABASES` по переменным окружения.
+
+    `DB_ENGINE` выбирает `sqlite3` (по умолчанию) или `postgresql`.
+    Для PostgreSQL реплики для чтения перечисляются в `DB_REPLICA_HOSTS`
+    через запятую и получают псевдонимы `replica1`, `replica2` и т.д.
+    """
+    conn_max_age = env.get("DB_CONN_MAX_AGE", "60")
+    common = {
+        "CONN_MAX_AGE": None if conn_max_age == "" else int(conn_max_age),
+        "CONN_HEALTH_CHECKS": get_bool(env, "DB_CONN_HEALTH_CHECKS", True),
+    }
+
+    if env.get("DB_ENGINE", "sqlite3") != "postgresql":
+        pragmas = dict(SQLITE_PRAGMAS)
+        if not get_bool(env, "DB_SQLITE_WAL", True):
+            pragmas.pop("journal_mode")
+        return {
+            "default": {
+                **common,
+                "ENGINE": "api_yamdb.db.backends.sqlite3",
+                "NAME": env.get(
+                    "DB_NAME", os.path.join(base_dir, "db.sqlite3")
+                ),
+                "PRAGMAS": pragmas,
+            },
+        }
+
+    default = {
+        **common,
+        "ENGINE": "api_yamdb.db.backends.postgresql",
+        "NAME": env.get("DB_NAME", "api_yamdb"),
+        "USER": env.get("DB_USER", "postgres"),
+        "PASSWORD": env.get("DB_PASSWORD", ""),
+        "HOST": env.get("DB_HOST", "localhost"),
+        "PORT": env.get("DB_PORT", "5432"),
+        "POOL": None,
+    }
+    if env.get("DB_POOL_MAX_SIZE"):
+        default["POOL"] = {
+            "MIN_SIZE": int(env.get("DB_POOL_MIN_SIZE", "1")),
+            "MAX_SIZE": int(env["DB_POOL_MAX_SIZE"]),
+        }
+
+    databases = {"default": default}
+    hosts = filter(None, env.get("DB_REPLICA_HOSTS", "").split(","))
+    for number, host in enumerate(hosts, start=1):
+        host, _, port = host.strip().partition(":")
+        databases[f"replica{number}"] = {
+            **default,
+            "HOST": host,
+            "PORT": port or default["PORT"],
+            "TEST": {"MIRROR": "default"},
+        }
+    return databases
@@ -0,0 +1,57 @@
+import contextvars
+import threading
+import time
+
+from django.conf import settings
+from django.db import DatabaseError, connections
+
+read_replica = contextvars.ContextVar("read_replica", default=None)
+
+_lock = threading.Lock()
+_position = 0
+_down_until = {}
+
+
+def choose_replica():
+    """Выбирает реплику для чтения по кругу, пропуская недоступные.
+
+    Реплика, к которой не удалось подключиться, исключается на
+    `REPLICA_RETRY_SECONDS` секунд. Если доступных реплик нет,
+    возвращает `None` и чтение идет с основной базы.
+    """
+    global _position
+    replicas = getattr(settings, "DATABASE_REPLICAS", [])
+    for _ in range(len(replicas)):
+        with _lock:
+            alias = replicas[_position % len(replicas)]
+            _position += 1
+        if _down_until.get(alias, 0) > time.monotonic():
+            continue
+        try:
+            connections[alias].ensure_connection()
+        except DatabaseError:
+            _down_until[alias] = time.monotonic() + getattr(
+                settings, "REPLICA_RETRY_SECONDS", 30
+            )
+            continue
+        return alias
+    return None
+
+
+class ReplicaRouter:
+    """Направляет чтение на реплику, выбранную для текущего запроса.
+
+    Реплику выбирает вьюсет (см. `api.v1.replicas.ReplicaReadMixin`) для
+    безопасных запросов; все остальные запросы, запись и миграции
+    выполняются на основной базе.
+    """
+
+    def db_for_read(self, model, **hints):
+        return read_replica.get()
+
+    def db_for_write(self, model, **hints):
+        return "default"
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Реплики содержат те же данные, что и основная база.
+        return True
@@ -1,5 +1,8 @@
 import os
 from datetime import timedelta
+from importlib.util import find_spec
+
+from api_yamdb.db.config import get_databases
 
 # Build paths inside the project like this: os.path.join(BASE_DIR, ...)
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -31,6 +34,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "api.middleware.QueryProfilerMiddleware",
+    "api.middleware.CompressionMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -64,13 +69,62 @@ WSGI_APPLICATION = "api_yamdb.wsgi.application"
 
 # Database
 
-DATABASES = {
+DATABASES = get_databases(BASE_DIR)
+
+DATABASE_ROUTERS = ["api_yamdb.db.routers.ReplicaRouter"]
+
+DATABASE_REPLICAS = [alias for alias in DATABASES if alias != "default"]
+
+# Сколько секунд после записи пользователь читает с основной базы.
+REPLICA_PIN_SECONDS = 5
+
+# Через сколько секунд снова пробовать недоступную реплику.
+REPLICA_RETRY_SECONDS = 30
+
+
+# Cache
+
+CACHES = {
     "default": {
-        "ENGINE": "django.db.backends.sqlite3",
-        "NAME": os.path.join(BASE_DIR, "db.sqlite3"),
-    }
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    # Общий для всех процессов кеш: версии данных для сброса кеша ответов,
+    # отзыв токенов и закрепление пользователей за основной базой. По
+    # умолчанию локальный для процесса, на сервере задайте общий кеш
+    # (например, Memcached) переменными SHARED_CACHE_BACKEND и
+    # SHARED_CACHE_LOCATION.
+    "shared": {
+        "BACKEND": os.environ.get(
+            "SHARED_CACHE_BACKEND",
+            "django.core.cache.backends.locmem.LocMemCache",
+        ),
+        "LOCATION": os.environ.get("SHARED_CACHE_LOCATION", "shared"),
+        "TIMEOUT": None,
+    },
 }
 
+RESPONSE_CACHE_ALIAS = "default"
+SHARED_CACHE_ALIAS = "shared"
+
+# Сжатие ответов: br и zstd доступны, если установлены пакеты brotli и
+# zstandard.
+COMPRESSION_MIN_SIZE = 1024
+COMPRESSION_ENCODINGS = ["br", "zstd", "gzip"]
+
+
+# Взвешенный рейтинг произведений: оценки сглаживаются к среднему
+# TITLE_RATING_PRIOR_MEAN с весом TITLE_RATING_PRIOR_COUNT оценок. После
+# изменения нужно выполнить rebuild_ratings.
+TITLE_RATING_PRIOR_MEAN = 5.5
+TITLE_RATING_PRIOR_COUNT = 10
+
+
+# Query profiling
+
+SERVER_TIMING_HEADER = DEBUG
+QUERY_LOG_THRESHOLD_MS = 500
+QUERY_BUDGET_ENFORCE = False
+
 
 # Password validation
 
@@ -114,9 +168,39 @@ AUTH_USER_MODEL = "users.User"
 EMAIL_BACKEND = "django.core.mail.backends.console.EmailBackend"
 EMAIL_FROM = "admin@yamdb.ru"
 
+# Очередь исходящих писем: отправляется командой send_emails.
+EMAIL_OUTBOX_EAGER = False
+EMAIL_OUTBOX_DEDUP_SECONDS = 60 * 5
+EMAIL_OUTBOX_MAX_ATTEMPTS = 5
+EMAIL_OUTBOX_RETRY_DELAY = 60
+EMAIL_OUTBOX_MAX_DELAY = 60 * 60
+EMAIL_OUTBOX_LEASE = 60 * 5
+
+# Двоичные форматы ответов и запросов включаются, если установлены
+# соответствующие пакеты (cbor2 необязателен).
+BINARY_FORMATS = [
+    (package, renderer, parser)
+    for package, renderer, parser in [
+        ("msgpack", "MessagePackRenderer", "MessagePackParser"),
+        ("cbor2", "CBORRenderer", "CBORParser"),
+    ]
+    if find_spec(package) is not None
+]
+
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "api.v1.authentication.StatelessJWTAuthentication",
+    ],
+    "DEFAULT_RENDERER_CLASSES": [
+        "rest_framework.renderers.JSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+        *(f"api.v1.renderers.{renderer}" for _, renderer, _ in BINARY_FORMATS),
+    ],
+    "DEFAULT_PARSER_CLASSES": [
+        "rest_framework.parsers.JSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+        *(f"api.v1.renderers.{parser}" for _, _, parser in BINARY_FORMATS),
     ],
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
     "PAGE_SIZE": 10,
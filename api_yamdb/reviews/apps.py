@@ -3,3 +3,7 @@ from django.apps import AppConfig
 
 class ReviewsConfig(AppConfig):
     name = "reviews"
+
+    def ready(self):
+        import reviews.checks  # noqa: F401
+        import reviews.signals  # noqa: F401
@@ -0,0 +1,72 @@
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+# Пропавшая из кеша версия создается заново с новым значением, поэтому
+# срок хранения влияет только на промахи кеша ответов, а ключи версий
+# отдельных объектов не копятся в общем кеше.
+VERSION_TIMEOUT = 60 * 60 * 24
+
+
+def get_version_cache():
+    # Версии должны быть общими для всех процессов, иначе запись в одном
+    # процессе не сбросит кеш ответов в остальных.
+    return caches[getattr(settings, "SHARED_CACHE_ALIAS", "default")]
+
+
+def version_key(model, scope=None):
+    key = f"version:{model._meta.label_lower}"
+    return key if scope is None else f"{key}:{scope}"
+
+
+def get_versions(models):
+    """Возвращает текущие версии данных моделей.
+
+    Версия меняется при любом сохранении или удалении объекта модели,
+    поэтому ее можно включать в ключи кеша вместо явной инвалидации.
+    Вместо модели можно передать пару `(model, scope)` - версию части
+    данных модели, которая меняется явным вызовом `bump_version`.
+    """
+    keys = [
+        version_key(*model) if isinstance(model, tuple)
+        else version_key(model)
+        for model in models
+    ]
+    cache = get_version_cache()
+    versions = cache.get_many(keys)
+    missing = {key: time.time_ns() for key in keys if key not in versions}
+    if missing:
+        cache.set_many(missing, timeout=VERSION_TIMEOUT)
+        versions.update(missing)
+    return [versions[key] for key in keys]
+
+
+def bump_version(model, scope=None):
+    # Одна запись вместо incr: во многих бэкендах incr - это get и set без
+    # атомарности.
+    get_version_cache().set(
+        version_key(model, scope), time.time_ns(), timeout=VERSION_TIMEOUT
+    )
+
+
+def bump_rating_versions(model, pks):
+    """Отмечает изменение рейтингов объектов `model` с ключами `pks`.
+
+    Меняется версия рейтингов всех объектов (от нее зависят списки) и
+    версии рейтингов каждого из объектов.
+    """
+    bump_version(model, "ratings")
+    for pk in pks:
+        bump_version(model, f"rating:{pk}")
+
+
+def bump_on_commit(function, *args, using=None):
+    """Вызывает `function(*args)` для смены версий после фиксации
+    транзакции.
+
+    До фиксации другие соединения читают старые данные: если сменить
+    версию раньше, они закешируют старые данные под новой версией.
+    """
+    transaction.on_commit(lambda: function(*args), using=using)
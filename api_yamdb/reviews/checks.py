@@ -0,0 +1,42 @@
+from django.conf import settings
+from django.core.checks import Error, Warning, register
+
+LOCAL_CACHE_BACKENDS = {
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+}
+SLOW_CACHE_BACKENDS = {
+    "django.core.cache.backends.filebased.FileBasedCache",
+}
+
+
+@register()
+def check_shared_cache(app_configs, **kwargs):
+    alias = getattr(settings, "SHARED_CACHE_ALIAS", "default")
+    backend = settings.CACHES.get(alias, {}).get("BACKEND")
+    if backend in SLOW_CACHE_BACKENDS:
+        return [Warning(
+            f"Кеш '{alias}' (SHARED_CACHE_ALIAS) хранится в файлах.",
+            hint=(
+                "Каждая запись в файловый кеш перебирает все файлы "
+                "каталога, а запись в общий кеш выполняется при каждом "
+                "изменении данных. Укажите общий кеш в памяти, например "
+                "Memcached."
+            ),
+            id="reviews.W002",
+        )]
+    if backend not in LOCAL_CACHE_BACKENDS:
+        return []
+    # В разработке достаточно одного процесса, а на сервере без общего
+    # кеша отозванные токены продолжат работать в других процессах.
+    message = Warning if settings.DEBUG else Error
+    return [message(
+        f"Кеш '{alias}' (SHARED_CACHE_ALIAS) не общий для процессов.",
+        hint=(
+            "Версии данных для сброса кеша, отзыв токенов и закрепление "
+            "за основной базой не будут видны другим процессам. Укажите "
+            "общий кеш переменными SHARED_CACHE_BACKEND и "
+            "SHARED_CACHE_LOCATION."
+        ),
+        id="reviews.W001" if settings.DEBUG else "reviews.E001",
+    )]
@@ -0,0 +1,86 @@
+import time
+
+from reviews.cache import get_versions
+from reviews.models import Category, Genre
+
+
+class SlugTableSnapshot(dict):
+    """Снимок таблицы: id -> {"name", "slug"} и slug -> id.
+
+    Объекты, которых нет в снимке (например, созданные после его
+    загрузки), ищутся в БД.
+    """
+
+    def __init__(self, model, rows):
+        super().__init__(
+            (pk, {"name": name, "slug": slug}) for pk, name, slug in rows
+        )
+        self.model = model
+        self.ids = {item["slug"]: pk for pk, item in self.items()}
+
+    def __missing__(self, pk):
+        row = self.model.objects.filter(pk=pk).values("name", "slug").first()
+        if row is None:
+            raise KeyError(pk)
+        return row
+
+    def get_id(self, slug):
+        pk = self.ids.get(slug)
+        if pk is None:
+            pk = self.model.objects.filter(slug=slug).values_list(
+                "pk", flat=True
+            ).first()
+        return pk
+
+
+class SlugTable:
+    """Кеш небольшой таблицы со слагами в памяти процесса.
+
+    Снимок перечитывается, когда меняется версия модели в
+    `reviews.cache` (при любом сохранении или удалении объекта), но не
+    реже раза в `max_age` секунд. Версия читается до загрузки данных,
+    поэтому изменение во время загрузки приведет к повторной загрузке.
+    """
+    fields = ("name", "slug")
+    max_age = 60
+
+    def __init__(self, model):
+        self.model = model
+        self._snapshot = None
+        self._version = None
+        self._loaded = 0.0
+
+    def snapshot(self):
+        version = get_versions([self.model])[0]
+        if (
+            self._snapshot is None
+            or version != self._version
+            or time.monotonic() - self._loaded > self.max_age
+        ):
+            return self.reload(version)
+        return self._snapshot
+
+    def reload(self, version=None):
+        if version is None:
+            version = get_versions([self.model])[0]
+        snapshot = SlugTableSnapshot(
+            self.model, self.model.objects.values_list("pk", "name", "slug")
+        )
+        self._snapshot, self._version = snapshot, version
+        self._loaded = time.monotonic()
+        return snapshot
+
+    def get(self, pk):
+        try:
+            return self.snapshot()[pk]
+        except KeyError:
+            return None
+
+    def get_id(self, slug):
+        return self.snapshot().get_id(slug)
+
+
+categories = SlugTable(Category)
+genres = SlugTable(Genre)
+
+SLUG_TABLES = {Category: categories, Genre: genres}
@@ -0,0 +1,186 @@
+import csv
+import os
+import random
+from datetime import datetime, timedelta, timezone
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from reviews.management.commands.load_data import TABLES
+from reviews.models import Category, Comment, Genre, GenreTitle, Review, Title
+from users.models import User
+
+WORDS = (
+    "тайна путь город ночь море звезда песня время война мир любовь дом "
+    "дорога тень свет сердце память остров ветер огонь зима лето история "
+    "герой мечта река небо сон голос друг край"
+).split()
+SCORE_WEIGHTS = (1, 1, 2, 3, 5, 8, 12, 14, 10, 6)
+FIELDS = {
+    User: ("id", "username", "email", "role", "bio",
+           "first_name", "last_name"),
+    Category: ("id", "name", "slug"),
+    Genre: ("id", "name", "slug"),
+    Title: ("id", "name", "year", "category", "description"),
+    GenreTitle: ("id", "title_id", "genre_id"),
+    Review: ("id", "title_id", "text", "author", "score", "pub_date"),
+    Comment: ("id", "review_id", "text", "author", "pub_date"),
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Генерирует воспроизводимый набор данных в формате CSV, "
+        "который загружается командой load_data"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--output",
+            default=os.path.join(settings.BASE_DIR, "static", "generated"),
+            help="Директория для CSV-файлов",
+        )
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--users", type=int, default=1000)
+        parser.add_argument(
+            "--categories",
+            type=int,
+            default=10,
+            help="Количество категорий (не меньше одной)",
+        )
+        parser.add_argument("--genres", type=int, default=50)
+        parser.add_argument("--titles", type=int, default=10000)
+        parser.add_argument(
+            "--genres-per-title",
+            type=int,
+            default=3,
+            help="Максимальное количество жанров у произведения",
+        )
+        parser.add_argument("--reviews", type=int, default=100000)
+        parser.add_argument("--comments", type=int, default=100000)
+
+    def handle(self, *args, **options):
+        self.random = random.Random(options["seed"])
+        self.output = options["output"]
+        os.makedirs(self.output, exist_ok=True)
+        self.start = datetime(2020, 1, 1, tzinfo=timezone.utc)
+
+        options["categories"] = max(options["categories"], 1)
+        options["reviews"] = min(
+            options["reviews"], options["users"] * options["titles"]
+        )
+        if not options["users"] or not options["reviews"]:
+            options["comments"] = 0
+
+        self._write(User, self._users(options["users"]))
+        self._write(Category, self._categories(options["categories"]))
+        self._write(Genre, self._genres(options["genres"]))
+        self._write(Title, self._titles(
+            options["titles"], options["categories"]
+        ))
+        self._write(GenreTitle, self._genre_titles(
+            options["titles"], options["genres"],
+            options["genres_per_title"],
+        ))
+        self._write(Review, self._reviews(
+            options["reviews"], options["titles"], options["users"]
+        ))
+        self._write(Comment, self._comments(
+            options["comments"], options["reviews"], options["users"]
+        ))
+
+    def _write(self, model, rows):
+        path = os.path.join(self.output, TABLES[model])
+        count = 0
+        with open(path, "w", encoding="utf-8", newline="") as csv_file:
+            writer = csv.DictWriter(csv_file, fieldnames=FIELDS[model])
+            writer.writeheader()
+            for row in rows:
+                writer.writerow(row)
+                count += 1
+        self.stdout.write(self.style.SUCCESS(
+            f"Записан файл '{path}': {count} строк."
+        ))
+
+    def _text(self, words):
+        return " ".join(self.random.choices(WORDS, k=words)).capitalize()
+
+    def _date(self):
+        return (
+            self.start + timedelta(seconds=self.random.randrange(10 ** 8))
+        ).isoformat()
+
+    def _users(self, count):
+        for pk in range(1, count + 1):
+            yield {
+                "id": pk,
+                "username": f"user{pk}",
+                "email": f"user{pk}@yamdb.fake",
+                "role": self.random.choices(
+                    (User.USER, User.MODERATOR, User.ADMIN), (97, 2, 1)
+                )[0],
+                "bio": self._text(self.random.randint(0, 20)),
+                "first_name": "",
+                "last_name": "",
+            }
+
+    def _categories(self, count):
+        for pk in range(1, count + 1):
+            yield {"id": pk, "name": f"Категория {pk}", "slug": f"cat-{pk}"}
+
+    def _genres(self, count):
+        for pk in range(1, count + 1):
+            yield {"id": pk, "name": f"Жанр {pk}", "slug": f"genre-{pk}"}
+
+    def _titles(self, count, categories):
+        for pk in range(1, count + 1):
+            yield {
+                "id": pk,
+                "name": self._text(self.random.randint(1, 5)),
+                "year": self.random.randint(1900, 2022),
+                "category": self.random.randint(1, categories),
+                "description": self._text(self.random.randint(0, 60)),
+            }
+
+    def _genre_titles(self, titles, genres, per_title):
+        pk = 0
+        for title in range(1, titles + 1):
+            count = self.random.randint(0, min(per_title, genres))
+            for genre in self.random.sample(range(1, genres + 1), count):
+                pk += 1
+                yield {"id": pk, "title_id": title, "genre_id": genre}
+
+    def _reviews(self, count, titles, users):
+        seen = set()
+        pk = 0
+        while pk < count:
+            # Половина отзывов приходится на немногие популярные произведения.
+            if self.random.random() < 0.5:
+                title = min(int(self.random.paretovariate(1.2)), titles)
+            else:
+                title = self.random.randint(1, titles)
+            author = self.random.randint(1, users)
+            if (title, author) in seen:
+                continue
+            seen.add((title, author))
+            pk += 1
+            yield {
+                "id": pk,
+                "title_id": title,
+                "text": self._text(self.random.randint(3, 80)),
+                "author": author,
+                "score": self.random.choices(
+                    range(1, 11), SCORE_WEIGHTS
+                )[0],
+                "pub_date": self._date(),
+            }
+
+    def _comments(self, count, reviews, users):
+        for pk in range(1, count + 1):
+            yield {
+                "id": pk,
+                "review_id": self.random.randint(1, reviews),
+                "text": self._text(self.random.randint(1, 40)),
+                "author": self.random.randint(1, users),
+                "pub_date": self._date(),
+            }
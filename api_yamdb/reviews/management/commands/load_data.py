@@ -1,11 +1,25 @@
 import csv
+import io
 import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import islice
 
+import django
+from django.apps import apps
 from django.conf import settings
 from django.core.management.base import BaseCommand
+from django.core.management.color import no_style
+from django.db import connection, connections, router, transaction
+from django.db.models import SET_NULL
 
-from reviews.models import Category, Comment, Genre, GenreTitle, Review, Title
+from reviews.cache import bump_version
+from reviews.cards import refresh_cards
+from reviews.models import (Category, Comment, Genre, GenreTitle, Review,
+                            Title, TitleScore)
+from reviews.search import rebuild_index
 from users.models import User
+from users.tokens import get_shared_cache
 
 
 TABLES = {
@@ -18,19 +32,251 @@ TABLES = {
     Comment: "comments.csv",
 }
 
+BATCH_SIZE = 1000
+CHUNK_SIZE = 16 * 1024 * 1024
+SCAN_SIZE = 64 * 1024
+DATA_DIR = os.path.join(settings.BASE_DIR, "static", "data")
+
+
+def get_path(model, data_dir=DATA_DIR):
+    return os.path.join(data_dir, TABLES[model])
+
+
+def fix_names(dct):
+    NAMES = {"author", "category", "title", "review"}
+    return {f"{k}_id" if k in NAMES else k: v for k, v in dct.items()}
+
+
+def insert_rows(model, rows, batch_size):
+    count = 0
+    while True:
+        batch = [model(**fix_names(row)) for row in islice(rows, batch_size)]
+        if not batch:
+            return count
+        # Размер одного INSERT подбирается Django с учетом ограничений СУБД.
+        model.objects.bulk_create(batch)
+        count += len(batch)
+
+
+def split_csv(path, chunk_size):
+    """Делит CSV-файл на диапазоны байт, границы которых совпадают
+    с границами записей.
+
+    Перевод строки считается концом записи, только если перед ним
+    четное число кавычек: поля с переводами строк всегда заключены
+    в кавычки, а кавычки внутри полей удваиваются.
+    """
+    with open(path, "rb") as csv_file:
+        header = next(csv.reader([csv_file.readline().decode("utf-8")]))
+        start = csv_file.tell()
+        size = os.fstat(csv_file.fileno()).st_size
+        quotes = 0
+        ranges = []
+        while start < size:
+            end = min(start + chunk_size, size)
+            quotes += csv_file.read(end - start).count(b'"')
+            while end < size:
+                block = csv_file.read(SCAN_SIZE)
+                newline = block.find(b"\n")
+                while (
+                    newline != -1
+                    and (quotes + block.count(b'"', 0, newline)) % 2
+                ):
+                    newline = block.find(b"\n", newline + 1)
+                if newline == -1:
+                    quotes += block.count(b'"')
+                    end += len(block)
+                    continue
+                quotes += block.count(b'"', 0, newline + 1)
+                end += newline + 1
+                csv_file.seek(end)
+                break
+            ranges.append((start, end))
+            start = end
+    return header, ranges
+
+
+def truncate(model, truncated=None):
+    """Удаляет все строки модели одним DELETE без загрузки объектов и
+    сигналов.
+
+    Зависимые таблицы очищаются так же (CASCADE) или получают NULL во
+    внешнем ключе (SET_NULL). Возвращает множество измененных моделей:
+    рейтинги, карточки и индексы по ним нужно пересобрать.
+    """
+    if truncated is None:
+        truncated = set()
+    truncated.add(model)
+    for relation in model._meta.related_objects:
+        if relation.many_to_many:
+            continue
+        related_model = relation.related_model
+        if relation.on_delete is SET_NULL:
+            related_model.objects.filter(
+                **{f"{relation.field.name}__isnull": False}
+            ).update(**{relation.field.name: None})
+            truncated.add(related_model)
+        elif related_model not in truncated:
+            truncate(related_model, truncated)
+    model._base_manager.all()._raw_delete(router.db_for_write(model))
+    return truncated
+
+
+def load_chunk(label, path, header, start, end, batch_size):
+    model = apps.get_model(label)
+    with open(path, "rb") as csv_file:
+        csv_file.seek(start)
+        data = csv_file.read(end - start).decode("utf-8")
+    rows = csv.DictReader(io.StringIO(data, newline=""), fieldnames=header)
+    with transaction.atomic():
+        return insert_rows(model, rows, batch_size)
+
 
 class Command(BaseCommand):
+    help = "Загружает данные из CSV-файлов (по умолчанию static/data)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--data-dir",
+            default=DATA_DIR,
+            help="Директория с CSV-файлами",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=BATCH_SIZE,
+            help="Количество строк, вставляемых за один вызов bulk_create",
+        )
+        parser.add_argument(
+            "--only",
+            action="append",
+            choices=[model._meta.model_name for model in TABLES],
+            help="Загрузить только указанную таблицу (можно повторять)",
+        )
+        parser.add_argument(
+            "--truncate",
+            action="store_true",
+            help="Удалить существующие записи перед загрузкой",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=1,
+            help=(
+                "Количество процессов для параллельной загрузки "
+                "(SQLite выполняет записи последовательно, поэтому "
+                "имеет смысл только для серверных СУБД)"
+            ),
+        )
+
     def handle(self, *args, **options):
-        for model, filename in TABLES.items():
-            path = os.path.join(settings.BASE_DIR, "static", "data", filename)
-            with open(path, "r", encoding="utf-8") as csv_file:
-                for row in csv.DictReader(csv_file):
-                    model(**self._fix_names(row)).save()
-            self.stdout.write(
-                self.style.SUCCESS(f"Загружены данные из файла '{filename}'.")
+        tables = [
+            model for model in TABLES
+            if not options["only"]
+            or model._meta.model_name in options["only"]
+        ]
+        changed = set(tables)
+        if options["truncate"]:
+            changed |= self._truncate(tables)
+
+        self.data_dir = options["data_dir"]
+        self.verbosity = options["verbosity"]
+        if options["workers"] > 1:
+            self._load_parallel(
+                tables, options["workers"], options["batch_size"]
             )
+        else:
+            for model in tables:
+                self._load_table(model, options["batch_size"])
+
+        with connection.cursor() as cursor:
+            for sql in connection.ops.sequence_reset_sql(no_style(), tables):
+                cursor.execute(sql)
+        if Title in changed or Review in changed:
+            Title.objects.rebuild_ratings()
+            TitleScore.objects.rebuild(Title.objects.all())
+        if Title in changed:
+            rebuild_index()
+        if {Title, Category, Genre, GenreTitle}.intersection(changed):
+            refresh_cards(Title.objects.all())
+        for model in changed:
+            bump_version(model)
+
+    def _truncate(self, tables):
+        truncated = set()
+        with transaction.atomic():
+            for model in reversed(tables):
+                truncate(model, truncated)
+        if User in truncated:
+            # Пользователи удалены без сигналов, поэтому записи об отзыве
+            # их токенов в общем кеше устарели.
+            get_shared_cache().clear()
+        return truncated
+
+    def _load_table(self, model, batch_size):
+        start = time.monotonic()
+        path = get_path(model, self.data_dir)
+        with open(path, "r", encoding="utf-8") as csv_file:
+            with transaction.atomic():
+                count = insert_rows(
+                    model, csv.DictReader(csv_file), batch_size
+                )
+        self._report(model, count, time.monotonic() - start)
+
+    def _load_parallel(self, models, workers, batch_size):
+        pending = {
+            model: {
+                field.related_model
+                for field in model._meta.concrete_fields
+                if field.is_relation and field.related_model in models
+            } - {model}
+            for model in models
+        }
+        running = {}
+        chunks = {}
+        counts = {}
+        started = {}
+
+        connections.close_all()
+        with ProcessPoolExecutor(workers, initializer=django.setup) as pool:
+            while pending or running:
+                for model in [m for m, deps in pending.items() if not deps]:
+                    del pending[model]
+                    path = get_path(model, self.data_dir)
+                    header, ranges = split_csv(path, CHUNK_SIZE)
+                    started[model] = time.monotonic()
+                    chunks[model] = len(ranges)
+                    if self.verbosity >= 2:
+                        self.stdout.write(
+                            f"Начата загрузка файла '{TABLES[model]}': "
+                            f"{len(ranges)} частей."
+                        )
+                    counts[model] = 0
+                    for start, end in ranges:
+                        future = pool.submit(
+                            load_chunk, model._meta.label, path, header,
+                            start, end, batch_size,
+                        )
+                        running[future] = model
+                    if not ranges:
+                        self._finish(model, pending, counts, started)
+                if not running:
+                    continue
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    model = running.pop(future)
+                    counts[model] += future.result()
+                    chunks[model] -= 1
+                    if not chunks[model]:
+                        self._finish(model, pending, counts, started)
+
+    def _finish(self, model, pending, counts, started):
+        for deps in pending.values():
+            deps.discard(model)
+        self._report(model, counts[model], time.monotonic() - started[model])
 
-    @staticmethod
-    def _fix_names(dct):
-        NAMES = {"author", "category", "title", "review"}
-        return {f"{k}_id" if k in NAMES else k: v for k, v in dct.items()}
+    def _report(self, model, count, elapsed):
+        self.stdout.write(self.style.SUCCESS(
+            f"Загружены данные из файла '{TABLES[model]}': {count} строк "
+            f"за {elapsed:.2f} с ({count / max(elapsed, 1e-6):.0f} строк/с)."
+        ))
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from reviews.cache import bump_version
+from reviews.models import Title, TitleScore
+
+
+class Command(BaseCommand):
+    help = (
+        "Пересчитывает сохраненные рейтинги и распределения оценок "
+        "произведений по отзывам"
+    )
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            count = Title.objects.rebuild_ratings()
+            TitleScore.objects.rebuild(Title.objects.all())
+        bump_version(Title)
+        self.stdout.write(
+            self.style.SUCCESS(f"Пересчитаны рейтинги {count} произведений.")
+        )
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from reviews.cache import bump_version
+from reviews.cards import refresh_cards
+from reviews.models import Title
+
+
+class Command(BaseCommand):
+    help = "Пересобирает JSON-карточки произведений для списка"
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            count = refresh_cards(Title.objects.all())
+        bump_version(Title)
+        self.stdout.write(
+            self.style.SUCCESS(f"Пересобраны карточки {count} произведений.")
+        )
@@ -0,0 +1,44 @@
+# Generated by Django 2.2.16 on 2026-10-18 17:40
+
+from django.db import migrations, models
+from django.db.models import Count, Sum
+
+
+def fill_ratings(apps, schema_editor):
+    Review = apps.get_model('reviews', 'Review')
+    Title = apps.get_model('reviews', 'Title')
+    using = schema_editor.connection.alias
+    ratings = Review.objects.using(using).order_by().values('title').annotate(
+        total=Sum('score'), count=Count('pk'))
+    for rating in ratings:
+        Title.objects.using(using).filter(pk=rating['title']).update(
+            rating_sum=rating['total'],
+            rating_count=rating['count'],
+            rating=rating['total'] / rating['count'],
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0002_auto_20220805_1407'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='title',
+            name='rating',
+            field=models.FloatField(blank=True, editable=False, null=True, verbose_name='Рейтинг произведения'),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='rating_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Количество оценок произведения'),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='rating_sum',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Сумма оценок произведения'),
+        ),
+        migrations.RunPython(fill_ratings, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,23 @@
+from django.db import migrations
+
+from reviews import search
+
+
+def create_index(apps, schema_editor):
+    search.create_index(schema_editor.connection)
+    search.rebuild_index(schema_editor.connection.alias)
+
+
+def drop_index(apps, schema_editor):
+    search.drop_index(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0004_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_index, drop_index),
+    ]
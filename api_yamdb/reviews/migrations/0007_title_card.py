@@ -0,0 +1,26 @@
+# Generated by Django 2.2.16 on 2026-10-18 18:09
+
+from django.db import migrations, models
+
+from reviews.cards import refresh_cards
+
+
+def fill_cards(apps, schema_editor):
+    Title = apps.get_model('reviews', 'Title')
+    refresh_cards(Title.objects.using(schema_editor.connection.alias))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0006_title_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='title',
+            name='card',
+            field=models.TextField(blank=True, editable=False, verbose_name='Карточка произведения в формате JSON'),
+        ),
+        migrations.RunPython(fill_cards, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,63 @@
+# Generated by Django 2.2.16 on 2026-10-18 18:30
+
+from django.db import migrations, models
+from django.db.models import F
+import reviews.models
+
+# В PostgreSQL NULL при сортировке по убыванию идут первыми, поэтому для
+# `ordering=-rating` (NULLS LAST) нужен отдельный индекс.
+POSTGRESQL_INDEXES = {
+    'title_category_rating_desc_idx': '(category_id, rating DESC NULLS LAST, id DESC)',
+    'title_rating_desc_idx': '(rating DESC NULLS LAST, id DESC)',
+}
+
+
+def fill_weighted_ratings(apps, schema_editor):
+    Title = apps.get_model('reviews', 'Title')
+    Title.objects.using(schema_editor.connection.alias).update(
+        weighted_rating=reviews.models.weighted_rating(F('rating_sum'), F('rating_count')))
+
+
+def create_postgresql_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        for name, columns in POSTGRESQL_INDEXES.items():
+            schema_editor.execute(f'CREATE INDEX {name} ON reviews_title {columns}')
+
+
+def drop_postgresql_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        for name in POSTGRESQL_INDEXES:
+            schema_editor.execute(f'DROP INDEX IF EXISTS {name}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0008_title_scores'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='title',
+            name='weighted_rating',
+            field=models.FloatField(default=reviews.models.get_default_weighted_rating, editable=False, verbose_name='Взвешенный рейтинг произведения'),
+        ),
+        migrations.AddIndex(
+            model_name='title',
+            index=models.Index(fields=['category', 'rating'], name='title_category_rating_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='title',
+            index=models.Index(fields=['category', 'weighted_rating'], name='title_category_weighted_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='title',
+            index=models.Index(fields=['rating'], name='title_rating_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='title',
+            index=models.Index(fields=['weighted_rating'], name='title_weighted_rating_idx'),
+        ),
+        migrations.RunPython(fill_weighted_ratings, migrations.RunPython.noop),
+        migrations.RunPython(create_postgresql_indexes, drop_postgresql_indexes),
+    ]
@@ -1,9 +1,21 @@
+from functools import reduce
+from itertools import islice
+from operator import or_
+
+from django.conf import settings
 from django.core.validators import MaxValueValidator, MinValueValidator
-from django.db import models
+from django.db import models, transaction
+from django.db.models import (Case, Count, F, FloatField, OuterRef, Q,
+                              Subquery, Sum, Value, When)
+from django.db.models.functions import Cast, Coalesce
 
 from reviews.validators import validate_year
 from users.models import User
 
+MIN_SCORE = 1
+MAX_SCORE = 10
+SCORES = range(MIN_SCORE, MAX_SCORE + 1)
+
 
 class Category(models.Model):
     name = models.CharField(
@@ -43,6 +55,72 @@ class Genre(models.Model):
         return self.name
 
 
+def get_rating_prior():
+    """Априорные среднее и вес для взвешенного (байесовского) рейтинга."""
+    return (
+        getattr(settings, "TITLE_RATING_PRIOR_MEAN", 5.5),
+        getattr(settings, "TITLE_RATING_PRIOR_COUNT", 10),
+    )
+
+
+def get_default_weighted_rating():
+    return get_rating_prior()[0]
+
+
+def weighted_rating(rating_sum, rating_count):
+    # Рейтинг, сглаженный к априорному среднему: у произведений с
+    # небольшим количеством оценок он ближе к среднему. Априорные
+    # значения задаются настройками, а не считаются по всем отзывам,
+    # поэтому столбец обновляется для одного произведения.
+    mean, count = get_rating_prior()
+    return (Cast(rating_sum, FloatField()) + mean * count) / (
+        rating_count + count
+    )
+
+
+class TitleQuerySet(models.QuerySet):
+    def add_rating(self, title_id, score_delta, count_delta):
+        rating_sum = F("rating_sum") + score_delta
+        rating_count = F("rating_count") + count_delta
+        return self.filter(pk=title_id).update(
+            rating_sum=rating_sum,
+            rating_count=rating_count,
+            rating=Case(
+                When(rating_count=-count_delta, then=None),
+                default=Cast(rating_sum, FloatField()) / rating_count,
+                output_field=FloatField(),
+            ),
+            weighted_rating=weighted_rating(rating_sum, rating_count),
+        )
+
+    def rebuild_ratings(self):
+        reviews = Review.objects.filter(
+            title=OuterRef("pk")
+        ).order_by().values("title")
+        rating_sum = Subquery(
+            reviews.annotate(total=Sum("score")).values("total")
+        )
+        rating_count = Subquery(
+            reviews.annotate(total=Count("pk")).values("total")
+        )
+        self.update(
+            rating_sum=Coalesce(rating_sum, 0),
+            rating_count=Coalesce(rating_count, 0),
+        )
+        return self.update(
+            rating=Case(
+                When(rating_count=0, then=None),
+                default=(
+                    Cast(F("rating_sum"), FloatField()) / F("rating_count")
+                ),
+                output_field=FloatField(),
+            ),
+            weighted_rating=weighted_rating(
+                F("rating_sum"), F("rating_count")
+            ),
+        )
+
+
 class Title(models.Model):
     name = models.CharField(
         max_length=256,
@@ -71,8 +149,61 @@ class Title(models.Model):
         blank=True,
         null=True,
     )
+    rating_sum = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name="Сумма оценок произведения",
+    )
+    rating_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name="Количество оценок произведения",
+    )
+    rating = models.FloatField(
+        null=True,
+        blank=True,
+        editable=False,
+        verbose_name="Рейтинг произведения",
+    )
+    weighted_rating = models.FloatField(
+        default=get_default_weighted_rating,
+        editable=False,
+        verbose_name="Взвешенный рейтинг произведения",
+    )
+    card = models.TextField(
+        blank=True,
+        editable=False,
+        verbose_name="Карточка произведения в формате JSON",
+    )
+
+    objects = TitleQuerySet.as_manager()
 
     class Meta:
+        indexes = [
+            models.Index(
+                fields=("category", "year"),
+                name="title_category_year_idx",
+            ),
+            # Лучшие произведения категории читаются из индекса, без
+            # сортировки всей категории. Для жанров используются индексы
+            # по рейтингу с проверкой жанра по reviews_genretitle.
+            models.Index(
+                fields=("category", "rating"),
+                name="title_category_rating_idx",
+            ),
+            models.Index(
+                fields=("category", "weighted_rating"),
+                name="title_category_weighted_idx",
+            ),
+            models.Index(
+                fields=("rating",),
+                name="title_rating_idx",
+            ),
+            models.Index(
+                fields=("weighted_rating",),
+                name="title_weighted_rating_idx",
+            ),
+        ]
         verbose_name = "Произведение"
         verbose_name_plural = "Произведения"
 
@@ -91,6 +222,12 @@ class GenreTitle(models.Model):
     )
 
     class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=("genre", "title"),
+                name="unique_genre_title",
+            ),
+        ]
         verbose_name = "Жанр и произведение"
         verbose_name_plural = "Жанры и произведения"
 
@@ -116,8 +253,8 @@ class Review(models.Model):
     )
     score = models.PositiveSmallIntegerField(
         validators=[
-            MinValueValidator(1, "Оценка должна быть >= 1"),
-            MaxValueValidator(10, "Оценка должна быть <= 10"),
+            MinValueValidator(MIN_SCORE, f"Оценка должна быть >= {MIN_SCORE}"),
+            MaxValueValidator(MAX_SCORE, f"Оценка должна быть <= {MAX_SCORE}"),
         ],
         verbose_name="Оценка произведения",
     )
@@ -134,14 +271,154 @@ class Review(models.Model):
                 name="unique_title_author",
             ),
         ]
+        indexes = [
+            models.Index(
+                fields=("title", "pub_date", "id"),
+                name="review_title_pub_date_idx",
+            ),
+        ]
         ordering = ["-pub_date"]
         verbose_name = "Отзыв"
         verbose_name_plural = "Отзывы"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Отложенное поле не загружаем: это лишний запрос к БД.
+        if "score" in field_names:
+            instance._loaded_score = instance.score
+        return instance
+
+    def save(self, *args, **kwargs):
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
     def __str__(self):
         return self.text[:20]
 
 
+class TitleScoreQuerySet(models.QuerySet):
+    def add_score(self, title_id, score, delta):
+        rows = self.filter(title_id=title_id, score=score)
+        if rows.update(count=F("count") + delta) or delta <= 0:
+            return
+        # Первая оценка: строку мог успеть создать параллельный запрос,
+        # поэтому вставка игнорирует конфликт.
+        self.bulk_create(
+            [TitleScore(title_id=title_id, score=score)],
+            ignore_conflicts=True,
+        )
+        rows.update(count=F("count") + delta)
+
+    def add_scores(self, deltas):
+        """Добавляет пачку оценок: `deltas` - {(title_id, score): count}.
+
+        Выполняет два запроса независимо от количества произведений.
+        """
+        if not deltas:
+            return
+        self.bulk_create(
+            [
+                TitleScore(title_id=title_id, score=score)
+                for title_id, score in deltas
+            ],
+            ignore_conflicts=True,
+        )
+        rows = reduce(or_, (
+            Q(title_id=title_id, score=score) for title_id, score in deltas
+        ))
+        self.filter(rows).update(count=F("count") + Case(
+            *[
+                When(title_id=title_id, score=score, then=Value(count))
+                for (title_id, score), count in deltas.items()
+            ],
+            output_field=models.PositiveIntegerField(),
+        ))
+
+    def get_stats(self, title_id):
+        """Количество, среднее, медиана и распределение оценок."""
+        histogram = dict.fromkeys(SCORES, 0)
+        histogram.update(self.filter(
+            title_id=title_id, count__gt=0
+        ).values_list("score", "count"))
+        count = sum(histogram.values())
+        mean = median = None
+        if count:
+            mean = sum(
+                score * number for score, number in histogram.items()
+            ) / count
+            # Медиана - среднее двух центральных оценок (при нечетном
+            # количестве они совпадают).
+            lower, upper = (count - 1) // 2, count // 2
+            middle = []
+            seen = 0
+            for score, number in histogram.items():
+                seen += number
+                if not middle and seen > lower:
+                    middle.append(score)
+                if seen > upper:
+                    middle.append(score)
+                    break
+            median = sum(middle) / 2
+        return {
+            "count": count,
+            "mean": mean,
+            "median": median,
+            "histogram": [
+                {"score": score, "count": number}
+                for score, number in histogram.items()
+            ],
+        }
+
+    def rebuild(self, titles):
+        """Пересчитывает распределения оценок произведений по отзывам."""
+        self.filter(title__in=titles).delete()
+        rows = Review.objects.filter(title__in=titles).order_by().values(
+            "title", "score"
+        ).annotate(total=Count("pk")).values_list("title", "score", "total")
+        rows = rows.iterator()
+        while True:
+            batch = [
+                TitleScore(title_id=title_id, score=score, count=total)
+                for title_id, score, total in islice(rows, 1000)
+            ]
+            if not batch:
+                break
+            self.bulk_create(batch)
+
+
+class TitleScore(models.Model):
+    """Количество отзывов на произведение с каждой оценкой."""
+    title = models.ForeignKey(
+        Title,
+        on_delete=models.CASCADE,
+        related_name="scores",
+        verbose_name="Произведение",
+    )
+    score = models.PositiveSmallIntegerField(
+        verbose_name="Оценка",
+    )
+    count = models.PositiveIntegerField(
+        default=0,
+        verbose_name="Количество отзывов",
+    )
+
+    objects = TitleScoreQuerySet.as_manager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=("title", "score"),
+                name="unique_title_score",
+            ),
+        ]
+        verbose_name = "Распределение оценок"
+        verbose_name_plural = "Распределения оценок"
+
+    def __str__(self):
+        return f"{self.title_id}: {self.score} - {self.count}"
+
+
 class Comment(models.Model):
     text = models.TextField(
         verbose_name="Текст комментария",
@@ -165,6 +442,12 @@ class Comment(models.Model):
     )
 
     class Meta:
+        indexes = [
+            models.Index(
+                fields=("review", "pub_date", "id"),
+                name="comment_review_pub_date_idx",
+            ),
+        ]
         ordering = ["-pub_date"]
         verbose_name = "Комментарий"
         verbose_name_plural = "Комментарии"
@@ -0,0 +1,139 @@
+import re
+
+from django.db import connections
+from django.db.models import Q
+
+TABLE = "reviews_title_search"
+WORD = re.compile(r"\w+")
+
+SQLITE_CREATE = [
+    f"CREATE VIRTUAL TABLE {TABLE} USING fts5("
+    "name, description, tokenize = 'unicode61 remove_diacritics 2')",
+]
+SQLITE_DROP = [f"DROP TABLE IF EXISTS {TABLE}"]
+POSTGRESQL_CREATE = [
+    f"CREATE TABLE {TABLE} ("
+    "title_id integer PRIMARY KEY, "
+    "document tsvector NOT NULL)",
+    f"CREATE INDEX {TABLE}_document_idx ON {TABLE} USING gin (document)",
+]
+POSTGRESQL_DROP = [f"DROP TABLE IF EXISTS {TABLE}"]
+
+
+POSTGRESQL_DOCUMENT = (
+    "setweight(to_tsvector('simple', %s), 'A') || "
+    "setweight(to_tsvector('simple', %s), 'B')"
+)
+
+
+def create_index(connection):
+    statements = {
+        "sqlite": SQLITE_CREATE,
+        "postgresql": POSTGRESQL_CREATE,
+    }.get(connection.vendor, [])
+    with connection.cursor() as cursor:
+        for sql in statements:
+            cursor.execute(sql)
+
+
+def drop_index(connection):
+    statements = {
+        "sqlite": SQLITE_DROP,
+        "postgresql": POSTGRESQL_DROP,
+    }.get(connection.vendor, [])
+    with connection.cursor() as cursor:
+        for sql in statements:
+            cursor.execute(sql)
+
+
+def index_title(title, using="default"):
+    connection = connections[using]
+    params = [title.name, title.description or ""]
+    with connection.cursor() as cursor:
+        if connection.vendor == "sqlite":
+            cursor.execute(f"DELETE FROM {TABLE} WHERE rowid = %s", [title.pk])
+            cursor.execute(
+                f"INSERT INTO {TABLE} (rowid, name, description) "
+                "VALUES (%s, %s, %s)",
+                [title.pk, *params],
+            )
+        elif connection.vendor == "postgresql":
+            cursor.execute(
+                f"INSERT INTO {TABLE} (title_id, document) "
+                f"VALUES (%s, {POSTGRESQL_DOCUMENT}) "
+                "ON CONFLICT (title_id) "
+                "DO UPDATE SET document = EXCLUDED.document",
+                [title.pk, *params],
+            )
+
+
+def unindex_title(title, using="default"):
+    connection = connections[using]
+    column = {"sqlite": "rowid", "postgresql": "title_id"}.get(
+        connection.vendor
+    )
+    if column is not None:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"DELETE FROM {TABLE} WHERE {column} = %s", [title.pk]
+            )
+
+
+def rebuild_index(using="default"):
+    connection = connections[using]
+    with connection.cursor() as cursor:
+        if connection.vendor == "sqlite":
+            cursor.execute(f"DELETE FROM {TABLE}")
+            cursor.execute(
+                f"INSERT INTO {TABLE} (rowid, name, description) "
+                "SELECT id, name, COALESCE(description, '') "
+                "FROM reviews_title"
+            )
+        elif connection.vendor == "postgresql":
+            cursor.execute(f"DELETE FROM {TABLE}")
+            cursor.execute(
+                f"INSERT INTO {TABLE} (title_id, document) "
+                "SELECT id, " + POSTGRESQL_DOCUMENT % (
+                    "name", "COALESCE(description, '')"
+                ) + " FROM reviews_title"
+            )
+
+
+def search_titles(queryset, text):
+    """Фильтрует произведения по словам запроса и сортирует по релевантности.
+
+    Каждое слово ищется по префиксу в названии и описании, все слова
+    должны встретиться. На СУБД без полнотекстового индекса выполняется
+    поиск подстроки.
+    """
+    words = WORD.findall(text.lower())
+    if not words:
+        return queryset.none()
+
+    vendor = connections[queryset.db].vendor
+    if vendor == "sqlite":
+        query = " ".join(f'"{word}"*' for word in words)
+        match = f"{TABLE} MATCH %s"
+        join = f"{TABLE}.rowid = reviews_title.id"
+        rank = f"-bm25({TABLE}, 10.0, 1.0)"
+    elif vendor == "postgresql":
+        query = " & ".join(f"{word}:*" for word in words)
+        match = f"{TABLE}.document @@ to_tsquery('simple', %s)"
+        join = f"{TABLE}.title_id = reviews_title.id"
+        rank = f"ts_rank({TABLE}.document, to_tsquery('simple', %s))"
+    else:
+        for word in words:
+            queryset = queryset.filter(
+                Q(name__icontains=word) | Q(description__icontains=word)
+            )
+        return queryset
+
+    # Соединение с индексом вместо подзапросов: полнотекстовый поиск
+    # выполняется один раз, а ранг берется из той же строки индекса.
+    return queryset.extra(
+        select={"search_rank": rank},
+        select_params=[query] if "%s" in rank else [],
+        tables=[TABLE],
+        where=[join, match],
+        params=[query],
+    ).order_by("-search_rank", "id")
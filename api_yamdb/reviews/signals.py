@@ -0,0 +1,136 @@
+from django.db import transaction
+from django.db.models.signals import (m2m_changed, post_delete, post_migrate,
+                                      post_save, pre_delete)
+from django.dispatch import receiver
+
+from reviews.cache import (bump_on_commit, bump_rating_versions,
+                           bump_version)
+from reviews.cards import CHUNK_SIZE, refresh_cards
+from reviews.lookups import SLUG_TABLES
+from reviews.models import (Category, Genre, GenreTitle, Review, Title,
+                            TitleScore)
+from reviews.search import index_title, unindex_title
+
+VERSIONED_APPS = {"reviews", "users"}
+
+
+@receiver(post_save, sender=Review)
+def add_review_score(sender, instance, created, using, **kwargs):
+    if created:
+        Title.objects.add_rating(instance.title_id, instance.score, 1)
+        TitleScore.objects.add_score(instance.title_id, instance.score, 1)
+        bump_on_commit(
+            bump_rating_versions, Title, [instance.title_id], using=using
+        )
+    else:
+        old_score = getattr(instance, "_loaded_score", instance.score)
+        if old_score != instance.score:
+            Title.objects.add_rating(
+                instance.title_id, instance.score - old_score, 0
+            )
+            TitleScore.objects.add_score(instance.title_id, old_score, -1)
+            TitleScore.objects.add_score(
+                instance.title_id, instance.score, 1
+            )
+            bump_on_commit(
+                bump_rating_versions, Title, [instance.title_id], using=using
+            )
+    instance._loaded_score = instance.score
+
+
+@receiver(post_delete, sender=Review)
+def remove_review_score(sender, instance, using, **kwargs):
+    score = getattr(instance, "_loaded_score", instance.score)
+    Title.objects.add_rating(instance.title_id, -score, -1)
+    TitleScore.objects.add_score(instance.title_id, score, -1)
+    bump_on_commit(
+        bump_rating_versions, Title, [instance.title_id], using=using
+    )
+
+
+@receiver(post_save, sender=Title)
+def update_search_index(sender, instance, using, **kwargs):
+    index_title(instance, using)
+
+
+@receiver(post_delete, sender=Title)
+def remove_from_search_index(sender, instance, using, **kwargs):
+    unindex_title(instance, using)
+
+
+def refresh_title_cards(using, pks):
+    pks = list(pks)
+    for start in range(0, len(pks), CHUNK_SIZE):
+        refresh_cards(Title.objects.using(using).filter(
+            pk__in=pks[start:start + CHUNK_SIZE]
+        ))
+
+
+@receiver(post_save, sender=Title)
+def update_title_card(sender, instance, using, **kwargs):
+    refresh_title_cards(using, [instance.pk])
+
+
+@receiver(m2m_changed, sender=GenreTitle)
+def update_genre_cards(sender, instance, action, reverse, pk_set, using,
+                       **kwargs):
+    # add() создает строки через bulk_create без post_save; remove() и
+    # clear() удаляют их по одной и обрабатываются в update_genre_card.
+    if action == "post_add":
+        refresh_title_cards(using, pk_set if reverse else [instance.pk])
+        bump_on_commit(bump_version, GenreTitle, using=using)
+
+
+@receiver(post_save, sender=GenreTitle)
+@receiver(post_delete, sender=GenreTitle)
+def update_genre_card(sender, instance, using, **kwargs):
+    refresh_title_cards(using, [instance.title_id])
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_save, sender=Genre)
+def update_related_cards(sender, instance, created, using, **kwargs):
+    if not created:
+        field = "category" if sender is Category else "genre"
+        refresh_title_cards(using, Title.objects.using(using).filter(
+            **{field: instance.pk}
+        ).values_list("pk", flat=True))
+
+
+# Связи удаленного жанра удаляются каскадом и обновляют карточки в
+# update_genre_card, а у категории внешний ключ просто обнуляется.
+@receiver(pre_delete, sender=Category)
+def collect_related_cards(sender, instance, using, **kwargs):
+    instance._card_titles = list(Title.objects.using(using).filter(
+        category=instance.pk
+    ).values_list("pk", flat=True))
+
+
+@receiver(post_delete, sender=Category)
+def remove_related_cards(sender, instance, using, **kwargs):
+    refresh_title_cards(using, instance._card_titles)
+
+
+@receiver(post_save)
+@receiver(post_delete)
+def bump_model_version(sender, using, **kwargs):
+    if sender._meta.app_label in VERSIONED_APPS:
+        bump_on_commit(bump_version, sender, using=using)
+
+
+# Подключается после bump_model_version, поэтому и выполняется после
+# смены версии: снимок загружается уже с новой версией, и первое чтение
+# после изменения не платит за загрузку.
+@receiver(post_save, sender=Category)
+@receiver(post_save, sender=Genre)
+@receiver(post_delete, sender=Category)
+@receiver(post_delete, sender=Genre)
+def reload_slug_table(sender, using, **kwargs):
+    transaction.on_commit(lambda: SLUG_TABLES[sender].reload(), using=using)
+
+
+@receiver(post_migrate)
+def bump_app_versions(sender, **kwargs):
+    if sender.label in VERSIONED_APPS:
+        for model in sender.get_models():
+            bump_version(model)
@@ -0,0 +1,63 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from users.models import OutgoingEmail
+from users.outbox import send_queued_emails
+
+
+class Command(BaseCommand):
+    help = "Отправляет письма из очереди исходящих писем"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=100,
+            help="Количество писем, отправляемых через одно соединение",
+        )
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Не завершаться, а ждать новые письма",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=5,
+            help="Пауза между проверками очереди в секундах",
+        )
+        parser.add_argument(
+            "--keep-days",
+            type=int,
+            default=7,
+            help="Сколько дней хранить отправленные письма",
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            sent, failed = self._drain(options["batch_size"])
+            if sent or failed:
+                self.stdout.write(
+                    f"Отправлено писем: {sent}, с ошибкой: {failed}."
+                )
+            self._purge(options["keep_days"])
+            if not options["loop"]:
+                break
+            time.sleep(options["interval"])
+
+    def _drain(self, batch_size):
+        total_sent = total_failed = 0
+        while True:
+            sent, failed = send_queued_emails(batch_size=batch_size)
+            total_sent += sent
+            total_failed += failed
+            if sent + failed < batch_size:
+                return total_sent, total_failed
+
+    def _purge(self, keep_days):
+        OutgoingEmail.objects.filter(
+            sent__lt=timezone.now() - timedelta(days=keep_days)
+        ).delete()
@@ -1,5 +1,6 @@
 from django.contrib.auth.models import AbstractUser
 from django.db import models
+from django.utils import timezone
 
 
 class User(AbstractUser):
@@ -29,11 +30,28 @@ class User(AbstractUser):
         blank=True,
         verbose_name="Биография пользователя",
     )
+    tokens_valid_after = models.DateTimeField(
+        null=True,
+        blank=True,
+        editable=False,
+        verbose_name="Токены действительны после",
+    )
 
     class Meta:
         verbose_name = "Пользователь"
         verbose_name_plural = "Пользователи"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_claims = (
+            instance.role,
+            instance.is_superuser,
+            instance.is_staff,
+            instance.is_active,
+        )
+        return instance
+
     @property
     def is_admin(self):
         return self.role == User.ADMIN or self.is_superuser or self.is_staff
@@ -44,3 +62,62 @@ class User(AbstractUser):
 
     def __str__(self):
         return self.username
+
+
+class OutgoingEmail(models.Model):
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="emails",
+        verbose_name="Пользователь",
+    )
+    dedup_key = models.CharField(
+        max_length=64,
+        blank=True,
+        verbose_name="Ключ дедупликации",
+    )
+    subject = models.CharField(max_length=255, verbose_name="Тема")
+    body = models.TextField(verbose_name="Текст письма")
+    from_email = models.EmailField(verbose_name="Отправитель")
+    to = models.EmailField(verbose_name="Получатель")
+    created = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name="Дата создания",
+    )
+    send_after = models.DateTimeField(
+        default=timezone.now,
+        verbose_name="Отправить не раньше",
+    )
+    sent = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name="Дата отправки",
+    )
+    attempts = models.PositiveSmallIntegerField(
+        default=0,
+        verbose_name="Количество попыток",
+    )
+    last_error = models.TextField(
+        blank=True,
+        verbose_name="Последняя ошибка",
+    )
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=("sent", "send_after"),
+                name="email_queue_idx",
+            ),
+            models.Index(
+                fields=("dedup_key", "created"),
+                name="email_dedup_idx",
+            ),
+        ]
+        ordering = ("send_after", "id")
+        verbose_name = "Исходящее письмо"
+        verbose_name_plural = "Исходящие письма"
+
+    def __str__(self):
+        return f"{self.to}: {self.subject}"
@@ -0,0 +1,124 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from users.models import OutgoingEmail
+
+
+def enqueue_email(subject, body, to, user=None, dedup_key=""):
+    """Ставит письмо в очередь на отправку в текущей транзакции.
+
+    Если за последние `EMAIL_OUTBOX_DEDUP_SECONDS` секунд письмо с тем же
+    `dedup_key` уже ставилось в очередь, новое не создается.
+    """
+    if dedup_key:
+        window = timedelta(seconds=settings.EMAIL_OUTBOX_DEDUP_SECONDS)
+        duplicate = OutgoingEmail.objects.filter(
+            dedup_key=dedup_key,
+            created__gte=timezone.now() - window,
+        )
+        if duplicate.exists():
+            return None
+
+    email = OutgoingEmail.objects.create(
+        user=user,
+        dedup_key=dedup_key,
+        subject=subject,
+        body=body,
+        from_email=settings.EMAIL_FROM,
+        to=to,
+    )
+    if settings.EMAIL_OUTBOX_EAGER:
+        transaction.on_commit(
+            lambda: send_queued_emails(
+                OutgoingEmail.objects.filter(pk=email.pk)
+            )
+        )
+    return email
+
+
+def get_retry_delay(attempts):
+    delay = settings.EMAIL_OUTBOX_RETRY_DELAY * 2 ** (attempts - 1)
+    return timedelta(seconds=min(delay, settings.EMAIL_OUTBOX_MAX_DELAY))
+
+
+def claim_emails(queryset, batch_size):
+    """Берет письма из очереди в работу.
+
+    Письмо получает аренду: `send_after` переносится на
+    `EMAIL_OUTBOX_LEASE` секунд вперед, и другие обработчики его не берут.
+    Если обработчик завершится, не записав результат, письмо будет
+    отправлено повторно после окончания аренды. Каждое письмо берется
+    отдельным условным UPDATE, без долгих транзакций и блокировок.
+    """
+    now = timezone.now()
+    lease = timedelta(seconds=settings.EMAIL_OUTBOX_LEASE)
+    queryset = queryset.filter(
+        sent__isnull=True,
+        send_after__lte=now,
+        attempts__lt=settings.EMAIL_OUTBOX_MAX_ATTEMPTS,
+    )
+    emails = []
+    for email in queryset[:batch_size]:
+        claimed = queryset.filter(pk=email.pk).update(
+            send_after=now + lease,
+            attempts=F("attempts") + 1,
+        )
+        if claimed:
+            email.attempts += 1
+            emails.append(email)
+    return emails
+
+
+def send_queued_emails(queryset=None, batch_size=100):
+    """Отправляет одну пачку писем из очереди через общее SMTP-соединение.
+
+    Письма отправляются вне транзакции, результат каждого записывается
+    сразу после отправки. Письма, которые не удалось отправить,
+    откладываются с экспоненциально растущей задержкой, пока не
+    закончатся `EMAIL_OUTBOX_MAX_ATTEMPTS` попыток. Возвращает количество
+    отправленных и неотправленных писем.
+    """
+    if queryset is None:
+        queryset = OutgoingEmail.objects.all()
+    sent = failed = 0
+    emails = claim_emails(queryset, batch_size)
+    if not emails:
+        return sent, failed
+
+    mail_connection = get_connection(fail_silently=False)
+    try:
+        try:
+            mail_connection.open()
+        except Exception:
+            # Ошибка повторится при отправке и будет записана в письма.
+            pass
+        for email in emails:
+            try:
+                EmailMessage(
+                    subject=email.subject,
+                    body=email.body,
+                    from_email=email.from_email,
+                    to=[email.to],
+                    connection=mail_connection,
+                ).send()
+            except Exception as error:
+                OutgoingEmail.objects.filter(pk=email.pk).update(
+                    last_error=repr(error),
+                    send_after=timezone.now() + get_retry_delay(
+                        email.attempts
+                    ),
+                )
+                failed += 1
+            else:
+                OutgoingEmail.objects.filter(pk=email.pk).update(
+                    sent=timezone.now()
+                )
+                sent += 1
+    finally:
+        mail_connection.close()
+    return sent, failed
@@ -0,0 +1,19 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from users.models import User
+from users.tokens import ROLE_CLAIMS, revoke_tokens
+
+
+@receiver(post_save, sender=User)
+def revoke_tokens_on_role_change(sender, instance, created, **kwargs):
+    claims = tuple(getattr(instance, claim) for claim in ROLE_CLAIMS)
+    loaded = getattr(instance, "_loaded_claims", claims)
+    if not created and loaded != claims:
+        instance.tokens_valid_after = revoke_tokens(instance.pk)
+    instance._loaded_claims = claims
+
+
+@receiver(post_delete, sender=User)
+def revoke_tokens_on_delete(sender, instance, **kwargs):
+    revoke_tokens(instance.pk)
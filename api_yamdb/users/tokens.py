@@ -0,0 +1,84 @@
+import math
+import time
+from datetime import datetime, timezone
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from users.models import User
+
+ROLE_CLAIMS = ("role", "is_superuser", "is_staff", "is_active")
+
+
+def get_shared_cache():
+    return caches[getattr(settings, "SHARED_CACHE_ALIAS", "default")]
+
+
+def revoked_key(user_id):
+    return f"tokens-valid-after:{user_id}"
+
+
+def revoked_timeout():
+    # Значение дублирует БД, поэтому может пропасть из кеша в любой момент.
+    # Дольше срока жизни токена его хранить незачем.
+    return api_settings.ACCESS_TOKEN_LIFETIME.total_seconds()
+
+
+def revoke_tokens(user_id):
+    """Отзывает все выданные пользователю токены с ролевыми claims.
+
+    Время отзыва хранится в `User.tokens_valid_after` и дублируется в
+    общем кеше, чтобы проверка токена не обращалась к БД.
+    """
+    now = time.time()
+    valid_after = datetime.fromtimestamp(now, timezone.utc)
+    User.objects.filter(pk=user_id).update(tokens_valid_after=valid_after)
+    get_shared_cache().set(revoked_key(user_id), now, revoked_timeout())
+    return valid_after
+
+
+def get_tokens_valid_after(user_id):
+    """Возвращает время, раньше которого токены пользователя недействительны.
+
+    Без записи в кеше значение читается из БД; для удаленного
+    пользователя недействительны все токены.
+    """
+    cache = get_shared_cache()
+    key = revoked_key(user_id)
+    valid_after = cache.get(key)
+    if valid_after is None:
+        rows = list(User.objects.filter(pk=user_id).values_list(
+            "tokens_valid_after", flat=True
+        )[:1])
+        if not rows:
+            valid_after = math.inf
+        elif rows[0] is None:
+            valid_after = 0.0
+        else:
+            valid_after = rows[0].timestamp()
+        # add, а не set: отзыв, записанный после чтения из БД, не
+        # перезаписывается устаревшим значением.
+        if not cache.add(key, valid_after, revoked_timeout()):
+            valid_after = cache.get(key, valid_after)
+    return valid_after
+
+
+class RoleAccessToken(AccessToken):
+    """Access-токен с ролью и флагами пользователя в claims."""
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        token["iat"] = time.time()
+        token["username"] = user.username
+        for claim in ROLE_CLAIMS:
+            token[claim] = getattr(user, claim)
+        valid_after = user.tokens_valid_after
+        get_shared_cache().add(
+            revoked_key(user.pk),
+            0.0 if valid_after is None else valid_after.timestamp(),
+            revoked_timeout(),
+        )
+        return token
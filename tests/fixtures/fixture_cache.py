@@ -0,0 +1,29 @@
+import pytest
+
+
+@pytest.fixture(scope='session', autouse=True)
+def local_shared_cache():
+    """Подменяет общий кеш локальным до создания тестовой БД: тесты не
+    должны трогать общий кеш запущенного сервера."""
+    from django.conf import settings
+    from django.test.utils import override_settings
+
+    with override_settings(CACHES={
+        **settings.CACHES,
+        settings.SHARED_CACHE_ALIAS: {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'tests-shared',
+            'TIMEOUT': None,
+        },
+    }):
+        yield
+
+
+@pytest.fixture(autouse=True)
+def clear_shared_cache(local_shared_cache):
+    """Очищает общий кеш: идентификаторы объектов в тестовой БД повторяются."""
+    from django.conf import settings
+    from django.core.cache import caches
+
+    caches[settings.SHARED_CACHE_ALIAS].clear()
+    yield
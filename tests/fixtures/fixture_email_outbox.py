@@ -0,0 +1,6 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def send_emails_eagerly(settings):
+    settings.EMAIL_OUTBOX_EAGER = True
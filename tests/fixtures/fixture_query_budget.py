@@ -0,0 +1,6 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def enforce_query_budget(settings):
+    settings.QUERY_BUDGET_ENFORCE = True
@@ -0,0 +1,33 @@
+import pytest
+
+
+@pytest.fixture
+def sqlite_replicas(settings, tmp_path):
+    """Подключает реплики для чтения в виде отдельных файлов SQLite.
+
+    Данные между основной базой и репликами не копируются, поэтому по
+    содержимому ответа видно, с какой базы они прочитаны.
+    """
+    from django.core.management import call_command
+    from django.db import connections
+
+    from api_yamdb.db import routers
+
+    aliases = ['replica1', 'replica2']
+    for alias in aliases:
+        connections.databases[alias] = {
+            'ENGINE': 'api_yamdb.db.backends.sqlite3',
+            'NAME': str(tmp_path / f'{alias}.sqlite3'),
+        }
+        connections.ensure_defaults(alias)
+        connections.prepare_test_settings(alias)
+        call_command('migrate', database=alias, verbosity=0)
+    settings.DATABASE_REPLICAS = aliases
+    routers._down_until.clear()
+    yield aliases
+
+    for alias in aliases:
+        connections[alias].close()
+        del connections[alias]
+        del connections.databases[alias]
+    routers._down_until.clear()
@@ -0,0 +1,38 @@
+import pytest
+from django.core.management import call_command
+
+from .common import auth_client, create_reviews
+
+
+class Test08TitleRating:
+
+    def get_rating(self, client, title_id):
+        response = client.get(f'/api/v1/titles/{title_id}/')
+        assert response.status_code == 200
+        return response.json().get('rating')
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_rating_after_delete(self, client, admin_client, admin):
+        reviews, titles, user, moderator = create_reviews(admin_client, admin)
+        client_moderator = auth_client(moderator)
+        for review in reviews:
+            client_moderator.delete(f'/api/v1/titles/{titles[0]["id"]}/reviews/{review["id"]}/')
+            if review is not reviews[-1]:
+                assert self.get_rating(client, titles[0]['id']) is not None
+        assert self.get_rating(client, titles[0]['id']) is None, (
+            'Проверьте, что после удаления всех отзывов `rating` произведения равен `None`'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_rebuild_ratings(self, client, admin_client, admin):
+        from reviews.models import Title
+
+        reviews, titles, user, moderator = create_reviews(admin_client, admin)
+        Title.objects.update(rating_sum=0, rating_count=0, rating=None)
+        call_command('rebuild_ratings')
+        title = Title.objects.get(id=titles[0]['id'])
+        assert (title.rating_sum, title.rating_count) == (12, 3), (
+            'Проверьте, что команда `rebuild_ratings` пересчитывает сумму и количество оценок'
+        )
+        assert self.get_rating(client, titles[0]['id']) == 4
+        assert self.get_rating(client, titles[1]['id']) is None
@@ -0,0 +1,40 @@
+import pytest
+
+from .common import create_genre
+
+
+class Test09TitleQueries:
+
+    def create_titles(self, count):
+        from reviews.models import Category, Genre, GenreTitle, Title
+
+        category = Category.objects.create(name='Фильм', slug='films')
+        genres = list(Genre.objects.all())
+        for i in range(count):
+            title = Title.objects.create(name=f'Title {i}', year=2000, category=category)
+            GenreTitle.objects.bulk_create(
+                GenreTitle(genre=genre, title=title) for genre in genres
+            )
+        return Title.objects.order_by('id').first()
+
+    @pytest.mark.parametrize('limit', [1, 5, 10, 50])
+    @pytest.mark.django_db(transaction=True)
+    def test_01_title_list_queries(self, client, admin_client, django_assert_num_queries, limit):
+        create_genre(admin_client)
+        self.create_titles(20)
+        # COUNT(*) и страница готовых карточек произведений
+        with django_assert_num_queries(2):
+            response = client.get(f'/api/v1/titles/?limit={limit}')
+        assert response.status_code == 200
+        assert len(response.json()['results']) == min(limit, 20)
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_title_detail_queries(self, client, admin_client, django_assert_num_queries):
+        create_genre(admin_client)
+        title = self.create_titles(3)
+        # произведение и пары из промежуточной таблицы жанров; категория и
+        # жанры берутся из кеша в памяти процесса
+        with django_assert_num_queries(2):
+            response = client.get(f'/api/v1/titles/{title.id}/')
+        assert response.status_code == 200
+        assert len(response.json()['genre']) == 3
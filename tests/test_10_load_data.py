@@ -0,0 +1,105 @@
+import csv
+import io
+
+import pytest
+from django.core.management import call_command
+
+
+class Test10LoadData:
+
+    @pytest.mark.parametrize('chunk_size', [1, 50, 1000, 10 ** 6])
+    def test_01_split_csv(self, chunk_size):
+        from reviews.management.commands.load_data import (TABLES, get_path,
+                                                           split_csv)
+        from reviews.models import Review
+
+        path = get_path(Review)
+        with open(path, encoding='utf-8', newline='') as csv_file:
+            expected = list(csv.DictReader(csv_file))
+        header, ranges = split_csv(path, chunk_size)
+        rows = []
+        with open(path, 'rb') as csv_file:
+            for start, end in ranges:
+                csv_file.seek(start)
+                data = csv_file.read(end - start).decode('utf-8')
+                rows.extend(csv.DictReader(io.StringIO(data, newline=''), fieldnames=header))
+        assert rows == expected, (
+            f'Проверьте, что границы частей файла `{TABLES[Review]}` совпадают с границами записей'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_load_data(self):
+        from reviews.models import Comment, Review, Title
+
+        call_command('load_data', batch_size=10)
+        call_command('load_data', only=['review', 'comment'], truncate=True)
+        assert Review.objects.count() == 72
+        assert Comment.objects.count() == 3
+        assert Title.objects.get(id=1).rating == 10, (
+            'Проверьте, что после загрузки отзывов пересчитываются рейтинги произведений'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_truncate_without_signals(self, django_assert_max_num_queries):
+        from reviews.models import Comment, Review, Title, TitleScore
+        from users.models import User
+
+        call_command('load_data')
+        # Удаление без загрузки объектов и сигналов: число запросов не
+        # зависит от количества отзывов.
+        with django_assert_max_num_queries(40):
+            call_command('load_data', only=['review', 'comment'], truncate=True)
+        assert Review.objects.count() == 72
+
+        call_command('load_data', only=['user'], truncate=True)
+        assert User.objects.count() > 0
+        assert (Review.objects.count(), Comment.objects.count()) == (0, 0), (
+            'Проверьте, что `--truncate` удаляет зависимые записи'
+        )
+        assert not Title.objects.filter(rating__isnull=False).exists(), (
+            'Проверьте, что после каскадного удаления отзывов пересчитываются рейтинги'
+        )
+        assert not TitleScore.objects.filter(count__gt=0).exists()
+
+    def test_04_parallel_load(self, tmp_path):
+        import os
+        import sqlite3
+        import subprocess
+        import sys
+
+        from reviews.management.commands.load_data import TABLES
+
+        # Процессам-исполнителям нужна база в файле, а не тестовая в памяти.
+        env = {
+            **os.environ,
+            'DB_NAME': str(tmp_path / 'db.sqlite3'),
+            'SHARED_CACHE_BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+        manage = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'api_yamdb', 'manage.py')
+        subprocess.run([sys.executable, manage, 'migrate', '-v', '0'], env=env, check=True)
+        output = subprocess.run(
+            [sys.executable, manage, 'load_data', '--workers', '2', '-v', '2'],
+            env=env, check=True, capture_output=True, text=True,
+        ).stdout.splitlines()
+
+        def position(prefix, model):
+            return next(i for i, line in enumerate(output) if line.startswith(f"{prefix} '{TABLES[model]}'"))
+
+        for model in TABLES:
+            parents = {
+                field.related_model for field in model._meta.concrete_fields
+                if field.is_relation and field.related_model in TABLES and field.related_model is not model
+            }
+            for parent in parents:
+                assert position('Загружены данные из файла', parent) < position('Начата загрузка файла', model), (
+                    f'Проверьте, что `{TABLES[model]}` загружается после завершения `{TABLES[parent]}`'
+                )
+
+        with sqlite3.connect(env['DB_NAME']) as connection:
+            for model in TABLES:
+                with open(os.path.join(os.path.dirname(manage), 'static', 'data', TABLES[model]), encoding='utf-8') as f:
+                    expected = sum(1 for _ in csv.DictReader(f))
+                count, = connection.execute(f'SELECT COUNT(*) FROM {model._meta.db_table}').fetchone()
+                assert count == expected, f'Проверьте, что все строки `{TABLES[model]}` загружены'
+            rating, = connection.execute('SELECT rating FROM reviews_title WHERE id = 1').fetchone()
+        assert rating == 10, 'Проверьте, что после параллельной загрузки пересчитываются рейтинги'
@@ -0,0 +1,76 @@
+import pytest
+
+from .common import create_titles
+
+
+class Test11KeysetPagination:
+
+    def create_reviews(self, django_user_model, title_id, count):
+        from reviews.models import Review
+
+        for i in range(count):
+            author = django_user_model.objects.create_user(
+                username=f'user{i}', email=f'user{i}@yamdb.fake'
+            )
+            Review.objects.create(title_id=title_id, author=author, text=f'text {i}', score=i % 10 + 1)
+
+    def paginate(self, client, url, count):
+        from django.db import connection
+
+        queries = []
+
+        def capture(execute, sql, params, many, context):
+            queries.append((sql, params))
+            return execute(sql, params, many, context)
+
+        expected = [item['id'] for item in client.get(f'{url}?limit=100').json()['results']]
+        ids = []
+        next_url = f'{url}?cursor=&limit=5'
+        while next_url:
+            queries.clear()
+            with connection.execute_wrapper(capture):
+                response = client.get(next_url)
+            assert response.status_code == 200
+            data = response.json()
+            assert 'count' not in data
+            assert len(data['results']) <= 5
+            ids.extend(item['id'] for item in data['results'])
+            next_url = data['next']
+        assert sorted(ids) == sorted(expected) and len(ids) == count, (
+            f'Проверьте, что при пагинации по курсору `{url}?cursor=` '
+            'возвращаются все записи без повторов'
+        )
+
+        # Последняя страница: диапазон индекса ограничен курсором.
+        sql, params = queries[-1]
+        with connection.cursor() as cursor:
+            cursor.execute('EXPLAIN QUERY PLAN ' + sql, params)
+            plan = ' '.join(row[-1] for row in cursor.fetchall())
+        assert 'pub_date<?' in plan, (
+            'Проверьте, что страница по курсору не просматривает все более новые записи: ' + plan
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_review_cursor(self, client, admin_client, django_user_model):
+        titles, _, _ = create_titles(admin_client)
+        self.create_reviews(django_user_model, titles[0]['id'], 23)
+        self.paginate(client, f'/api/v1/titles/{titles[0]["id"]}/reviews/', 23)
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_invalid_cursor(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        response = client.get(f'/api/v1/titles/{titles[0]["id"]}/reviews/?cursor=xyz')
+        assert response.status_code == 404, (
+            'Проверьте, что при некорректном курсоре возвращается статус 404'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_comment_cursor(self, client, admin_client, django_user_model):
+        from reviews.models import Comment, Review
+
+        titles, _, _ = create_titles(admin_client)
+        self.create_reviews(django_user_model, titles[0]['id'], 1)
+        review = Review.objects.get()
+        for i in range(17):
+            Comment.objects.create(review=review, author=review.author, text=f'comment {i}')
+        self.paginate(client, f'/api/v1/titles/{titles[0]["id"]}/reviews/{review.id}/comments/', 17)
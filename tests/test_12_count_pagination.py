@@ -0,0 +1,55 @@
+import pytest
+
+from .common import create_titles
+
+
+class Test12CountPagination:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_count_none(self, client, admin_client):
+        create_titles(admin_client)
+        response = client.get('/api/v1/titles/?count=none&limit=1')
+        assert response.status_code == 200
+        data = response.json()
+        assert 'count' not in data, (
+            'Проверьте, что при `count=none` поле `count` не возвращается'
+        )
+        assert data['next'] is not None
+        data = client.get(data['next']).json()
+        assert len(data['results']) == 1
+        assert data['next'] is None
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_count_capped(self, client, admin_client, monkeypatch):
+        from api.v1.pagination import CountPagination
+
+        create_titles(admin_client)
+        monkeypatch.setattr(CountPagination, 'count_cap', 1)
+        data = client.get('/api/v1/titles/?count=capped&limit=1').json()
+        assert data['count'] == '1+', (
+            'Проверьте, что при `count=capped` количество ограничивается значением `count_cap`'
+        )
+        assert data['next'] is not None
+        data = client.get('/api/v1/titles/?count=capped&limit=1&offset=1').json()
+        assert data['next'] is None
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_count_cached(self, admin_client, django_assert_num_queries):
+        from django.core.cache import cache
+
+        cache.clear()
+        titles, categories, genres = create_titles(admin_client)
+        url = f'/api/v1/titles/?count=cached&category={categories[0]["slug"]}'
+        assert admin_client.get(url).json()['count'] == 1
+        # пользователь и страница карточек произведений, без COUNT(*)
+        with django_assert_num_queries(2):
+            assert admin_client.get(url).json()['count'] == 1
+        admin_client.patch(f'/api/v1/titles/{titles[1]["id"]}/', data={'category': categories[0]['slug']})
+        assert admin_client.get(url).json()['count'] == 2, (
+            'Проверьте, что кешированное значение `count` сбрасывается при изменении произведений'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_count_invalid(self, client):
+        response = client.get('/api/v1/titles/?count=fast')
+        assert response.status_code == 400
@@ -0,0 +1,131 @@
+import pytest
+
+from .common import create_reviews, create_titles
+
+CACHES = {
+    'locmem': {
+        'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+    },
+    'file': {
+        'default': {'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache'},
+    },
+}
+
+
+@pytest.fixture(params=CACHES)
+def response_cache(request, settings, tmp_path):
+    caches = CACHES[request.param]
+    if request.param == 'file':
+        caches['default']['LOCATION'] = str(tmp_path)
+    settings.CACHES = {**settings.CACHES, **caches}
+    from django.core.cache import cache
+    cache.clear()
+
+
+class Test13ResponseCache:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_cached_list(self, client, admin_client, response_cache, django_assert_num_queries):
+        create_titles(admin_client)
+        first = client.get('/api/v1/titles/?genre=horror&limit=5')
+        with django_assert_num_queries(0):
+            second = client.get('/api/v1/titles/?limit=5&genre=horror')
+        assert second.status_code == 200
+        assert second.content == first.content, (
+            'Проверьте, что повторный запрос к `/api/v1/titles/` с теми же параметрами возвращается из кеша'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_invalidation(self, client, admin_client, admin, response_cache):
+        titles, _, _ = create_titles(admin_client)
+        url = f'/api/v1/titles/{titles[0]["id"]}/'
+        assert client.get(url).json()['rating'] is None
+        reviews_url = f'{url}reviews/'
+        admin_client.post(reviews_url, data={'text': 'Отлично', 'score': 8})
+        assert client.get(url).json()['rating'] == 8, (
+            'Проверьте, что кеш `/api/v1/titles/{title_id}/` сбрасывается при добавлении отзыва'
+        )
+        assert len(client.get('/api/v1/genres/').json()['results']) == 3
+        admin_client.delete('/api/v1/genres/horror/')
+        assert len(client.get('/api/v1/genres/').json()['results']) == 2, (
+            'Проверьте, что кеш `/api/v1/genres/` сбрасывается при удалении жанра'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_etag(self, client, admin_client, response_cache):
+        create_titles(admin_client)
+        response = client.get('/api/v1/categories/')
+        etag = response['ETag']
+        assert etag, 'Проверьте, что ответ `/api/v1/categories/` содержит заголовок `ETag`'
+        response = client.get('/api/v1/categories/', HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 304
+        admin_client.post('/api/v1/categories/', data={'name': 'Музыка', 'slug': 'music'})
+        response = client.get('/api/v1/categories/', HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200
+        assert response['ETag'] != etag
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_authenticated_not_cached(self, admin_client, admin, response_cache):
+        create_reviews(admin_client, admin)
+        response = admin_client.get('/api/v1/titles/')
+        assert response.status_code == 200
+        assert not response.has_header('ETag')
+
+    @pytest.mark.django_db(transaction=True)
+    def test_05_scoped_rating_invalidation(self, client, admin_client, admin, response_cache,
+                                           django_assert_num_queries):
+        reviews, titles, user, moderator = create_reviews(admin_client, admin)
+        urls = ['/api/v1/titles/', f'/api/v1/titles/{titles[1]["id"]}/']
+        for url in urls:
+            client.get(url)
+        review_url = f'/api/v1/titles/{titles[0]["id"]}/reviews/{reviews[0]["id"]}/'
+        admin_client.patch(review_url, data={'text': 'Новый текст'})
+        with django_assert_num_queries(0):
+            for url in urls:
+                client.get(url)
+
+        admin_client.patch(review_url, data={'score': 1})
+        with django_assert_num_queries(0):
+            client.get(urls[1])
+        assert client.get('/api/v1/titles/').json()['results'][0]['rating'] == 2, (
+            'Проверьте, что изменение оценки сбрасывает кеш списка произведений'
+        )
+        assert client.get(f'/api/v1/titles/{titles[0]["id"]}/').json()['rating'] == 2
+
+    def test_06_shared_cache_check(self, settings):
+        from reviews.checks import check_shared_cache
+
+        def check(backend, debug=False):
+            settings.DEBUG = debug
+            settings.CACHES = {**settings.CACHES, 'shared': {'BACKEND': backend}}
+            return [message.id for message in check_shared_cache(None)]
+
+        assert check('django.core.cache.backends.memcached.PyLibMCCache') == []
+        assert check('django.core.cache.backends.locmem.LocMemCache') == ['reviews.E001'], (
+            'Проверьте, что локальный для процесса общий кеш без DEBUG приводит к ошибке'
+        )
+        assert check('django.core.cache.backends.locmem.LocMemCache', debug=True) == ['reviews.W001'], (
+            'Проверьте, что локальный для процесса общий кеш в режиме DEBUG приводит к предупреждению'
+        )
+        assert check('django.core.cache.backends.filebased.FileBasedCache') == ['reviews.W002'], (
+            'Проверьте, что файловый общий кеш приводит к предупреждению'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_07_versions_bumped_on_commit(self, admin_client, admin):
+        from django.db import transaction
+        from reviews.cache import get_versions
+        from reviews.models import Category, Review, Title
+
+        titles, _, _ = create_titles(admin_client)
+        models = [Category, Review, (Title, 'ratings'), (Title, f'rating:{titles[0]["id"]}')]
+        before = get_versions(models)
+        with transaction.atomic():
+            Category.objects.create(name='Музыка', slug='music')
+            Review.objects.create(title_id=titles[0]['id'], author=admin, text='Текст', score=5)
+            assert get_versions(models) == before, (
+                'Проверьте, что версии данных меняются только после фиксации транзакции: '
+                'иначе другие процессы закешируют старые данные под новой версией'
+            )
+        after = get_versions(models)
+        assert all(new != old for new, old in zip(after, before))
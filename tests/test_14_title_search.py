@@ -0,0 +1,58 @@
+import pytest
+from django.core.management import call_command
+
+
+class Test14TitleSearch:
+
+    def create_titles(self, admin_client):
+        from reviews.models import Category
+
+        Category.objects.create(name='Фильм', slug='films')
+        data = [
+            ('Побег из Шоушенка', 'Тюремная драма о надежде'),
+            ('Крестный отец', 'Семейная сага о мафии и побеге от прошлого'),
+            ('Криминальное чтиво', 'Истории бандитов Лос-Анджелеса'),
+        ]
+        ids = []
+        for name, description in data:
+            response = admin_client.post('/api/v1/titles/', data={
+                'name': name, 'year': 1994, 'category': 'films', 'description': description,
+            })
+            ids.append(response.json()['id'])
+        return ids
+
+    def search(self, client, text):
+        response = client.get('/api/v1/titles/', {'search': text})
+        assert response.status_code == 200
+        return [title['id'] for title in response.json()['results']]
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_search(self, client, admin_client):
+        ids = self.create_titles(admin_client)
+        assert self.search(client, 'побег') == [ids[0], ids[1]], (
+            'Проверьте, что поиск `search` находит произведения по названию и описанию, '
+            'а совпадения в названии выше в выдаче'
+        )
+        assert self.search(client, 'крим') == [ids[2]], (
+            'Проверьте, что поиск `search` выполняется по префиксу слова'
+        )
+        assert self.search(client, 'семейная мафии') == [ids[1]]
+        assert self.search(client, '!!!') == []
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_index_sync(self, client, admin_client):
+        ids = self.create_titles(admin_client)
+        admin_client.patch(f'/api/v1/titles/{ids[2]}/', data={'name': 'Бешеные псы'})
+        assert self.search(client, 'псы') == [ids[2]]
+        assert self.search(client, 'чтиво') == []
+        admin_client.delete(f'/api/v1/titles/{ids[2]}/')
+        assert self.search(client, 'псы') == []
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_rebuild_search_index(self, client, admin_client):
+        from reviews.models import Title
+
+        ids = self.create_titles(admin_client)
+        Title.objects.filter(id=ids[0]).update(name='Зеленая миля')
+        call_command('rebuild_search_index')
+        assert self.search(client, 'миля') == [ids[0]]
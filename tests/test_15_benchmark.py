@@ -0,0 +1,58 @@
+import json
+
+import pytest
+from django.core.management import call_command
+
+
+class Test15Benchmark:
+
+    def generate(self, path, **options):
+        call_command(
+            'generate_data', output=str(path), users=20, categories=3, genres=5,
+            titles=30, reviews=200, comments=50, **options
+        )
+
+    def test_01_generate_data_seeded(self, tmp_path):
+        self.generate(tmp_path / 'a', seed=1)
+        self.generate(tmp_path / 'b', seed=1)
+        for name in ('users.csv', 'titles.csv', 'review.csv', 'comments.csv'):
+            assert (tmp_path / 'a' / name).read_bytes() == (tmp_path / 'b' / name).read_bytes(), (
+                'Проверьте, что команда `generate_data` с одинаковым `seed` создает одинаковые данные'
+            )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_load_and_benchmark(self, tmp_path):
+        from reviews.models import Comment, Review, Title
+        from users.models import User
+
+        self.generate(tmp_path, seed=2)
+        call_command('load_data', data_dir=str(tmp_path))
+        assert Title.objects.count() == 30
+        assert Review.objects.count() == 200
+        assert Comment.objects.count() == 50
+
+        users = set(User.objects.values_list('username', flat=True))
+        report_path = tmp_path / 'report.json'
+        call_command('benchmark_api', repeat=2, output=str(report_path))
+        assert set(User.objects.values_list('username', flat=True)) == users, (
+            'Проверьте, что `benchmark_api` не оставляет в базе созданных пользователей'
+        )
+        assert (Title.objects.count(), Review.objects.count(), Comment.objects.count()) == (30, 200, 50), (
+            'Проверьте, что изменения изменяющих запросов `benchmark_api` откатываются'
+        )
+        report = json.loads(report_path.read_text(encoding='utf-8'))
+        assert report['rows']['reviews.Review'] == 200
+        methods = set()
+        for name, result in report['endpoints'].items():
+            assert result['status'] in (200, 201, 204), f'Эндпоинт {name} вернул статус {result["status"]}'
+            assert result['queries'] > 0
+            assert result['p50_ms'] <= result['p99_ms']
+            methods.add(result['method'])
+        assert methods == {'GET', 'POST', 'PATCH', 'DELETE'}
+        for name in ('auth-signup', 'auth-token', 'reviews-bulk', 'titles-stats', 'comments-delete'):
+            assert name in report['endpoints'], f'Проверьте, что `benchmark_api` измеряет эндпоинт {name}'
+
+        admin = User.objects.create(username='bench-admin', email='bench@yamdb.fake', role='admin')
+        call_command('benchmark_api', repeat=2, username=admin.username, output=str(report_path))
+        report = json.loads(report_path.read_text(encoding='utf-8'))
+        assert report['endpoints']['users-list']['status'] == 200
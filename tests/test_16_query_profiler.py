@@ -0,0 +1,50 @@
+import json
+import logging
+
+import pytest
+
+from .common import create_titles
+
+
+class Test16QueryProfiler:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_server_timing(self, admin_client, settings):
+        settings.SERVER_TIMING_HEADER = True
+        create_titles(admin_client)
+        response = admin_client.get('/api/v1/titles/')
+        assert response.status_code == 200
+        timing = response['Server-Timing']
+        assert 'db;dur=' in timing and 'desc="3 queries"' in timing, (
+            'Проверьте, что заголовок `Server-Timing` содержит время и количество запросов к БД'
+        )
+        assert 'render;dur=' in timing and 'total;dur=' in timing
+        timings = {
+            item.split(';')[0]: float(item.split('dur=')[1].split(';')[0]) for item in timing.split(', ')
+        }
+        assert 'view' in timings, 'Проверьте, что `Server-Timing` содержит время работы вьюсета с сериализацией'
+        assert timings['view'] + timings['render'] <= timings['total']
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_query_budget(self, admin_client, monkeypatch):
+        from api.middleware import QueryBudgetExceeded
+        from api.v1.views import TitleViewSet
+
+        create_titles(admin_client)
+        monkeypatch.setattr(TitleViewSet, 'query_budget', {'list': 2})
+        with pytest.raises(QueryBudgetExceeded):
+            admin_client.get('/api/v1/titles/')
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_slow_request_log(self, client, admin_client, settings, caplog):
+        settings.QUERY_LOG_THRESHOLD_MS = 0
+        create_titles(admin_client)
+        with caplog.at_level(logging.WARNING, logger='api.middleware'):
+            client.get('/api/v1/genres/')
+        records = [json.loads(record.getMessage()) for record in caplog.records]
+        assert records, 'Проверьте, что медленные запросы записываются в лог'
+        assert records[-1]['path'] == '/api/v1/genres/'
+        assert records[-1]['view'] == 'GenreViewSet.list'
+        assert records[-1]['queries'] == 2
+        assert records[-1]['slowest_sql']
+        assert records[-1]['view_ms'] is not None
@@ -0,0 +1,110 @@
+import pytest
+from rest_framework.test import APIClient
+
+from .common import create_reviews
+
+
+def get_token(client, user):
+    from django.contrib.auth.tokens import default_token_generator
+
+    response = client.post('/api/v1/auth/token/', data={
+        'username': user.username,
+        'confirmation_code': default_token_generator.make_token(user),
+    })
+    assert response.status_code == 200
+    return response.json()['token']
+
+
+def token_client(token):
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+    return client
+
+
+class Test17StatelessAuth:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_no_user_query(self, client, admin, django_assert_num_queries):
+        admin_client = token_client(get_token(client, admin))
+        # COUNT(*) и страница пользователей, без загрузки текущего пользователя
+        with django_assert_num_queries(2):
+            response = admin_client.get('/api/v1/users/')
+        assert response.status_code == 200, (
+            'Проверьте, что токен из `/api/v1/auth/token/` содержит роль пользователя'
+        )
+        response = admin_client.get('/api/v1/users/me/')
+        assert response.json()['email'] == admin.email, (
+            'Проверьте, что `/api/v1/users/me/` возвращает полные данные пользователя'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_author_permissions(self, client, admin_client, admin):
+        reviews, titles, user, moderator = create_reviews(admin_client, admin)
+        user_client = token_client(get_token(client, user))
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        response = user_client.patch(f'{url}{reviews[1]["id"]}/', data={'text': 'Мой отзыв'})
+        assert response.status_code == 200
+        response = user_client.patch(f'{url}{reviews[0]["id"]}/', data={'text': 'Чужой отзыв'})
+        assert response.status_code == 403
+        response = user_client.post(
+            f'/api/v1/titles/{titles[1]["id"]}/reviews/', data={'text': 'Новый', 'score': 6}
+        )
+        assert response.status_code == 201
+        assert response.json()['author'] == user.username
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_revoke_on_role_change(self, client, user):
+        token = get_token(client, user)
+        user_client = token_client(token)
+        assert user_client.get('/api/v1/users/me/').status_code == 200
+        user.bio = 'Новая биография'
+        user.save()
+        assert user_client.get('/api/v1/users/me/').status_code == 200, (
+            'Проверьте, что изменение профиля без смены роли не отзывает токен'
+        )
+        user.role = 'admin'
+        user.save()
+        assert user_client.get('/api/v1/users/me/').status_code == 401, (
+            'Проверьте, что после смены роли старый токен отклоняется'
+        )
+        admin_client = token_client(get_token(client, user))
+        assert admin_client.get('/api/v1/users/').status_code == 200
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_revocation_survives_cache_eviction(self, client, admin):
+        from django.conf import settings
+        from django.core.cache import cache, caches
+
+        admin_client = token_client(get_token(client, admin))
+        assert admin_client.get('/api/v1/users/').status_code == 200
+        admin.role = 'user'
+        admin.is_superuser = False
+        admin.save()
+        for i in range(400):
+            cache.set(f'filler:{i}', i)
+        assert admin_client.get('/api/v1/users/').status_code == 401, (
+            'Проверьте, что отзыв токена не теряется при вытеснении записей из кеша'
+        )
+        caches[settings.SHARED_CACHE_ALIAS].clear()
+        assert admin_client.get('/api/v1/users/').status_code == 401, (
+            'Проверьте, что без записи в кеше время отзыва токенов читается из БД'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_05_inactive_and_deleted_users(self, client, user):
+        from django.conf import settings
+        from django.core.cache import caches
+        from users.tokens import RoleAccessToken
+
+        token = get_token(client, user)
+        user.is_active = False
+        inactive_token = str(RoleAccessToken.for_user(user))
+        assert token_client(inactive_token).get('/api/v1/users/me/').status_code == 401, (
+            'Проверьте, что токен неактивного пользователя отклоняется'
+        )
+        user_client = token_client(token)
+        user.delete()
+        caches[settings.SHARED_CACHE_ALIAS].clear()
+        assert user_client.get('/api/v1/users/me/').status_code == 401, (
+            'Проверьте, что токены удаленного пользователя отклоняются'
+        )
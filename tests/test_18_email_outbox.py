@@ -0,0 +1,117 @@
+from datetime import timedelta
+
+import threading
+
+import pytest
+from django.core import mail
+from django.core.mail.backends.base import BaseEmailBackend
+from django.core.management import call_command
+from django.utils import timezone
+
+
+class FailingBackend(BaseEmailBackend):
+    def send_messages(self, email_messages):
+        raise ConnectionError('SMTP недоступен')
+
+
+class ConcurrentWriteBackend(BaseEmailBackend):
+    """Отправляет первое письмо, пока другое соединение пишет в очередь,
+    и не может отправить остальные."""
+
+    def send_messages(self, email_messages):
+        if ConcurrentWriteBackend.sent:
+            raise ConnectionError('SMTP недоступен')
+
+        def enqueue():
+            from django.db import connection
+
+            from users.outbox import enqueue_email
+            try:
+                enqueue_email('Тема', 'Текст', 'new@yamdb.fake')
+            finally:
+                connection.close()
+
+        thread = threading.Thread(target=enqueue)
+        thread.start()
+        thread.join()
+        ConcurrentWriteBackend.sent.extend(email_messages)
+        return len(email_messages)
+
+
+class Test18EmailOutbox:
+    url_signup = '/api/v1/auth/signup/'
+    data = {'username': 'queued_user', 'email': 'queued@yamdb.fake'}
+
+    @pytest.fixture(autouse=True)
+    def queue_emails(self, settings):
+        settings.EMAIL_OUTBOX_EAGER = False
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_signup_enqueues_email(self, client):
+        from users.models import OutgoingEmail
+
+        for _ in range(3):
+            response = client.post(self.url_signup, data=self.data)
+            assert response.status_code == 200
+        assert len(mail.outbox) == 0, (
+            'Проверьте, что при регистрации письмо не отправляется во время запроса'
+        )
+        assert OutgoingEmail.objects.count() == 1, (
+            'Проверьте, что повторные запросы регистрации не ставят письмо в очередь повторно'
+        )
+
+        call_command('send_emails')
+        assert len(mail.outbox) == 1
+        assert mail.outbox[0].to == [self.data['email']]
+        assert OutgoingEmail.objects.get().sent is not None
+
+        call_command('send_emails')
+        assert len(mail.outbox) == 1, (
+            'Проверьте, что отправленное письмо не отправляется повторно'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_retry_with_backoff(self, client, settings):
+        from users.models import OutgoingEmail
+
+        client.post(self.url_signup, data=self.data)
+        settings.EMAIL_BACKEND = 'tests.test_18_email_outbox.FailingBackend'
+        call_command('send_emails')
+        email = OutgoingEmail.objects.get()
+        assert email.sent is None
+        assert email.attempts == 1
+        assert 'SMTP недоступен' in email.last_error
+        assert email.send_after > timezone.now(), (
+            'Проверьте, что повторная отправка откладывается'
+        )
+
+        settings.EMAIL_BACKEND = 'django.core.mail.backends.locmem.EmailBackend'
+        call_command('send_emails')
+        assert len(mail.outbox) == 0
+
+        OutgoingEmail.objects.update(send_after=timezone.now() - timedelta(seconds=1))
+        call_command('send_emails')
+        assert len(mail.outbox) == 1
+        assert OutgoingEmail.objects.get().attempts == 2
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_concurrent_write_during_sending(self, settings):
+        from users.models import OutgoingEmail
+        from users.outbox import enqueue_email
+
+        for index in range(2):
+            enqueue_email('Тема', 'Текст', f'user{index}@yamdb.fake')
+        settings.EMAIL_BACKEND = 'tests.test_18_email_outbox.ConcurrentWriteBackend'
+        ConcurrentWriteBackend.sent = []
+        call_command('send_emails')
+        first, second, new = OutgoingEmail.objects.order_by('id')
+        assert first.sent is not None, (
+            'Проверьте, что результат отправки письма записывается сразу, '
+            'а не в конце пачки'
+        )
+        assert (second.sent, second.attempts) == (None, 1)
+        assert second.send_after > timezone.now()
+        assert (new.sent, new.attempts) == (None, 0), (
+            'Проверьте, что во время отправки писем другие соединения могут '
+            'ставить письма в очередь'
+        )
@@ -0,0 +1,65 @@
+import pytest
+from rest_framework.test import APIClient
+
+from .common import auth_client, create_reviews
+
+
+class Test19BulkReviews:
+    url = '/api/v1/titles/reviews/bulk/'
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_bulk_create(self, client, admin_client, admin, django_assert_max_num_queries):
+        from reviews.models import Review, Title
+
+        reviews, titles, user, moderator = create_reviews(admin_client, admin)
+        data = [
+            {'title': titles[1]['id'], 'text': 'Отзыв админа', 'score': 10},
+            {'title': titles[1]['id'], 'author': user.username, 'text': 'Отзыв', 'score': 6},
+            {'title': titles[0]['id'], 'text': 'Повтор', 'score': 1},
+            {'title': titles[1]['id'], 'text': 'Повтор в запросе', 'score': 1},
+            {'title': 999999, 'text': 'Нет произведения', 'score': 5},
+            {'title': titles[1]['id'], 'author': 'nobody', 'text': 'Нет автора', 'score': 5},
+            {'title': titles[1]['id'], 'text': 'Плохая оценка', 'score': 11},
+        ]
+        with django_assert_max_num_queries(12):
+            response = admin_client.post(self.url, data=data, format='json')
+        assert response.status_code == 200, (
+            f'Проверьте, что POST запрос `{self.url}` от администратора возвращает статус 200'
+        )
+        response_json = response.json()
+        assert (response_json['created'], response_json['failed']) == (2, 5)
+        statuses = [result['status'] for result in response_json['results']]
+        assert statuses == [201, 201, 400, 400, 400, 400, 400], (
+            'Проверьте, что для каждого отзыва возвращается результат в порядке запроса'
+        )
+        assert 'score' in response_json['results'][6]['errors']
+        created = Review.objects.get(pk=response_json['results'][1]['id'])
+        assert created.author_id == user.id and created.title_id == titles[1]['id']
+
+        title = Title.objects.get(pk=titles[1]['id'])
+        assert (title.rating_sum, title.rating_count, title.rating) == (16, 2, 8.0), (
+            'Проверьте, что после пакетной загрузки обновляется рейтинг произведения'
+        )
+        response = client.get(f'/api/v1/titles/{titles[1]["id"]}/')
+        assert response.json()['rating'] == 8
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_bulk_permissions(self, admin_client, admin):
+        reviews, titles, user, moderator = create_reviews(admin_client, admin)
+        data = [{'title': titles[1]['id'], 'text': 'Отзыв', 'score': 5}]
+        response = APIClient().post(self.url, data=data, format='json')
+        assert response.status_code == 401
+
+        user_client = auth_client(user)
+        data.append({
+            'title': titles[1]['id'], 'author': moderator.username, 'text': 'Чужой', 'score': 5,
+        })
+        response = user_client.post(self.url, data=data, format='json')
+        assert response.status_code == 200
+        statuses = [result['status'] for result in response.json()['results']]
+        assert statuses == [201, 400], (
+            'Проверьте, что только администратор может указывать автора отзыва'
+        )
+
+        response = user_client.post(self.url, data={'title': 1}, format='json')
+        assert response.status_code == 400
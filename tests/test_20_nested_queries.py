@@ -0,0 +1,83 @@
+import pytest
+from rest_framework.test import APIClient
+
+from .common import create_comments, create_reviews
+
+
+class Test20NestedQueries:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_review_queries(self, admin_client, admin, django_assert_num_queries):
+        reviews, titles, user, moderator = create_reviews(admin_client, admin)
+        client = APIClient()
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        # COUNT(*) и страница отзывов без отдельной загрузки произведения
+        with django_assert_num_queries(2):
+            response = client.get(url)
+        assert response.status_code == 200
+        with django_assert_num_queries(1):
+            response = client.get(f'{url}{reviews[0]["id"]}/')
+        assert response.status_code == 200
+        # пользователь, произведение, BEGIN, вставка отзыва, обновление
+        # рейтинга и распределения оценок (для первой оценки - создание строки)
+        with django_assert_num_queries(8):
+            response = admin_client.post(
+                f'/api/v1/titles/{titles[1]["id"]}/reviews/', data={'text': 'Текст', 'score': 5}
+            )
+        assert response.status_code == 201
+
+        assert client.get('/api/v1/titles/999/reviews/').status_code == 404
+        assert client.get(f'{url}?offset=100').status_code == 200, (
+            'Проверьте, что пустая страница отзывов существующего произведения не возвращает 404'
+        )
+        response = client.get(f'/api/v1/titles/{titles[1]["id"]}/reviews/{reviews[0]["id"]}/')
+        assert response.status_code == 404
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_comment_queries(self, admin_client, admin, django_assert_num_queries):
+        comments, reviews, titles, user, moderator = create_comments(admin_client, admin)
+        client = APIClient()
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/{reviews[0]["id"]}/comments/'
+        with django_assert_num_queries(2):
+            response = client.get(url)
+        assert response.status_code == 200
+        assert len(response.json()['results']) == 3
+
+        wrong_title = f'/api/v1/titles/{titles[1]["id"]}/reviews/{reviews[0]["id"]}/comments/'
+        assert client.get(wrong_title).status_code == 404, (
+            'Проверьте, что комментарии отзыва другого произведения не возвращаются'
+        )
+        response = admin_client.post(wrong_title, data={'text': 'Текст'})
+        assert response.status_code == 404
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_review_integrity_errors(self, admin_client, admin):
+        from django.db import IntegrityError
+        from users.models import User
+        from users.tokens import RoleAccessToken
+
+        reviews, titles, user, moderator = create_reviews(admin_client, admin)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        response = admin_client.post(url, data={'text': 'Еще раз', 'score': 5})
+        assert response.status_code == 400
+        assert response.json()['non_field_errors'] == ['Запрещено оставлять отзыв на одно произведение дважды']
+
+        # Пользователь удален после проверки токена: ошибка внешнего ключа
+        # не выдается за повторный отзыв.
+        ghost = User(pk=999, username='ghost', email='ghost@yamdb.fake')
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {RoleAccessToken.for_user(ghost)}')
+        with pytest.raises(IntegrityError):
+            client.post(url, data={'text': 'Отзыв', 'score': 5})
+
+    @pytest.mark.django_db
+    def test_04_review_for_missing_title_in_transaction(self, admin_client):
+        from reviews.models import Review, TitleScore
+
+        response = admin_client.post('/api/v1/titles/999/reviews/', data={'text': 'Отзыв', 'score': 5})
+        assert response.status_code == 404, (
+            'Проверьте, что отзыв на несуществующее произведение возвращает 404 '
+            'и внутри внешней транзакции'
+        )
+        assert not Review.objects.exists()
+        assert not TitleScore.objects.exists()
@@ -0,0 +1,134 @@
+import pytest
+
+
+class Test21DatabaseConfig:
+
+    def test_01_sqlite_config(self, tmp_path):
+        from api_yamdb.db.config import get_databases
+
+        databases = get_databases(str(tmp_path), env={})
+        default = databases['default']
+        assert list(databases) == ['default']
+        assert default['ENGINE'] == 'api_yamdb.db.backends.sqlite3'
+        assert default['CONN_MAX_AGE'] == 60
+        assert default['PRAGMAS']['journal_mode'] == 'WAL'
+
+        databases = get_databases(str(tmp_path), env={'DB_SQLITE_WAL': 'false', 'DB_CONN_MAX_AGE': '0'})
+        assert 'journal_mode' not in databases['default']['PRAGMAS']
+        assert databases['default']['CONN_MAX_AGE'] == 0
+
+    def test_02_postgresql_config(self, tmp_path):
+        from api_yamdb.db.config import get_databases
+
+        databases = get_databases(str(tmp_path), env={
+            'DB_ENGINE': 'postgresql',
+            'DB_NAME': 'yamdb',
+            'DB_HOST': 'primary',
+            'DB_POOL_MAX_SIZE': '20',
+            'DB_REPLICA_HOSTS': 'replica-a, replica-b:6432',
+        })
+        default = databases['default']
+        assert default['ENGINE'] == 'api_yamdb.db.backends.postgresql'
+        assert (default['NAME'], default['HOST'], default['PORT']) == ('yamdb', 'primary', '5432')
+        assert default['POOL'] == {'MIN_SIZE': 1, 'MAX_SIZE': 20}
+        assert default['CONN_HEALTH_CHECKS'] is True
+        assert [
+            (alias, config['HOST'], config['PORT'], config['TEST']['MIRROR'])
+            for alias, config in databases.items() if alias != 'default'
+        ] == [
+            ('replica1', 'replica-a', '5432', 'default'),
+            ('replica2', 'replica-b', '6432', 'default'),
+        ], 'Проверьте, что реплики для чтения настраиваются из `DB_REPLICA_HOSTS`'
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_sqlite_pragmas(self):
+        from django.db import connection
+
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA synchronous')
+            assert cursor.fetchone()[0] == 1, (
+                'Проверьте, что для соединений SQLite применяются настройки из `PRAGMAS`'
+            )
+            cursor.execute('PRAGMA busy_timeout')
+            assert cursor.fetchone()[0] == 5000
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_health_check(self, monkeypatch):
+        from django.db import close_old_connections, connection
+
+        connection.ensure_connection()
+        closed = []
+        monkeypatch.setattr(connection, 'is_usable', lambda: False)
+        monkeypatch.setattr(connection, 'close', lambda: closed.append(True))
+
+        connection.ensure_connection()
+        assert not closed, (
+            'Проверьте, что в рамках одного запроса соединение проверяется только один раз'
+        )
+        close_old_connections()
+        connection.ensure_connection()
+        connection.ensure_connection()
+        assert closed == [True], (
+            'Проверьте, что постоянное соединение проверяется в начале запроса '
+            'и закрывается, если не работает'
+        )
+
+    def test_05_postgresql_pool(self, django_db_blocker):
+        """Пул соединений PostgreSQL. Нужен сервер, параметры которого заданы
+        переменными `TEST_DB_HOST`, `TEST_DB_PORT`, `TEST_DB_NAME`,
+        `TEST_DB_USER`, `TEST_DB_PASSWORD`."""
+        import os
+
+        psycopg2 = pytest.importorskip('psycopg2')
+        if 'TEST_DB_HOST' not in os.environ:
+            pytest.skip('Сервер PostgreSQL для тестов не задан')
+        from django.db import connections
+
+        from api_yamdb.db.backends.postgresql.base import pools
+        from api_yamdb.db.config import get_databases
+
+        env = {name[len('TEST_'):]: value for name, value in os.environ.items() if name.startswith('TEST_DB_')}
+        alias = 'pooled'
+        connections.databases[alias] = get_databases('', env={
+            **env, 'DB_ENGINE': 'postgresql', 'DB_POOL_MAX_SIZE': '2',
+        })['default']
+        connections.ensure_defaults(alias)
+        connections.prepare_test_settings(alias)
+        connection = connections[alias]
+        django_db_blocker.unblock()
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT pg_backend_pid()')
+                pid = cursor.fetchone()[0]
+            raw = connection.connection
+            connection.close()
+            assert not raw.closed, 'Проверьте, что при закрытии соединение возвращается в пул'
+
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT pg_backend_pid()')
+                assert cursor.fetchone()[0] == pid, 'Проверьте, что соединение берется из пула повторно'
+            connection.close()
+
+            raw.close()
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT pg_backend_pid()')
+                pid = cursor.fetchone()[0]
+            assert connection.connection is not raw, 'Проверьте, что закрытое соединение в пуле заменяется новым'
+            connection.close()
+
+            with psycopg2.connect(**connection.get_connection_params()) as other:
+                with other.cursor() as cursor:
+                    cursor.execute('SELECT pg_terminate_backend(%s)', [pid])
+            other.close()
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT pg_backend_pid()')
+                assert cursor.fetchone()[0] != pid, (
+                    'Проверьте, что соединение из пула, разорванное сервером, заменяется новым'
+                )
+        finally:
+            connection.close()
+            for key in [key for key in pools if key[0] == alias]:
+                pools.pop(key).closeall()
+            del connections[alias]
+            del connections.databases[alias]
+            django_db_blocker.restore()
@@ -0,0 +1,65 @@
+import pytest
+from rest_framework.test import APIClient
+
+from .common import auth_client, create_reviews
+
+
+class Test22ReadReplicas:
+
+    def create_category(self, alias, name):
+        from reviews.models import Category
+
+        return Category.objects.using(alias).create(name=name, slug=alias)
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_round_robin(self, admin_client, sqlite_replicas):
+        for alias in sqlite_replicas:
+            self.create_category(alias, f'Категория {alias}')
+        client = APIClient()
+        slugs = []
+        for limit in range(1, 5):
+            # разные параметры, чтобы не попасть в кеш ответов
+            response = client.get(f'/api/v1/categories/?limit={limit}')
+            assert response.status_code == 200
+            slugs.extend(category['slug'] for category in response.json()['results'])
+        assert slugs == ['replica1', 'replica2', 'replica1', 'replica2'], (
+            'Проверьте, что безопасные запросы читают данные с реплик по очереди'
+        )
+        admin_client.post('/api/v1/categories/', data={'name': 'Новая', 'slug': 'new'})
+        from reviews.models import Category
+        assert Category.objects.using('default').filter(slug='new').exists(), (
+            'Проверьте, что запись выполняется на основной базе'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_skip_unavailable_replica(self, settings, tmp_path, sqlite_replicas):
+        from django.db import connections
+
+        self.create_category('replica2', 'Категория')
+        connections['replica1'].close()
+        connections['replica1'].settings_dict['NAME'] = str(tmp_path / 'missing' / 'db.sqlite3')
+        client = APIClient()
+        for limit in range(1, 4):
+            response = client.get(f'/api/v1/categories/?limit={limit}')
+            assert [category['slug'] for category in response.json()['results']] == ['replica2'], (
+                'Проверьте, что недоступная реплика пропускается'
+            )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_read_your_writes(self, admin_client, admin, sqlite_replicas):
+        from django.core.cache import cache
+
+        reviews, titles, user, moderator = create_reviews(admin_client, admin)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        user_client = auth_client(user)
+        # Запрос в другом процессе: локального кеша этого процесса он не видит.
+        cache.clear()
+        assert user_client.get(url).status_code == 200, (
+            'Проверьте, что после записи пользователь читает данные с основной базы'
+        )
+        assert len(user_client.get(url).json()['results']) == 3
+
+        other = APIClient()
+        assert other.get(url).status_code == 404, (
+            'Проверьте, что остальные пользователи читают данные с реплики'
+        )
@@ -0,0 +1,91 @@
+import pytest
+
+from .common import create_reviews
+
+
+class Test23TitleCards:
+
+    def serialized(self):
+        from api.v1.serializers import TitleReadOnlySerializer
+        from reviews.models import Title
+
+        titles = Title.objects.prefetch_related('genre').select_related('category').order_by('id')
+        return [dict(data) for data in TitleReadOnlySerializer(titles, many=True).data]
+
+    def listed(self, admin_client):
+        response = admin_client.get('/api/v1/titles/')
+        assert response.status_code == 200
+        return sorted(response.json()['results'], key=lambda title: title['id'])
+
+    def normalize(self, titles):
+        for title in titles:
+            title['genre'] = sorted(title['genre'], key=lambda genre: genre['slug'])
+        return titles
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_cards_match_serializer(self, admin_client, admin):
+        from reviews.models import Category, Genre
+
+        reviews, titles, user, moderator = create_reviews(admin_client, admin)
+        assert self.normalize(self.listed(admin_client)) == self.normalize(self.serialized()), (
+            'Проверьте, что список произведений из карточек совпадает с выводом `TitleReadOnlySerializer`'
+        )
+
+        category = Category.objects.get(slug=titles[0]['category'])
+        category.name = 'Кино'
+        category.save()
+        genre = Genre.objects.get(slug=titles[0]['genre'][0])
+        genre.name = 'Хоррор'
+        genre.save()
+        Genre.objects.get(slug=titles[0]['genre'][1]).delete()
+        Category.objects.get(slug=titles[1]['category']).delete()
+        admin_client.patch(f'/api/v1/titles/{titles[1]["id"]}/', data={'name': 'Проект 2'})
+        admin_client.delete(f'/api/v1/titles/{titles[0]["id"]}/reviews/{reviews[0]["id"]}/')
+
+        listed = self.listed(admin_client)
+        assert listed[0]['category'] == {'name': 'Кино', 'slug': category.slug}, (
+            'Проверьте, что карточки обновляются при изменении категории'
+        )
+        assert listed[0]['genre'] == [{'name': 'Хоррор', 'slug': genre.slug}], (
+            'Проверьте, что карточки обновляются при изменении и удалении жанров'
+        )
+        assert listed[0]['rating'] == 3
+        assert (listed[1]['name'], listed[1]['category']) == ('Проект 2', None)
+        assert self.normalize(listed) == self.normalize(self.serialized())
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_formatted_json(self, admin_client, admin):
+        reviews, titles, user, moderator = create_reviews(admin_client, admin)
+        response = admin_client.get('/api/v1/titles/', HTTP_ACCEPT='application/json; indent=4')
+        assert response.status_code == 200
+        assert sorted(response.json()['results'], key=lambda title: title['id']) == self.listed(admin_client)
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_load_data_cards(self, admin_client):
+        from django.core.management import call_command
+
+        call_command('load_data')
+        response = admin_client.get('/api/v1/titles/?limit=1000')
+        listed = sorted(response.json()['results'], key=lambda title: title['id'])
+        assert self.normalize(listed) == self.normalize(self.serialized()), (
+            'Проверьте, что `load_data` пересобирает карточки произведений'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_genre_title_writes(self, admin_client, admin):
+        from reviews.models import Genre, GenreTitle, Title
+
+        reviews, titles, user, moderator = create_reviews(admin_client, admin)
+        title = Title.objects.get(pk=titles[1]['id'])
+        GenreTitle.objects.create(title=title, genre=Genre.objects.get(slug='comedy'))
+        assert self.normalize(self.listed(admin_client)) == self.normalize(self.serialized()), (
+            'Проверьте, что карточки обновляются при создании `GenreTitle` напрямую'
+        )
+        GenreTitle.objects.filter(title=title).delete()
+        assert self.listed(admin_client)[1]['genre'] == [], (
+            'Проверьте, что карточки обновляются при удалении `GenreTitle` напрямую'
+        )
+        title.genre.add(*Genre.objects.all())
+        Genre.objects.get(slug='horror').delete()
+        title.genre.remove(Genre.objects.get(slug='drama'))
+        assert self.normalize(self.listed(admin_client)) == self.normalize(self.serialized())
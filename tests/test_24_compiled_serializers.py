@@ -0,0 +1,90 @@
+import json
+
+import pytest
+from django.core.management import call_command
+from rest_framework.utils.encoders import JSONEncoder
+
+from .common import create_reviews
+
+
+class Test24CompiledSerializers:
+
+    def cases(self):
+        from api.v1.serializers import (CategorySerializer, CommentSerializer, GenreSerializer,
+                                        ReviewSerializer, TitleReadOnlySerializer)
+        from reviews.models import Category, Comment, Genre, Review, Title
+
+        return [
+            (CategorySerializer, Category.objects.all()),
+            (GenreSerializer, Genre.objects.all()),
+            (TitleReadOnlySerializer, Title.objects.select_related('category').prefetch_related('genre')),
+            (ReviewSerializer, Review.objects.select_related('author')),
+            (CommentSerializer, Comment.objects.select_related('author')),
+        ]
+
+    def dump(self, data):
+        data = json.loads(json.dumps(data, cls=JSONEncoder))
+        for item in data:
+            if 'genre' in item:
+                item['genre'] = sorted(item['genre'], key=lambda genre: genre['slug'])
+        return data
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_same_output_as_drf(self):
+        from api.v1.compiled import compile_serializer
+
+        call_command('load_data')
+        for serializer_class, queryset in self.cases():
+            queryset = queryset.order_by('pk')
+            compiled = compile_serializer(serializer_class)
+            assert compiled is not None, (
+                f'Проверьте, что `{serializer_class.__name__}` поддерживается скомпилированным сериализатором'
+            )
+            expected = self.dump(serializer_class(queryset, many=True).data)
+            assert expected, f'Нет данных для `{serializer_class.__name__}`'
+            actual = self.dump(compiled.represent_many(compiled.values(queryset)))
+            assert actual == expected, (
+                f'Проверьте, что вывод скомпилированного `{serializer_class.__name__}` совпадает с DRF'
+            )
+
+    def test_02_unsupported_fields(self):
+        from api.v1.compiled import compile_serializer
+        from api.v1.serializers import TitleSerializer, UserSerializer
+
+        assert compile_serializer(TitleSerializer) is None, (
+            'Проверьте, что сериализатор со списком `SlugRelatedField` обрабатывается через DRF'
+        )
+        assert compile_serializer(UserSerializer) is not None
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_api_responses(self, admin_client, admin):
+        from api.v1.serializers import CommentSerializer, ReviewSerializer
+        from reviews.models import Comment, Review
+
+        reviews, titles, user, moderator = create_reviews(admin_client, admin)
+        title_id = titles[0]['id']
+        review = Review.objects.get(pk=reviews[0]['id'])
+        response = admin_client.get(f'/api/v1/titles/{title_id}/reviews/{review.pk}/')
+        assert response.status_code == 200
+        assert response.json() == self.dump([ReviewSerializer(review).data])[0]
+
+        response = admin_client.get(f'/api/v1/titles/{title_id}/reviews/')
+        assert response.status_code == 200
+        expected = ReviewSerializer(Review.objects.filter(title_id=title_id), many=True).data
+        assert sorted(response.json()['results'], key=lambda item: item['id']) == sorted(
+            self.dump(expected), key=lambda item: item['id']
+        )
+
+        response = admin_client.get(f'/api/v1/titles/{title_id}/reviews/{review.pk}/comments/')
+        assert response.status_code == 200
+        expected = CommentSerializer(Comment.objects.filter(review=review), many=True).data
+        assert sorted(response.json()['results'], key=lambda item: item['id']) == sorted(
+            self.dump(expected), key=lambda item: item['id']
+        )
+        assert admin_client.get(f'/api/v1/titles/{title_id}/reviews/0/').status_code == 404
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_benchmark_command(self, capsys):
+        call_command('load_data')
+        call_command('benchmark_serializers', repeat=1, limit=20)
+        assert 'объектов/с' in capsys.readouterr().out
@@ -0,0 +1,77 @@
+import json
+
+import pytest
+
+from .common import create_reviews
+
+
+def read_lines(response):
+    assert response.streaming, 'Проверьте, что список в формате NDJSON отдается потоком'
+    assert response['Content-Type'].startswith('application/x-ndjson')
+    content = b''.join(response.streaming_content).decode('utf-8')
+    assert content.endswith('\n')
+    return [json.loads(line) for line in content.splitlines()]
+
+
+def by_id(items, key='id'):
+    return sorted(items, key=lambda item: item[key])
+
+
+class Test25Streaming:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_titles_and_reviews(self, client, admin_client, admin):
+        reviews, titles, user, moderator = create_reviews(admin_client, admin)
+
+        response = client.get('/api/v1/titles/', HTTP_ACCEPT='application/x-ndjson')
+        assert response.status_code == 200
+        expected = client.get('/api/v1/titles/').json()['results']
+        assert by_id(read_lines(response)) == by_id(expected), (
+            'Проверьте, что потоковый список произведений совпадает с обычным ответом'
+        )
+
+        category = titles[0]['category']
+        response = client.get(f'/api/v1/titles/?format=ndjson&category={category}')
+        expected = client.get(f'/api/v1/titles/?category={category}').json()['results']
+        assert by_id(read_lines(response)) == by_id(expected), (
+            'Проверьте, что фильтры применяются к потоковому списку'
+        )
+        assert len(expected) < len(titles)
+
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        response = client.get(url + '?format=ndjson')
+        assert response.status_code == 200
+        assert by_id(read_lines(response)) == by_id(client.get(url).json()['results'])
+        assert client.get('/api/v1/titles/0/reviews/?format=ndjson').status_code == 404, (
+            'Проверьте, что для несуществующего произведения возвращается 404 до начала потока'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_users_chunks(self, client, admin_client, monkeypatch):
+        from api.v1 import streaming
+        from api.v1.views import UserViewSet
+        from users.models import User
+
+        User.objects.bulk_create(
+            User(username=f'user{number}', email=f'user{number}@yamdb.fake') for number in range(7)
+        )
+        expected = admin_client.get('/api/v1/users/?limit=100').json()['results']
+        monkeypatch.setattr(UserViewSet, 'stream_chunk_size', 3)
+
+        response = admin_client.get('/api/v1/users/', HTTP_ACCEPT='application/x-ndjson')
+        assert by_id(read_lines(response), 'username') == by_id(expected, 'username'), (
+            'Проверьте, что все пачки потокового списка пользователей отправляются'
+        )
+
+        monkeypatch.setattr(streaming, 'compile_serializer', lambda serializer_class: None)
+        response = admin_client.get('/api/v1/users/?format=ndjson')
+        assert by_id(read_lines(response), 'username') == by_id(expected, 'username'), (
+            'Проверьте потоковый список через сериализатор DRF'
+        )
+
+        response = client.get('/api/v1/users/', HTTP_ACCEPT='application/x-ndjson')
+        assert response.status_code == 401
+        assert not response.streaming
+        assert admin_client.get('/api/v1/users/me/?format=ndjson').status_code == 404, (
+            'Проверьте, что формат NDJSON доступен только для списков'
+        )
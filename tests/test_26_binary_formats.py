@@ -0,0 +1,48 @@
+import pytest
+from django.core.management import call_command
+
+from .common import create_reviews, create_titles
+
+
+class Test26BinaryFormats:
+
+    @pytest.mark.parametrize('package, media_type', [
+        ('msgpack', 'application/msgpack'),
+        ('cbor2', 'application/cbor'),
+    ])
+    @pytest.mark.django_db(transaction=True)
+    def test_01_render_and_parse(self, admin_client, admin, package, media_type):
+        module = pytest.importorskip(package)
+        dumps, loads = (module.packb, module.unpackb) if package == 'msgpack' else (module.dumps, module.loads)
+        reviews, titles, user, moderator = create_reviews(admin_client, admin)
+
+        for url in ('/api/v1/titles/', f'/api/v1/titles/{titles[0]["id"]}/reviews/'):
+            response = admin_client.get(url, HTTP_ACCEPT=media_type)
+            assert response.status_code == 200
+            assert response['Content-Type'] == media_type, (
+                f'Проверьте, что ответ в формате `{media_type}` выбирается по заголовку `Accept`'
+            )
+            assert loads(response.content) == admin_client.get(url).json(), (
+                f'Проверьте, что ответ в формате `{media_type}` совпадает с JSON'
+            )
+
+        response = admin_client.post(
+            f'/api/v1/titles/{titles[1]["id"]}/reviews/',
+            data=dumps({'text': 'Двоичный отзыв', 'score': 7}),
+            content_type=media_type,
+            HTTP_ACCEPT=media_type,
+        )
+        assert response.status_code == 201, (
+            f'Проверьте, что API принимает тело запроса в формате `{media_type}`'
+        )
+        assert loads(response.content)['text'] == 'Двоичный отзыв'
+
+        response = admin_client.post('/api/v1/categories/', data=b'\xc1', content_type=media_type)
+        assert response.status_code == 400
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_benchmark_command(self, admin_client, capsys):
+        create_titles(admin_client)
+        call_command('benchmark_renderers', page_size=5, repeat=1)
+        output = capsys.readouterr().out
+        assert 'titles' in output and 'json' in output
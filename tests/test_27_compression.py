@@ -0,0 +1,84 @@
+import gzip
+import json
+
+import pytest
+
+from .common import create_titles
+
+
+class Test27Compression:
+
+    def create_titles(self, admin_client):
+        from reviews.cards import refresh_cards
+        from reviews.models import Title
+
+        create_titles(admin_client)
+        Title.objects.update(description='Длинное описание произведения. ' * 100)
+        refresh_cards(Title.objects.all())
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_cached_gzip(self, client, admin_client, django_assert_num_queries):
+        from django.core.cache import cache
+
+        self.create_titles(admin_client)
+        cache.clear()
+        plain = client.get('/api/v1/titles/')
+        assert 'Content-Encoding' not in plain, 'Проверьте, что без `Accept-Encoding` ответ не сжимается'
+        assert 'Accept-Encoding' in plain['Vary']
+
+        cache.clear()
+        response = client.get('/api/v1/titles/', HTTP_ACCEPT_ENCODING='gzip, deflate')
+        assert response['Content-Encoding'] == 'gzip', 'Проверьте, что ответ сжимается gzip'
+        assert 'Accept-Encoding' in response['Vary'], (
+            'Проверьте, что сжатый при промахе кеша ответ содержит `Vary: Accept-Encoding`'
+        )
+        assert gzip.decompress(response.content) == plain.content
+        assert len(response.content) < len(plain.content) // 5
+        assert response['ETag'] == plain['ETag'][:-1] + '-gzip"', (
+            'Проверьте, что у сжатого ответа свой ETag'
+        )
+
+        with django_assert_num_queries(0):
+            cached = client.get('/api/v1/titles/', HTTP_ACCEPT_ENCODING='gzip')
+            not_modified = client.get(
+                '/api/v1/titles/', HTTP_ACCEPT_ENCODING='gzip', HTTP_IF_NONE_MATCH=response['ETag']
+            )
+        assert cached.content == response.content, (
+            'Проверьте, что сжатый ответ берется из кеша'
+        )
+        assert 'Accept-Encoding' in cached['Vary']
+        assert not_modified.status_code == 304
+        assert client.get(
+            '/api/v1/titles/', HTTP_IF_NONE_MATCH=response['ETag']
+        ).status_code == 200, 'Проверьте, что ETag сжатого ответа не подходит для несжатого'
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_middleware(self, admin_client, settings):
+        from api.compression import choose_encoding
+        from django.test import RequestFactory
+
+        self.create_titles(admin_client)
+        response = admin_client.get('/api/v1/titles/', HTTP_ACCEPT_ENCODING='gzip;q=0.5, identity')
+        assert response['Content-Encoding'] == 'gzip', (
+            'Проверьте, что ответы вне кеша сжимаются middleware'
+        )
+        assert json.loads(gzip.decompress(response.content))['count'] == 2
+        assert 'Accept-Encoding' in response['Vary']
+
+        small = admin_client.get('/api/v1/categories/', HTTP_ACCEPT_ENCODING='gzip')
+        assert 'Content-Encoding' not in small, (
+            'Проверьте, что ответы меньше `COMPRESSION_MIN_SIZE` не сжимаются'
+        )
+
+        settings.COMPRESSION_ENCODINGS = ['br', 'gzip']
+        factory = RequestFactory()
+        assert choose_encoding(factory.get('/', HTTP_ACCEPT_ENCODING='gzip;q=0'), 2000) is None
+        assert choose_encoding(factory.get('/', HTTP_ACCEPT_ENCODING='zstd, gzip'), 2000) == 'gzip'
+        assert choose_encoding(factory.get('/', HTTP_ACCEPT_ENCODING='*'), 2000) in ('br', 'gzip')
+
+    def test_03_brotli(self):
+        brotli = pytest.importorskip('brotli')
+        from api.compression import compress
+
+        content = b'{"results": []}' * 100
+        assert brotli.decompress(compress(content, 'br', best=True)) == content
@@ -0,0 +1,70 @@
+import statistics
+
+import pytest
+from django.core.management import call_command
+
+from .common import create_reviews
+
+
+class Test28TitleStats:
+
+    def expected(self, title_id):
+        from reviews.models import Review
+
+        scores = list(Review.objects.filter(title_id=title_id).values_list('score', flat=True))
+        return {
+            'count': len(scores),
+            'mean': statistics.mean(scores) if scores else None,
+            'median': statistics.median(scores) if scores else None,
+            'histogram': [{'score': score, 'count': scores.count(score)} for score in range(1, 11)],
+        }
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_stats(self, client, admin_client, admin, django_assert_max_num_queries):
+        reviews, titles, user, moderator = create_reviews(admin_client, admin)
+        url = f'/api/v1/titles/{titles[0]["id"]}/stats/'
+        with django_assert_max_num_queries(1):
+            response = client.get(url)
+        assert response.status_code == 200, f'Проверьте, что GET запрос `{url}` доступен без токена'
+        assert response.json() == self.expected(titles[0]['id'])
+        assert response.json()['median'] == 4
+
+        review_url = f'/api/v1/titles/{titles[0]["id"]}/reviews/{reviews[0]["id"]}/'
+        admin_client.patch(review_url, data={'score': 10}, content_type='application/json')
+        assert client.get(url).json() == self.expected(titles[0]['id']), (
+            'Проверьте, что распределение оценок обновляется при изменении отзыва'
+        )
+        admin_client.delete(review_url)
+        stats = client.get(url).json()
+        assert stats == self.expected(titles[0]['id']), (
+            'Проверьте, что распределение оценок обновляется при удалении отзыва'
+        )
+        assert (stats['count'], stats['mean'], stats['median']) == (2, 3.5, 3.5)
+
+        response = client.get(f'/api/v1/titles/{titles[1]["id"]}/stats/')
+        assert response.json() == self.expected(titles[1]['id'])
+        assert response.json()['mean'] is None
+        assert client.get('/api/v1/titles/0/stats/').status_code == 404
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_bulk_and_rebuild(self, admin_client, admin):
+        from reviews.models import Review, TitleScore
+
+        reviews, titles, user, moderator = create_reviews(admin_client, admin)
+        response = admin_client.post('/api/v1/titles/reviews/bulk/', data=[
+            {'title': titles[1]['id'], 'text': 'Отзыв', 'score': 7},
+            {'title': titles[1]['id'], 'author': user.username, 'text': 'Отзыв', 'score': 7},
+        ], format='json')
+        assert response.json()['created'] == 2
+        for title in titles:
+            assert admin_client.get(f'/api/v1/titles/{title["id"]}/stats/').json() == self.expected(title['id']), (
+                'Проверьте, что пакетная загрузка отзывов обновляет распределение оценок'
+            )
+
+        incremental = set(TitleScore.objects.filter(count__gt=0).values_list('title', 'score', 'count'))
+        Review.objects.filter(pk=reviews[1]['id']).update(score=9)
+        call_command('rebuild_ratings')
+        rebuilt = set(TitleScore.objects.values_list('title', 'score', 'count'))
+        assert rebuilt == incremental - {(titles[0]['id'], 3, 1)} | {(titles[0]['id'], 9, 1)}, (
+            'Проверьте, что `rebuild_ratings` пересчитывает распределения оценок'
+        )
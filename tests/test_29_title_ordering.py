@@ -0,0 +1,68 @@
+import pytest
+from django.core.management import call_command
+
+from .common import create_reviews
+
+
+class Test29TitleOrdering:
+
+    def ids(self, client, query):
+        response = client.get(f'/api/v1/titles/?{query}')
+        assert response.status_code == 200, f'Проверьте, что запрос `/api/v1/titles/?{query}` возвращает 200'
+        return [title['id'] for title in response.json()['results']]
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_ordering(self, client, admin_client, admin):
+        from reviews.models import Title
+
+        call_command('load_data')
+        create_reviews(admin_client, admin)
+        titles = list(Title.objects.all())
+
+        def expected(key, reverse=False, category=None):
+            items = [title for title in titles if category is None or title.category_id == category]
+            return [title.id for title in sorted(items, key=lambda title: (key(title), title.id), reverse=reverse)]
+
+        assert self.ids(client, 'ordering=year&limit=100') == expected(lambda title: title.year)
+        assert self.ids(client, 'ordering=-name&limit=100') == expected(lambda title: title.name, reverse=True)
+        assert self.ids(client, 'ordering=-reviews&limit=100') == expected(
+            lambda title: title.rating_count, reverse=True
+        ), 'Проверьте сортировку произведений по количеству отзывов'
+        assert self.ids(client, 'ordering=-rating&limit=100') == expected(
+            lambda title: -1 if title.rating is None else title.rating, reverse=True
+        ), 'Проверьте, что при сортировке `-rating` произведения без оценок идут последними'
+        assert self.ids(client, 'ordering=-weighted_rating&limit=100') == expected(
+            lambda title: title.weighted_rating, reverse=True
+        )
+
+        category = titles[0].category
+        assert self.ids(client, f'category={category.slug}&ordering=-rating,-reviews&limit=3') == expected(
+            lambda title: (-1 if title.rating is None else title.rating, title.rating_count),
+            reverse=True, category=category.id,
+        )[:3], 'Проверьте выбор лучших произведений категории'
+        assert self.ids(client, 'ordering=unknown&limit=100') == self.ids(client, 'limit=100'), (
+            'Проверьте, что неизвестные поля сортировки игнорируются'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_weighted_rating(self, admin_client, admin, settings):
+        from reviews.models import Title
+
+        reviews, titles, user, moderator = create_reviews(admin_client, admin)
+        rated, unrated = Title.objects.get(pk=titles[0]['id']), Title.objects.get(pk=titles[1]['id'])
+        assert rated.weighted_rating == pytest.approx((12 + 5.5 * 10) / (3 + 10)), (
+            'Проверьте, что взвешенный рейтинг сглаживается к `TITLE_RATING_PRIOR_MEAN`'
+        )
+        assert unrated.weighted_rating == 5.5
+
+        admin_client.delete(f'/api/v1/titles/{titles[0]["id"]}/reviews/{reviews[0]["id"]}/')
+        rated.refresh_from_db()
+        assert rated.weighted_rating == pytest.approx((7 + 5.5 * 10) / (2 + 10))
+
+        settings.TITLE_RATING_PRIOR_MEAN = 7
+        call_command('rebuild_ratings')
+        rated.refresh_from_db()
+        unrated.refresh_from_db()
+        assert (rated.weighted_rating, unrated.weighted_rating) == (pytest.approx((7 + 70) / 12), 7), (
+            'Проверьте, что `rebuild_ratings` пересчитывает взвешенный рейтинг'
+        )
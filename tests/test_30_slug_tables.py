@@ -0,0 +1,63 @@
+import pytest
+
+from .common import create_titles
+
+
+class Test30SlugTables:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_title_write_queries(self, admin_client):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from reviews.lookups import categories, genres
+
+        titles, _, genre_list = create_titles(admin_client)
+        categories.snapshot()
+        genres.snapshot()
+        data = {
+            'name': 'Новое', 'year': 2001, 'category': 'books',
+            'genre': [genre['slug'] for genre in genre_list],
+        }
+        with CaptureQueriesContext(connection) as context:
+            response = admin_client.post('/api/v1/titles/', data=data)
+        assert response.status_code == 201
+        # Карточка произведения собирается из БД, поэтому проверяются только
+        # запросы до вставки произведения.
+        sql = [query['sql'] for query in context.captured_queries]
+        sql = sql[:next(i for i, query in enumerate(sql) if query.startswith('INSERT INTO "reviews_title"'))]
+        assert not any('"reviews_genre"' in query or '"reviews_category"' in query for query in sql), (
+            'Проверьте, что слаги жанров и категории не ищутся в БД при создании произведения'
+        )
+
+        response = admin_client.post('/api/v1/titles/', data={**data, 'genre': ['unknown']})
+        assert response.status_code == 400, 'Проверьте, что неизвестный слаг жанра приводит к ошибке 400'
+        response = admin_client.post('/api/v1/titles/', data={**data, 'category': 'unknown'})
+        assert response.status_code == 400, 'Проверьте, что неизвестный слаг категории приводит к ошибке 400'
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_filters_and_invalidation(self, client, admin_client):
+        from reviews.models import Category
+
+        titles, _, _ = create_titles(admin_client)
+        response = client.get('/api/v1/titles/?genre=drama')
+        assert [title['id'] for title in response.json()['results']] == [titles[1]['id']]
+        assert client.get('/api/v1/titles/?category=unknown').json()['count'] == 0
+
+        admin_client.patch(
+            f'/api/v1/titles/{titles[0]["id"]}/', data={'category': 'books'}, format='json'
+        )
+        category = Category.objects.get(slug='books')
+        category.name = 'Литература'
+        category.save()
+        Category.objects.create(name='Музыка', slug='music')
+        response = client.get(f'/api/v1/titles/{titles[0]["id"]}/')
+        assert response.json()['category'] == {'name': 'Литература', 'slug': 'books'}, (
+            'Проверьте, что кеш категорий обновляется при изменении категорий'
+        )
+        admin_client.delete('/api/v1/categories/books/')
+        assert client.get('/api/v1/titles/?category=books').json()['count'] == 0
+        admin_client.patch(
+            f'/api/v1/titles/{titles[0]["id"]}/', data={'category': 'music'}, format='json'
+        )
+        response = client.get(f'/api/v1/titles/{titles[0]["id"]}/')
+        assert response.json()['category'] == {'name': 'Музыка', 'slug': 'music'}